@@ -48,11 +48,24 @@ INSTALLED_APPS = [
     "training_session" ,
     "medical" ,
     "attendance",
+    "player_fees",
+    "coach_salaries",
+    "expenses",
+    "finance",
+    "core",
+    "sync",
+    "analytics",
 
 
 ]
 
 MIDDLEWARE = [
+    "core.middleware.MetricsMiddleware",
+    "core.middleware.ShardMiddleware",
+    "core.middleware.ReplicaRoutingMiddleware",
+    "core.middleware.ProfilingMiddleware",
+    "core.middleware.QueryCountMiddleware",
+    "core.middleware.SQLiteReadTransactionMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -60,6 +73,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Last: with SCHOOL_SHARDS it runs the view in a transaction of its shard.
+    "core.middleware.ShardTransactionMiddleware",
 ]
 
 ROOT_URLCONF = "FootbalSchool.urls"
@@ -86,11 +101,80 @@ WSGI_APPLICATION = "FootbalSchool.wsgi.application"
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
+        # Django's SQLite backend with the production profile of core/sqlite.
+        "ENGINE": "core.sqlite",
         "NAME": BASE_DIR / "db.sqlite3",
-    }
+        # Change log entries (sync app) commit together with the request's writes.
+        "ATOMIC_REQUESTS": True,
+        # Transactions take the write lock when they begin, except those of
+        # requests that only read.
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
+        # Reused by the requests of a worker thread (WSGI). The ASGI handler
+        # runs every request in a new thread: set it to 0 when serving ASGI.
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+    },
+    # Second school shard of the sharding tests (core/tests.py), in memory.
+    # Nothing else uses it: real shards are listed in SCHOOL_SHARDS.
+    "shard_test": {"ENGINE": "core.sqlite", "NAME": ":memory:"},
 }
 
+# Set on every new connection of the core.sqlite engine.
+SQLITE_PRAGMAS = {
+    "busy_timeout": 20000,
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -32000,  # KiB
+    "temp_store": "MEMORY",
+    "mmap_size": 128 * 1024 * 1024,
+}
+# POST views that only read: their transaction stays deferred.
+SQLITE_DEFERRED_VIEWS = ["rest_framework_simplejwt.views.*"]
+
+# Read replicas (core/db_router.py). Reads of REPLICA_APPS models, and of
+# safe requests to views matching REPLICA_VIEWS, go to a healthy replica;
+# everything else, and every read of a user for REPLICA_STICKY_SECONDS
+# after they wrote, goes to "default". Pinning needs a cache shared by the
+# worker processes. To try it locally with two database files add
+#     "replica": {"ENGINE": "core.sqlite", "NAME": BASE_DIR / "replica.sqlite3",
+#                 "TEST": {"MIRROR": "default"}},
+# to DATABASES, "replica" to DATABASE_REPLICAS and keep the copy fresh with
+# "python manage.py sync_replica --watch 5".
+DATABASE_ROUTERS = ["core.sharding.SchoolShardRouter", "core.db_router.ReplicaRouter"]
+DATABASE_REPLICAS = []
+REPLICA_APPS = []
+REPLICA_VIEWS = [
+    "analytics.views.*",
+    "finance.views.*",
+    "coach.views.CoachViewSet.dashboard",
+    "coach.views.CoachViewSet.home",
+    "*.list",
+]
+REPLICA_STICKY_SECONDS = 5
+REPLICA_HEALTH_CHECK_INTERVAL = 10
+REPLICA_MAX_LAG_SECONDS = 30
+# Responses built from replica reads are cached this long at most.
+REPLICA_CACHE_TIMEOUT = 30
+
+# School sharding (core/sharding.py). Empty: every school in one database.
+# Otherwise the aliases of DATABASES holding schools, "default" included;
+# each is migrated with "migrate --database <alias>". Requests run on the
+# shard of the principal (the "shard" claim of the access token), the
+# directory of schools and phone numbers lives in SHARD_DIRECTORY_DATABASE
+# and sign-ups land on SHARD_FOR_NEW_USERS. Schools are spread out with
+# "move_school <source> <school id> <target>". A request's view runs in a
+# transaction of its own shard only (ShardTransactionMiddleware), not in
+# one per shard: ATOMIC_REQUESTS on a shard marks it as taking part.
+# Directory writes take a transaction of the directory database. Locally, e.g.
+#     "shard1": {"ENGINE": "core.sqlite", "NAME": BASE_DIR / "shard1.sqlite3",
+#                "ATOMIC_REQUESTS": True, "OPTIONS": {"transaction_mode": "IMMEDIATE"}},
+# and SCHOOL_SHARDS = ["default", "shard1"], then "rebuild_shard_directory".
+SCHOOL_SHARDS = []
+SHARD_DIRECTORY_DATABASE = "default"
+SHARD_FOR_NEW_USERS = "default"
+
+AUTHENTICATION_BACKENDS = ["core.authentication.ShardedModelBackend"]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -125,6 +209,94 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Use django.core.cache.backends.filebased.FileBasedCache to share the
+# response cache between several worker processes.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "footbalschool",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+        # Ids repeat between shards: keys are namespaced by the active one.
+        "KEY_FUNCTION": "core.sharding.make_cache_key",
+    }
+}
+
+# Versioned response cache (core/cache.py)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Stored responses of Idempotency-Key requests (core/models.py), in seconds
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Query count, DB time and repeated statements of every request
+# (core/middleware.py): X-Query-* headers with DEBUG, "core.queries" log
+# records otherwise. Strict mode raises when a view exceeds its query_budget.
+QUERY_INSTRUMENTATION = True
+QUERY_BUDGET_STRICT = False
+
+# Request profiles (core/profiling.py): a sampled share of requests, and any
+# request whose PROFILING_HEADER equals PROFILING_TOKEN, is profiled with a
+# stack sampler ("sample") or cProfile ("cprofile") into PROFILING_DIR.
+# Aggregate them with the aggregate_profiles command.
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_HEADER = "X-Profile"
+PROFILING_TOKEN = None
+PROFILING_MODE = "sample"
+PROFILING_INTERVAL = 0.005
+PROFILING_DIR = BASE_DIR / "profiles"
+PROFILING_MAX_FILES = 500
+
+# Slow-query log (core/slowlog.py): statements slower than the threshold are
+# written with their call site, parameters and query plan to
+# SLOW_QUERY_LOG; the slow_queries command summarizes it. None disables it.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_EXPLAIN_INTERVAL = 600
+SLOW_QUERY_STACK_DEPTH = 6
+SLOW_QUERY_LOG = BASE_DIR / "slow_queries.log"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        "slow_queries": {
+            "class": "logging.handlers.RotatingFileHandler",
+            "filename": SLOW_QUERY_LOG,
+            "maxBytes": 10 * 1024 * 1024,
+            "backupCount": 5,
+            "formatter": "message",
+            "delay": True,
+        },
+    },
+    "loggers": {
+        "core.slow_queries": {"handlers": ["slow_queries"], "level": "WARNING", "propagate": False},
+    },
+}
+
+# Metrics (core/metrics.py): each worker process dumps its counters to
+# METRICS_DIR; /api/metrics/ serves their sum to the addresses below.
+METRICS_DIR = BASE_DIR / "metrics"
+METRICS_FLUSH_INTERVAL = 1.0
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+
+# Background jobs (core/jobs.py), run by "python manage.py run_jobs". Jobs
+# live in the database of the write that enqueued them, so on every shard
+# with SCHOOL_SHARDS. A claim older than JOB_LEASE_SECONDS is taken for a
+# dead worker's and the job runs again; finished jobs are kept for
+# JOB_RETENTION_SECONDS. JOB_SCHEDULE maps job types to a period in seconds
+# (shorter than the retention). JOB_RUN_EAGERLY runs each job in the process
+# right after the commit that enqueued it, to develop without a worker.
+JOB_POLL_INTERVAL = 1.0
+JOB_LEASE_SECONDS = 10 * 60
+JOB_MAX_RETRY_DELAY = 60 * 60
+JOB_RETENTION_SECONDS = 7 * 24 * 60 * 60
+JOB_SCHEDULE = {"core.purge_jobs": 60 * 60}
+JOB_RUN_EAGERLY = False
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -137,8 +309,27 @@ AUTH_USER_MODEL = 'account.User'
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.ShardedJWTAuthentication',
+    ),
+    # orjson based JSON plus MessagePack for "Accept: application/msgpack"; see core/renderers.py
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.FastJSONParser',
+        'core.parsers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
+    # every list endpoint is cursor paginated; see core/pagination.py
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': 25,
+    # clients written before pagination send "Accept: application/json; version=1"
+    'DEFAULT_VERSIONING_CLASS': 'rest_framework.versioning.AcceptHeaderVersioning',
+    'DEFAULT_VERSION': '2',
+    'ALLOWED_VERSIONS': ('1', '2'),
 }
 
 # djoser
@@ -159,4 +350,6 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
+    'TOKEN_OBTAIN_SERIALIZER': 'core.authentication.ShardTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'core.authentication.ShardTokenRefreshSerializer',
 }
\ No newline at end of file
@@ -23,10 +23,17 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
-    re_path(r'^auth/', include('djoser.urls')),
+    re_path(r'^auth/', include('account.urls')),
     re_path(r'^auth/', include('djoser.urls.jwt')),
     path("api/", include("manager.urls"), name="manager"),
     path("api/", include("school.urls"), name="school"),
     path("api/", include("player.urls"), name="player"),
     path("api/", include("coach.urls"), name="coach"),
+    path("api/", include("finance.urls"), name="finance"),
+    path("api/", include("player_fees.urls"), name="player_fees"),
+    path("api/", include("core.urls"), name="core"),
+    path("api/", include("sync.urls"), name="sync"),
+    path("api/", include("attendance.api_urls"), name="attendance"),
+    path("api/", include("medical.urls"), name="medical"),
+    path("api/", include("analytics.urls"), name="analytics"),
 ]
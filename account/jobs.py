@@ -0,0 +1,13 @@
+from core.jobs import job
+
+from .models import Profile
+
+
+@job("account.render_qr_code")
+def render_qr_code(profile_id):
+    """Render the QR code of a profile saved without one."""
+    profile = Profile.objects.filter(pk=profile_id).first()
+    if profile is None or profile.qr_code:
+        return
+    profile.generate_qr_code()
+    profile.save(update_fields=["qr_code", "updated_at"])
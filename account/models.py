@@ -48,6 +48,7 @@ class User(AbstractUser):
         default=PLAYER,
         help_text='User role in the football school system'
     )
+    updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = 'phone_number'
     REQUIRED_FIELDS = ['email', 'username']
@@ -122,28 +123,26 @@ class Profile(models.Model):
     def generate_qr_code(self):
         """Generate QR code based on UUID"""
         if not self.qr_code:
-            try:
-                data = str(self.uuid)
-                img = qrcode.make(data)
-                buffer = BytesIO()
-                img.save(buffer, 'PNG')
-                buffer.seek(0)
-                filename = f"profile_{self.uuid}.png"
-
-                self.qr_code.save(
-                    filename,
-                    ContentFile(buffer.read()),
-                    save=False
-                )
-                buffer.close()
-            except:
-
-                pass
+            data = str(self.uuid)
+            img = qrcode.make(data)
+            buffer = BytesIO()
+            img.save(buffer, 'PNG')
+            buffer.seek(0)
+            filename = f"profile_{self.uuid}.png"
+
+            self.qr_code.save(
+                filename,
+                ContentFile(buffer.read()),
+                save=False
+            )
+            buffer.close()
 
     def save(self, *args, **kwargs):
-        """Save profile and generate QR code if not exists"""
-        self.generate_qr_code()
+        """Save profile; a missing QR code is rendered by a background job"""
         super().save(*args, **kwargs)
+        if not self.qr_code:
+            from .jobs import render_qr_code
+            render_qr_code.enqueue(profile_id=self.pk, using=self._state.db)
 
     def delete(self, *args, **kwargs):
         """Delete profile and associated files"""
@@ -1,9 +1,10 @@
 # account/serializers.py
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import User, Profile
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for Profile model
     - qr_code is read-only (auto-generated)
@@ -21,7 +22,7 @@ class ProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["qr_code", "uuid", "created_at", "updated_at"]
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for custom User model
     - phone_number is the USERNAME_FIELD (login field)
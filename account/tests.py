@@ -1,3 +1,37 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.testing import generate_dataset
+from school.models import School
+
+
+class UserFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.user = School.objects.select_related("manager__user").get().manager.user
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_me_fields(self):
+        response = self.client.get("/auth/users/me/?fields=id,username")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {"id", "username"})
+
+        full = self.client.get("/auth/users/me/")
+        self.assertIn("profile", full.data)
+        self.assertNotEqual(full["ETag"], response["ETag"])
+
+    def test_list_fields(self):
+        response = self.client.get("/auth/users/?fields=id,phone_number")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data["results"])
+        for user in response.data["results"]:
+            self.assertEqual(set(user), {"id", "phone_number"})
+
+    def test_update_me(self):
+        response = self.client.patch("/auth/users/me/?fields=id", {"first_name": "Sara"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["first_name"], "Sara")
@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+from .views import UserViewSet
+
+router = DefaultRouter()
+router.register("users", UserViewSet)
+
+urlpatterns = router.urls
@@ -0,0 +1,19 @@
+from djoser.views import UserViewSet as DjoserUserViewSet
+
+from core.mixins import ConditionalGetMixin, SparseFieldsetMixin
+
+
+class UserViewSet(ConditionalGetMixin, SparseFieldsetMixin, DjoserUserViewSet):
+    """
+    djoser's user endpoints with ETag / Last-Modified support, so clients
+    polling ``users/me/`` get a 304 while neither the user nor the profile changed,
+    and ``?fields=`` / ``?expand=`` like the other endpoints.
+    """
+    conditional_actions = ("list", "retrieve", "me")
+    expand_related = {"profile": "profile"}
+    conditional_timestamp_fields = ("updated_at", "profile__updated_at")
+
+    def get_conditional_queryset(self):
+        if self.action == "me":
+            return self.get_queryset().filter(pk=self.request.user.pk)
+        return super().get_conditional_queryset()
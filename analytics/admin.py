@@ -0,0 +1,8 @@
+from django.contrib import admin
+from .models import PlayerTeamStats
+
+
+@admin.register(PlayerTeamStats)
+class PlayerTeamStatsAdmin(admin.ModelAdmin):
+    list_display = ('team', 'player', 'sessions', 'attendance_rate', 'recent_average', 'updated_at')
+    list_filter = ('team',)
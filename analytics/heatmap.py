@@ -0,0 +1,94 @@
+# Team x day attendance rate matrix of a school.
+#
+# One grouped query returns (team, day, recorded, attended) for the whole
+# range and the dense matrix is filled from it with a single NumPy scatter.
+# Sessions have no date, so the day is the one the attendance was recorded.
+import hashlib
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from attendance.models import Attendance
+from core import cache
+from team.models import Team
+from .performance import ATTENDED_STATUSES, attendance_scope
+
+
+def _aware(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def build_heatmap(team_ids, start, end):
+    """
+    Return ``(recorded, rates)`` matrices with a row per team and a column
+    per day from ``start`` to ``end``: attendance rows, and the share of them
+    attended (None where nothing was recorded).
+    """
+    days = (end - start).days + 1
+    rows = (
+        Attendance.objects.filter(
+            training_session__team_id__in=team_ids,
+            recorded_at__gte=_aware(start),
+            recorded_at__lt=_aware(end + timedelta(days=1)),
+        )
+        .values_list("training_session__team_id", TruncDate("recorded_at"))
+        .annotate(recorded=Count("id"), attended=Count("id", filter=Q(status__in=ATTENDED_STATUSES)))
+        .order_by()
+    )
+
+    recorded = np.zeros((len(team_ids), days), dtype=np.int64)
+    attended = np.zeros((len(team_ids), days), dtype=np.int64)
+    if rows:
+        team_column, day_column, recorded_column, attended_column = zip(*rows)
+        order = np.argsort(team_ids)
+        row_index = order[np.searchsorted(np.asarray(team_ids)[order], team_column)]
+        day_index = np.fromiter(((day - start).days for day in day_column), dtype=np.int64, count=len(rows))
+        recorded[row_index, day_index] = recorded_column
+        attended[row_index, day_index] = attended_column
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = np.round(attended / recorded, 3)
+    return recorded.tolist(), np.where(recorded > 0, rates, None).tolist()
+
+
+def get_heatmap(school_id, start, end, semester_id=None, team_id=None):
+    """
+    Heatmap of the school's teams (those of a semester, or a single team).
+
+    A range that ended before today no longer changes and is cached without
+    expiry; an open range is cached under the school's attendance version.
+    """
+    teams = Team.objects.filter(school_id=school_id)
+    if semester_id is not None:
+        teams = teams.filter(semester_id=semester_id)
+    if team_id is not None:
+        teams = teams.filter(pk=team_id)
+    team_rows = list(teams.order_by("name", "id").values_list("id", "name"))
+    team_ids = [team_id for team_id, _ in team_rows]
+
+    closed = end < timezone.localdate()
+    fingerprint = hashlib.sha1(repr(team_ids).encode()).hexdigest()
+    version = "closed" if closed else cache.get_data_version(attendance_scope(school_id))
+    key = f"attendance-heatmap:{school_id}:{start}:{end}:{fingerprint}:{version}"
+
+    store = cache.get_cache()
+    data = store.get(key)
+    if data is not None:
+        cache.record("hits")
+        return data
+
+    cache.record("misses")
+    recorded, rates = build_heatmap(team_ids, start, end) if team_ids else ([], [])
+    data = {
+        "start": start,
+        "end": end,
+        "teams": team_ids,
+        "team_names": [name for _, name in team_rows],
+        "recorded": recorded,
+        "rates": rates,
+    }
+    store.set(key, data, None if closed else cache.get_timeout())
+    return data
@@ -0,0 +1,238 @@
+# Team leaderboards by recent performance.
+#
+# PlayerTeamStats rows are adjusted on every attendance write (apply_change).
+# Each team's ranking lives in the cache as a sorted list of rank keys plus
+# a player -> key map, so top-N is a slice and the rank of a player a bisect.
+# After a commit the changed player's key is moved in place; a missing entry
+# is loaded from the table with one query. Both read-modify-write the entry
+# under a per-team cache.add() mutex, so concurrent writers (of any process
+# sharing the cache) never drop each other's moves.
+#
+# Searches are O(log n) but every read and move still costs O(n): the board
+# is one pickled value fetched and stored whole. The Django cache API has no
+# sorted set to update in place, and splitting a board over several keys
+# would trade that for more round trips and locking across them. A board
+# holds one team's roster (team_capacity, a few dozen players), where a
+# single round trip of the whole list is cheaper than several small ones.
+# A backend with sorted sets (Redis ZADD/ZRANK) is the way to go should
+# boards ever span whole schools.
+import time
+import uuid
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from attendance.models import Attendance
+from core import cache
+from .models import PlayerTeamStats
+from .performance import ATTENDED_STATUSES
+
+RECENT_WINDOW = 10
+# Seconds a board stays locked at most, should its holder die; also how long
+# a writer waits for it.
+LOCK_TIMEOUT = 2
+
+
+def rank_key(recent_average, attendance_rate, player_id):
+    """Ascending sort key: scored players first, best recent average, then attendance."""
+    return (recent_average is None, -(recent_average or 0.0), -attendance_rate, player_id)
+
+
+def _board_key(team_id):
+    return f"leaderboard:{team_id}"
+
+
+@contextmanager
+def board_lock(team_id):
+    """
+    Hold the cached board of a team to ourselves. Yields False when it is
+    still taken after LOCK_TIMEOUT seconds.
+    """
+    store = cache.get_cache()
+    key = f"{_board_key(team_id)}:lock"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not store.add(key, token, LOCK_TIMEOUT):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.005)
+    try:
+        yield True
+    finally:
+        # Not a lock that expired and was taken by another writer meanwhile.
+        if store.get(key) == token:
+            store.delete(key)
+
+
+def load_board(team_id):
+    # Under the lock, so a move committed while the table is read is applied after the set.
+    with board_lock(team_id) as locked:
+        rows = PlayerTeamStats.objects.filter(team_id=team_id).values_list(
+            "player_id", "recent_average", "attendance_rate")
+        players = {player_id: rank_key(average, rate, player_id) for player_id, average, rate in rows}
+        board = {"keys": sorted(players.values()), "players": players}
+        if locked:
+            cache.get_cache().set(_board_key(team_id), board, cache.get_timeout())
+    return board
+
+
+def get_board(team_id):
+    return cache.get_cache().get(_board_key(team_id)) or load_board(team_id)
+
+
+def move_player(team_id, player_id, key):
+    """
+    Replace a player's key in the cached board of a team (``key=None``
+    removes it). Reads and writes the whole board: O(n), see the top.
+    """
+    store = cache.get_cache()
+    with board_lock(team_id) as locked:
+        if not locked:
+            # Its holder died mid-update: drop the board, the next read loads it again.
+            store.delete(_board_key(team_id))
+            return
+        board = store.get(_board_key(team_id))
+        if board is None:
+            return
+        previous = board["players"].pop(player_id, None)
+        if previous is not None:
+            board["keys"].pop(bisect_left(board["keys"], previous))
+        if key is not None:
+            board["players"][player_id] = key
+            insort(board["keys"], key)
+        store.set(_board_key(team_id), board, cache.get_timeout())
+
+
+def _entry(rank, key):
+    unscored, negative_average, negative_rate, player_id = key
+    return {
+        "rank": rank,
+        "player": player_id,
+        "recent_average": None if unscored else round(-negative_average, 2),
+        "attendance_rate": round(-negative_rate, 4),
+    }
+
+
+def top(team_id, limit):
+    return [_entry(rank, key) for rank, key in enumerate(get_board(team_id)["keys"][:limit], start=1)]
+
+
+def rank_of(team_id, player_id):
+    board = get_board(team_id)
+    key = board["players"].get(player_id)
+    if key is None:
+        return None
+    return _entry(bisect_left(board["keys"], key) + 1, key)
+
+
+def attendance_state(status, score):
+    return {"attended": status in ATTENDED_STATUSES, "score": None if score is None else float(score)}
+
+
+def _refresh_derived(stats):
+    scores = [score for _, score in stats.recent]
+    stats.recent_average = sum(scores) / len(scores) if scores else None
+    stats.attendance_rate = stats.attended / stats.sessions if stats.sessions else 0.0
+
+
+def apply_change(team_id, player_id, attendance_id, old=None, new=None):
+    """
+    Move the stats of a player in a team from the ``old`` to the ``new`` state
+    of one attendance row (attendance_state() dicts, None when absent).
+    """
+    if new is None:
+        # Removals never create a row; it may already be gone with a deleted team or player.
+        stats = PlayerTeamStats.objects.filter(team_id=team_id, player_id=player_id).first()
+        if stats is None:
+            return
+    else:
+        stats, _ = PlayerTeamStats.objects.get_or_create(team_id=team_id, player_id=player_id)
+    for state, sign in ((old, -1), (new, 1)):
+        if state is None:
+            continue
+        stats.sessions += sign
+        stats.attended += sign * state["attended"]
+        if state["score"] is not None:
+            stats.score_sum += sign * state["score"]
+            stats.score_count += sign
+
+    recent = [pair for pair in stats.recent if pair[0] != attendance_id]
+    dropped = len(recent) < len(stats.recent)
+    if new is not None and new["score"] is not None:
+        recent.append([attendance_id, new["score"]])
+        recent.sort()
+    recent = recent[-RECENT_WINDOW:]
+    if dropped and len(recent) < min(stats.score_count, RECENT_WINDOW):
+        # A score inside the window went away: pull the next older one back in.
+        recent = recent_scores(team_id, player_id)
+    stats.recent = recent
+
+    if stats.sessions <= 0:
+        stats.delete()
+        key = None
+    else:
+        _refresh_derived(stats)
+        stats.save()
+        key = rank_key(stats.recent_average, stats.attendance_rate, player_id)
+    transaction.on_commit(partial(move_player, team_id, player_id, key))
+
+
+def recent_scores(team_id, player_id):
+    rows = (
+        Attendance.objects.filter(training_session__team_id=team_id, player_id=player_id, score__isnull=False)
+        .order_by("-id")
+        .values_list("id", "score")[:RECENT_WINDOW]
+    )
+    return [[attendance_id, float(score)] for attendance_id, score in reversed(rows)]
+
+
+def rebuild(team_ids=None):
+    """Recompute every stats row (of ``team_ids``) from the attendance table and drop cached boards."""
+    attendances = Attendance.objects.all()
+    if team_ids is not None:
+        attendances = attendances.filter(training_session__team_id__in=team_ids)
+
+    stats = {}
+    for team_id, player_id, status, score in attendances.values_list(
+            "training_session__team_id", "player_id", "status", "score").order_by("id").iterator():
+        row = stats.get((team_id, player_id))
+        if row is None:
+            row = stats[(team_id, player_id)] = PlayerTeamStats(team_id=team_id, player_id=player_id, recent=[])
+        row.sessions += 1
+        row.attended += status in ATTENDED_STATUSES
+        if score is not None:
+            row.score_sum += float(score)
+            row.score_count += 1
+
+    # Last RECENT_WINDOW scores of every (team, player) in one query.
+    recent = (
+        attendances.filter(score__isnull=False)
+        .annotate(
+            team_key=F("training_session__team_id"),
+            position=Window(RowNumber(), partition_by=[F("training_session__team_id"), F("player_id")],
+                            order_by=F("id").desc()),
+        )
+        .filter(position__lte=RECENT_WINDOW)
+        .order_by("id")
+        .values_list("team_key", "player_id", "id", "score")
+    )
+    for team_id, player_id, attendance_id, score in recent:
+        stats[(team_id, player_id)].recent.append([attendance_id, float(score)])
+
+    for row in stats.values():
+        _refresh_derived(row)
+
+    with transaction.atomic():
+        existing = PlayerTeamStats.objects.all()
+        if team_ids is not None:
+            existing = existing.filter(team_id__in=team_ids)
+        teams = set(existing.values_list("team_id", flat=True)) | {team_id for team_id, _ in stats}
+        existing.delete()
+        PlayerTeamStats.objects.bulk_create(stats.values(), batch_size=500)
+    cache.get_cache().delete_many([_board_key(team_id) for team_id in teams])
+    return len(stats)
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from analytics.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-team player stats behind the leaderboards from attendance rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--team",
+            type=int,
+            action="append",
+            dest="teams",
+            help="Only rebuild the given team id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild(team_ids=options["teams"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} player stats rows."))
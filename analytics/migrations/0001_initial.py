@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('player', '0001_initial'),
+        ('team', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerTeamStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sessions', models.PositiveIntegerField(default=0, verbose_name='Recorded Sessions')),
+                ('attended', models.PositiveIntegerField(default=0, verbose_name='Attended Sessions')),
+                ('score_sum', models.FloatField(default=0, verbose_name='Score Sum')),
+                ('score_count', models.PositiveIntegerField(default=0, verbose_name='Scored Sessions')),
+                ('recent', models.JSONField(blank=True, default=list, help_text='Last scores as [attendance id, score], oldest first', verbose_name='Recent Scores')),
+                ('recent_average', models.FloatField(blank=True, null=True, verbose_name='Recent Average Score')),
+                ('attendance_rate', models.FloatField(default=0, verbose_name='Attendance Rate')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='team_stats', to='player.player', verbose_name='Player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='team.team', verbose_name='Team')),
+            ],
+            options={
+                'verbose_name': 'Player Team Stats',
+                'verbose_name_plural': 'Player Team Stats',
+                'constraints': [models.UniqueConstraint(fields=('team', 'player'), name='unique_stats_per_team_player')],
+            },
+        ),
+    ]
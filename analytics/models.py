@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class PlayerTeamStats(models.Model):
+    """
+    Running attendance aggregates of a player in a team, the source of the
+    team leaderboards (analytics/leaderboard.py).
+
+    Rows are adjusted by the attendance write path instead of recomputed:
+    counters move by the difference between the old and the new row and
+    ``recent`` keeps the last scores as ``[attendance_id, score]`` pairs.
+    ``rebuild_leaderboards`` recomputes them from the attendance table.
+    """
+
+    team = models.ForeignKey('team.Team', on_delete=models.CASCADE, related_name='player_stats',
+                             verbose_name="Team")
+    player = models.ForeignKey('player.Player', on_delete=models.CASCADE, related_name='team_stats',
+                               verbose_name="Player")
+    sessions = models.PositiveIntegerField(default=0, verbose_name="Recorded Sessions")
+    attended = models.PositiveIntegerField(default=0, verbose_name="Attended Sessions")
+    score_sum = models.FloatField(default=0, verbose_name="Score Sum")
+    score_count = models.PositiveIntegerField(default=0, verbose_name="Scored Sessions")
+    recent = models.JSONField(default=list, blank=True, verbose_name="Recent Scores",
+                              help_text="Last scores as [attendance id, score], oldest first")
+    recent_average = models.FloatField(null=True, blank=True, verbose_name="Recent Average Score")
+    attendance_rate = models.FloatField(default=0, verbose_name="Attendance Rate")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+
+    class Meta:
+        verbose_name = "Player Team Stats"
+        verbose_name_plural = "Player Team Stats"
+        constraints = [
+            models.UniqueConstraint(fields=['team', 'player'], name='unique_stats_per_team_player')
+        ]
+
+    def __str__(self):
+        return f"{self.player_id} in {self.team_id}: {self.recent_average}"
+
+    @property
+    def average_score(self):
+        return self.score_sum / self.score_count if self.score_count else None
@@ -0,0 +1,146 @@
+# Per-player performance statistics over attendance history.
+#
+# The history of a whole team or school is read with one values_list() query
+# into NumPy arrays sorted by (player, recorded_at); every statistic is then
+# computed for all players at once with grouped array operations instead of
+# a Python loop over rows. Sessions have no date, so recorded_at orders them.
+import numpy as np
+
+from attendance.models import Attendance
+from core import cache
+
+DEFAULT_WINDOW = 5
+# Statuses that count as having attended the session.
+ATTENDED_STATUSES = (Attendance.Status.PRESENT, Attendance.Status.LATE)
+
+
+def attendance_scope(school_id):
+    """Data version scope of a school's attendance, bumped by analytics/signal.py."""
+    return f"attendance:{school_id}"
+
+
+def load_history(queryset):
+    """
+    Return ``(player_ids, attended, scores)`` arrays of the attendance rows in
+    ``queryset``, ordered by player and then by time. Missing scores are NaN.
+    """
+    rows = queryset.order_by("player_id", "recorded_at", "id").values_list("player_id", "status", "score")
+    if not rows:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=bool), np.empty(0, dtype=float)
+
+    player_ids, statuses, scores = zip(*rows)
+    return (
+        np.fromiter(player_ids, dtype=np.int64, count=len(player_ids)),
+        np.isin(np.array(statuses, dtype=object), ATTENDED_STATUSES),
+        np.array(scores, dtype=float),
+    )
+
+
+def _group_positions(groups, starts):
+    """Position of every row inside its group (0 for the first row)."""
+    return np.arange(groups.size) - starts[groups]
+
+
+def player_stats(player_ids, attended, scores, window=DEFAULT_WINDOW):
+    """
+    Statistics of every player in the (player, time) sorted arrays.
+
+    Returns a dict of equally long arrays keyed by statistic, ``player``
+    holding the player ids:
+
+    - ``sessions`` / ``attended`` / ``attendance_rate``
+    - ``average_score`` and ``rolling_average`` (mean of the last ``window``
+      scored sessions); NaN for players without scores
+    - ``current_streak`` / ``longest_streak``: consecutive attended sessions
+    - ``trend``: least squares slope of the score per scored session
+    """
+    players, starts, counts = np.unique(player_ids, return_index=True, return_counts=True)
+    if players.size == 0:
+        return {"player": players}
+    groups = np.repeat(np.arange(players.size), counts)
+    ends = starts + counts - 1
+    attended_count = np.bincount(groups, weights=attended, minlength=players.size)
+
+    # Streaks: distance to the last absence (or the row before the group start).
+    index = np.arange(player_ids.size)
+    breaks = np.where(~attended, index, -1)
+    breaks[starts] = np.where(attended[starts], starts - 1, starts)
+    streak = np.where(attended, index - np.maximum.accumulate(breaks), 0)
+
+    # Scores: only rows that have one, positions counted among those rows.
+    scored = ~np.isnan(scores)
+    scored_groups = groups[scored]
+    scored_values = scores[scored]
+    scored_counts = np.bincount(scored_groups, minlength=players.size)
+    scored_starts = np.concatenate(([0], np.cumsum(scored_counts)[:-1]))
+    x = _group_positions(scored_groups, scored_starts).astype(float)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        score_sum = np.bincount(scored_groups, weights=scored_values, minlength=players.size)
+        average = score_sum / scored_counts
+
+        recent = x >= (scored_counts[scored_groups] - window)
+        rolling = (np.bincount(scored_groups[recent], weights=scored_values[recent], minlength=players.size)
+                   / np.minimum(scored_counts, window))
+
+        sum_x = np.bincount(scored_groups, weights=x, minlength=players.size)
+        sum_xx = np.bincount(scored_groups, weights=x * x, minlength=players.size)
+        sum_xy = np.bincount(scored_groups, weights=x * scored_values, minlength=players.size)
+        denominator = scored_counts * sum_xx - sum_x ** 2
+        trend = np.where(denominator > 0, (scored_counts * sum_xy - sum_x * score_sum) / denominator, np.nan)
+
+    return {
+        "player": players,
+        "sessions": counts,
+        "attended": attended_count.astype(np.int64),
+        "attendance_rate": attended_count / counts,
+        "average_score": average,
+        "rolling_average": rolling,
+        "current_streak": streak[ends],
+        "longest_streak": np.maximum.reduceat(streak, starts),
+        "trend": trend,
+    }
+
+
+def _round(value, digits):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def as_rows(stats):
+    """Turn the arrays of player_stats() into a list of JSON friendly dicts."""
+    return [
+        {
+            "player": int(stats["player"][i]),
+            "sessions": int(stats["sessions"][i]),
+            "attended": int(stats["attended"][i]),
+            "attendance_rate": _round(stats["attendance_rate"][i], 4),
+            "average_score": _round(stats["average_score"][i], 2),
+            "rolling_average": _round(stats["rolling_average"][i], 2),
+            "current_streak": int(stats["current_streak"][i]),
+            "longest_streak": int(stats["longest_streak"][i]),
+            "trend": _round(stats["trend"][i], 4),
+        }
+        for i in range(stats["player"].size)
+    ]
+
+
+def get_report(school_id, team_id=None, window=DEFAULT_WINDOW):
+    """
+    Player statistics of a school (or one of its teams), cached until an
+    attendance row of the school changes.
+    """
+    store = cache.get_cache()
+    scope = attendance_scope(school_id)
+    key = f"player-performance:{school_id}:{team_id}:{window}:{cache.get_data_version(scope)}"
+    rows = store.get(key)
+    if rows is not None:
+        cache.record("hits")
+        return rows
+
+    cache.record("misses")
+    queryset = Attendance.objects.filter(training_session__team__school_id=school_id)
+    if team_id is not None:
+        queryset = queryset.filter(training_session__team_id=team_id)
+    rows = as_rows(player_stats(*load_history(queryset), window=window))
+    store.set(key, rows, cache.get_timeout())
+    return rows
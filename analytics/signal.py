@@ -0,0 +1,62 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from attendance.models import Attendance
+from core.cache import bump_version
+from training_session.models import TrainingSession
+from . import leaderboard
+from .performance import attendance_scope
+
+
+def _session_cell(training_session_id):
+    """``(team_id, school_id)`` of a training session."""
+    return TrainingSession.objects.filter(pk=training_session_id).values_list(
+        "team_id", "team__school_id").first() or (None, None)
+
+
+@receiver(pre_save, sender=Attendance)
+def remember_previous_attendance(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = Attendance.objects.filter(pk=instance.pk).values(
+        "player_id", "status", "score", "training_session__team_id").first()
+    instance._previous_attendance = previous
+
+
+@receiver(post_save, sender=Attendance)
+def update_after_attendance_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    team_id, school_id = _session_cell(instance.training_session_id)
+    if school_id is not None:
+        bump_version(attendance_scope(school_id))
+
+    previous = getattr(instance, "_previous_attendance", None)
+    new = leaderboard.attendance_state(instance.status, instance.score)
+    if previous is not None:
+        old = leaderboard.attendance_state(previous["status"], previous["score"])
+        old_cell = (previous["training_session__team_id"], previous["player_id"])
+        if old_cell != (team_id, instance.player_id):
+            leaderboard.apply_change(*old_cell, instance.pk, old=old)
+            old = None
+    else:
+        old = None
+    if team_id is not None:
+        leaderboard.apply_change(team_id, instance.player_id, instance.pk, old=old, new=new)
+    instance._previous_attendance = None
+
+
+@receiver(pre_delete, sender=Attendance)
+def remember_deleted_attendance_cell(sender, instance, **kwargs):
+    # The session may be deleted in the same cascade.
+    instance._attendance_cell = _session_cell(instance.training_session_id)
+
+
+@receiver(post_delete, sender=Attendance)
+def update_after_attendance_deleted(sender, instance, **kwargs):
+    team_id, school_id = getattr(instance, "_attendance_cell", (None, None))
+    if school_id is not None:
+        bump_version(attendance_scope(school_id))
+    if team_id is not None:
+        leaderboard.apply_change(team_id, instance.player_id, instance.pk,
+                                 old=leaderboard.attendance_state(instance.status, instance.score))
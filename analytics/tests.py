@@ -0,0 +1,124 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from attendance.models import Attendance
+from core import cache
+from core.testing import generate_dataset
+from school.models import School
+from team.models import Team
+from . import leaderboard
+from .performance import ATTENDED_STATUSES
+
+
+class HeatmapTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Three sessions per team, recorded 6, 4 and 2 days ago.
+        generate_dataset(coaches=2, players=4)
+        cls.manager_user = School.objects.select_related("manager__user").get().manager.user
+        cls.teams = list(Team.objects.order_by("name", "id"))
+        cls.end = timezone.localdate()
+        cls.start = cls.end - timedelta(days=6)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager_user)
+
+    def heatmap(self, **params):
+        params = {"start": self.start, "end": self.end, **params}
+        response = self.client.get("/api/analytics/heatmap/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def expected(self):
+        recorded, rates = [], []
+        for team in self.teams:
+            cells = [Attendance.objects.filter(training_session__team=team,
+                                               recorded_at__date=self.start + timedelta(days=offset))
+                     for offset in range(7)]
+            recorded.append([rows.count() for rows in cells])
+            rates.append([round(rows.filter(status__in=ATTENDED_STATUSES).count() / rows.count(), 3) if rows else None
+                          for rows in cells])
+        return recorded, rates
+
+    def test_cells_match_the_attendance(self):
+        data = self.heatmap()
+        self.assertEqual(data["teams"], [team.pk for team in self.teams])
+        self.assertEqual((data["recorded"], data["rates"]), self.expected())
+        self.assertEqual([row[0::2] for row in data["recorded"]], [[4, 4, 4, 0]] * 2)
+        self.assertEqual([row[1::2] for row in data["rates"]], [[None, None, None]] * 2)
+
+        one_team = self.heatmap(team=self.teams[1].pk)
+        self.assertEqual((one_team["teams"], one_team["recorded"]), ([self.teams[1].pk], data["recorded"][1:]))
+
+    def test_open_range_follows_attendance_changes(self):
+        self.heatmap()
+        attendance = Attendance.objects.filter(training_session__team=self.teams[0]).order_by("id").first()
+        attendance.status = (Attendance.Status.ABSENT if attendance.status in ATTENDED_STATUSES
+                             else Attendance.Status.PRESENT)
+        attendance.save()
+        data = self.heatmap()
+        self.assertEqual((data["recorded"], data["rates"]), self.expected())
+
+    def test_coach_reads_only_their_teams(self):
+        coach_user = self.teams[0].coach.user
+        self.client.force_authenticate(coach_user)
+        self.assertEqual(self.heatmap(team=self.teams[0].pk)["teams"], [self.teams[0].pk])
+        other = next(team for team in self.teams if team.coach_id != self.teams[0].coach_id)
+        response = self.client.get("/api/analytics/heatmap/", {"team": other.pk})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get("/api/analytics/heatmap/").status_code, 400)
+
+
+class SlowCache:
+    """The cache with a pause after every read, to widen read-modify-write races."""
+
+    def __init__(self, store):
+        self.store = store
+
+    def get(self, *args, **kwargs):
+        value = self.store.get(*args, **kwargs)
+        time.sleep(0.001)
+        return value
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(players=8)
+        cls.team = Team.objects.get()
+
+    def test_concurrent_moves_are_kept(self):
+        board = leaderboard.load_board(self.team.pk)
+        moves = {player_id: leaderboard.rank_key(100.0 - index, 1.0, player_id)
+                 for index, player_id in enumerate(board["players"])}
+        store = SlowCache(cache.get_cache())
+        with mock.patch.object(cache, "get_cache", return_value=store):
+            threads = [threading.Thread(target=leaderboard.move_player, args=(self.team.pk, player_id, key))
+                       for player_id, key in moves.items()]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        board = leaderboard.get_board(self.team.pk)
+        self.assertEqual(board["players"], moves)
+        self.assertEqual(board["keys"], sorted(moves.values()))
+
+    def test_stuck_lock_drops_the_board(self):
+        leaderboard.load_board(self.team.pk)
+        lock = f"leaderboard:{self.team.pk}:lock"
+        cache.get_cache().add(lock, "other", 60)
+        self.addCleanup(cache.get_cache().delete, lock)
+        with mock.patch.object(leaderboard, "LOCK_TIMEOUT", 0.01):
+            leaderboard.move_player(self.team.pk, 1, None)
+        self.assertIsNone(cache.get_cache().get(f"leaderboard:{self.team.pk}"))
@@ -0,0 +1,153 @@
+from datetime import timedelta
+
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.params import parse_date_param, parse_id_param, parse_int_param
+from school.models import School, Semester
+from team.models import Team
+from . import leaderboard
+from .heatmap import get_heatmap
+from .performance import DEFAULT_WINDOW, get_report
+
+MAX_WINDOW = 50
+MAX_LEADERBOARD_SIZE = 100
+MAX_HEATMAP_DAYS = 366
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """
+    Player performance statistics computed from attendance history.
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = {"players": 4, "leaderboard": 4, "heatmap": 5}
+
+    def get_date_param(self, name):
+        return parse_date_param(self.request.query_params, name)
+
+    def get_scope(self):
+        """
+        Resolve ``(school_id, team_id)`` the user may read:
+        coaches a team of theirs, managers their school or one of its teams,
+        admins any school via ?school=<id>.
+        """
+        user = self.request.user
+        params = self.request.query_params
+        team_id = parse_id_param(params, "team")
+
+        if team_id is not None:
+            team = get_object_or_404(Team.objects.select_related("coach", "school__manager"), pk=team_id)
+            allowed = (
+                user.is_superuser
+                or (user.role == user.COACH and team.coach is not None and team.coach.user_id == user.id)
+                or (user.role == user.MANAGER and team.school.manager.user_id == user.id)
+            )
+            if not allowed:
+                raise PermissionDenied("You can only read analytics of your own teams.")
+            return team.school_id, team.pk
+
+        school_id = parse_id_param(params, "school")
+        if user.is_superuser and school_id is not None:
+            return get_object_or_404(School, pk=school_id).pk, None
+        if user.role == user.MANAGER:
+            return get_object_or_404(School, manager__user=user).pk, None
+        raise ValidationError({"team": "This parameter is required."})
+
+    @extend_schema(
+        tags=["Analytics"],
+        summary="Player performance statistics",
+        description=(
+            "Per player of a team or school: sessions, attendance rate, average and rolling average score, "
+            "current and longest attendance streak and the score trend (slope per scored session).\n\n"
+            "- **Coaches**: One of their teams via `?team=<id>`.\n"
+            "- **Managers**: Their school, or one of its teams.\n"
+            "- **Admins**: Any school via `?school=<id>` or any team.\n\n"
+            "Cached until an attendance row of the school changes."
+        ),
+        parameters=[
+            OpenApiParameter("team", int, description="Team id."),
+            OpenApiParameter("school", int, description="School id (admins only)."),
+            OpenApiParameter("window", int, description=f"Sessions in the rolling average (1-{MAX_WINDOW}, "
+                                                        f"default {DEFAULT_WINDOW})."),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def players(self, request):
+        school_id, team_id = self.get_scope()
+        window = parse_int_param(request.query_params, "window", DEFAULT_WINDOW, 1, MAX_WINDOW)
+        return Response({
+            "school": school_id,
+            "team": team_id,
+            "window": window,
+            "players": get_report(school_id, team_id=team_id, window=window),
+        })
+
+    @extend_schema(
+        tags=["Analytics"],
+        summary="Team leaderboard",
+        description=(
+            f"Top players of a team by average score of their last {leaderboard.RECENT_WINDOW} scored sessions, "
+            "then attendance rate. Players without scores rank last.\n\n"
+            "Pass `?player=<id>` to also get that player's rank."
+        ),
+        parameters=[
+            OpenApiParameter("team", int, required=True, description="Team id."),
+            OpenApiParameter("limit", int, description=f"Number of players (1-{MAX_LEADERBOARD_SIZE}, default 10)."),
+            OpenApiParameter("player", int, description="Player whose rank to return."),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def leaderboard(self, request):
+        if not request.query_params.get("team"):
+            raise ValidationError({"team": "This parameter is required."})
+        _, team_id = self.get_scope()
+        limit = parse_int_param(request.query_params, "limit", 10, 1, MAX_LEADERBOARD_SIZE)
+
+        data = {"team": team_id, "top": leaderboard.top(team_id, limit)}
+        if request.query_params.get("player"):
+            player_id = parse_int_param(request.query_params, "player", None, 1, 2 ** 63 - 1)
+            data["player"] = leaderboard.rank_of(team_id, player_id)
+        return Response(data)
+
+    @extend_schema(
+        tags=["Analytics"],
+        summary="Attendance heatmap",
+        description=(
+            "Attendance rate per team (rows) and day (columns) in compact array form: "
+            "`recorded` holds the attendance rows of each cell, `rates` the share attended "
+            "(null where nothing was recorded). Column 0 is `start`.\n\n"
+            "Pick the range with `?semester=<id>` (its dates and teams) or `?start=`/`?end=` "
+            "(default: the last 30 days). Ranges that ended before today are cached for good."
+        ),
+        parameters=[
+            OpenApiParameter("semester", int, description="Semester id."),
+            OpenApiParameter("start", str, description="First day (YYYY-MM-DD)."),
+            OpenApiParameter("end", str, description="Last day (YYYY-MM-DD)."),
+            OpenApiParameter("team", int, description="Restrict to one team."),
+            OpenApiParameter("school", int, description="School id (admins only)."),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def heatmap(self, request):
+        school_id, team_id = self.get_scope()
+        semester = None
+        semester_id = parse_id_param(request.query_params, "semester")
+        if semester_id is not None:
+            semester = get_object_or_404(Semester, pk=semester_id, school_id=school_id)
+
+        end = self.get_date_param("end") or (semester.end_date if semester else timezone.localdate())
+        start = self.get_date_param("start") or (semester.start_date if semester else end - timedelta(days=29))
+        if start > end:
+            raise ValidationError({"start": "Must not be after end."})
+        if (end - start).days >= MAX_HEATMAP_DAYS:
+            raise ValidationError({"start": f"The range may span at most {MAX_HEATMAP_DAYS} days."})
+
+        return Response(get_heatmap(
+            school_id, start, end, semester_id=semester.pk if semester else None, team_id=team_id,
+        ))
@@ -0,0 +1,7 @@
+from rest_framework.routers import DefaultRouter
+from .api_views import AttendanceViewSet
+
+router = DefaultRouter()
+router.register("attendance", AttendanceViewSet, basename="attendance")
+
+urlpatterns = router.urls
@@ -0,0 +1,137 @@
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+
+from core.mixins import IdempotentCreateMixin
+from core.params import parse_date_param, parse_id_param
+from medical.availability import INJURED, player_availability
+from player.models import Player
+from training_session.models import TrainingSession
+from .models import Attendance
+from .serializers import AttendanceBatchSerializer, AttendanceSerializer, can_record_for_session
+
+# REST endpoints of the attendance app; views.py holds the template views.
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List attendance records",
+        tags=["Attendance"],
+        parameters=[OpenApiParameter("training_session", int)],
+    ),
+    create=extend_schema(
+        summary="Record attendance of a training session",
+        description=(
+            "Creates or updates the attendance of the given players.\n\n"
+            "Send an `Idempotency-Key` header to make retries safe: a repeated request with the same key "
+            "returns the first response and changes nothing."
+        ),
+        tags=["Attendance"],
+        request=AttendanceBatchSerializer,
+        responses={201: AttendanceSerializer(many=True)},
+    ),
+)
+class AttendanceViewSet(IdempotentCreateMixin, mixins.ListModelMixin, mixins.CreateModelMixin,
+                        viewsets.GenericViewSet):
+    """
+    - **Coaches**: Attendance of their teams' sessions.
+    - **Managers**: Attendance of their school's sessions.
+    - **Admins**: All attendance.
+    """
+    serializer_class = AttendanceSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {"list": 3, "roster": 6}
+    cursor_ordering = ("-recorded_at", "-id")
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = Attendance.objects.all()
+        if user.is_superuser:
+            pass
+        elif user.role == user.COACH:
+            queryset = queryset.filter(training_session__team__coach__user=user)
+        elif user.role == user.MANAGER:
+            queryset = queryset.filter(training_session__team__school__manager__user=user)
+        else:
+            return queryset.none()
+
+        session_id = parse_id_param(self.request.query_params, "training_session")
+        if session_id is not None:
+            queryset = queryset.filter(training_session_id=session_id)
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return AttendanceBatchSerializer
+        return AttendanceSerializer
+
+    def create(self, request, *args, **kwargs):
+        return self.idempotent_response(self.record_batch, request)
+
+    def record_batch(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        records = serializer.save()
+        return Response(AttendanceSerializer(records, many=True).data, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        summary="Attendance roster of a training session",
+        description=(
+            "Every player on the session's team with their availability and recorded attendance. "
+            "`status` is the recorded status, or the suggested one when nothing is recorded yet: "
+            "`excused` for players with an active medical record on `date`, otherwise `present`."
+        ),
+        tags=["Attendance"],
+        parameters=[
+            OpenApiParameter("training_session", int, required=True),
+            OpenApiParameter("date", str, description="Day of the session (YYYY-MM-DD, default today)."),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def roster(self, request):
+        params = request.query_params
+        session_id = parse_id_param(params, "training_session")
+        if session_id is None:
+            raise ValidationError({"training_session": "This parameter is required."})
+        session = get_object_or_404(
+            TrainingSession.objects.select_related("team__coach", "team__school__manager"),
+            pk=session_id,
+        )
+        if not can_record_for_session(request.user, session):
+            raise PermissionDenied("You can only see rosters of your own teams.")
+        day = parse_date_param(params, "date")
+
+        players = list(
+            Player.objects.filter(team=session.team_id)
+            .order_by("jersey_number", "id")
+            .values("id", "jersey_number", "user__username")
+        )
+        recorded = {
+            row["player_id"]: row
+            for row in Attendance.objects.filter(training_session=session).values(
+                "id", "player_id", "status", "score", "trainer_note")
+        }
+        availability = player_availability([player["id"] for player in players], day)
+
+        roster = []
+        for player in players:
+            attendance = recorded.get(player["id"])
+            available = availability[player["id"]]
+            if attendance:
+                suggested = attendance["status"]
+            else:
+                suggested = Attendance.Status.EXCUSED if available["status"] == INJURED else Attendance.Status.PRESENT
+            roster.append({
+                "player": player["id"],
+                "username": player["user__username"],
+                "jersey_number": player["jersey_number"],
+                "availability": available,
+                "attendance": attendance and attendance["id"],
+                "status": suggested,
+                "score": attendance and attendance["score"],
+                "trainer_note": attendance and attendance["trainer_note"],
+            })
+        return Response({"training_session": session.pk, "players": roster})
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('player', '0001_initial'),
+        ('training_session', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Attendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('present', 'Present'), ('absent', 'Absent'), ('late', 'Late'), ('excused', 'Excused')], default='present', max_length=10, verbose_name='Attendance Status')),
+                ('score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)], verbose_name='Performance Score')),
+                ('trainer_note', models.TextField(blank=True, help_text='Optional note or feedback from the trainer.', null=True, verbose_name='Trainer Note')),
+                ('recorded_at', models.DateTimeField(auto_now_add=True)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='player.player', verbose_name='Player')),
+                ('training_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='training_session.trainingsession', verbose_name='Training Session')),
+            ],
+            options={
+                'verbose_name': 'Attendance',
+                'verbose_name_plural': 'Attendances',
+                'ordering': ['player'],
+                'unique_together': {('player', 'training_session')},
+            },
+        ),
+    ]
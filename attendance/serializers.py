@@ -0,0 +1,74 @@
+from rest_framework import serializers
+
+from team.models import Team
+from training_session.models import TrainingSession
+from .models import Attendance
+
+
+def can_record_for_team(user, team):
+    """Coaches record for their own teams, managers for their school's teams."""
+    if user.is_superuser:
+        return True
+    if user.role == user.COACH:
+        return team.coach is not None and team.coach.user_id == user.id
+    if user.role == user.MANAGER:
+        return team.school.manager.user_id == user.id
+    return False
+
+
+def can_record_for_session(user, session):
+    return can_record_for_team(user, session.team)
+
+
+class AttendanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Attendance
+        fields = ["id", "player", "training_session", "status", "score", "trainer_note", "recorded_at"]
+        read_only_fields = ["id", "recorded_at"]
+
+
+class AttendanceRecordSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Attendance
+        fields = ["player", "status", "score", "trainer_note"]
+
+
+class AttendanceBatchSerializer(serializers.Serializer):
+    """
+    Attendance of several players of one training session.
+    Existing rows of the same player and session are updated.
+    """
+    training_session = serializers.PrimaryKeyRelatedField(
+        queryset=TrainingSession.objects.select_related("team__coach", "team__school__manager")
+    )
+    records = AttendanceRecordSerializer(many=True, allow_empty=False)
+
+    def validate_training_session(self, session):
+        if not can_record_for_session(self.context["request"].user, session):
+            raise serializers.ValidationError("You can only record attendance for your own teams.")
+        return session
+
+    def validate(self, data):
+        player_ids = [record["player"].pk for record in data["records"]]
+        if len(set(player_ids)) != len(player_ids):
+            raise serializers.ValidationError("Each player may appear only once.")
+        roster = set(
+            Team.players.through.objects.filter(
+                team_id=data["training_session"].team_id, player_id__in=player_ids
+            ).values_list("player_id", flat=True)
+        )
+        missing = sorted(set(player_ids) - roster)
+        if missing:
+            raise serializers.ValidationError({"records": f"Players {missing} are not on the session's team."})
+        return data
+
+    def create(self, validated_data):
+        session = validated_data["training_session"]
+        return [
+            Attendance.objects.update_or_create(
+                training_session=session,
+                player=record.pop("player"),
+                defaults=record,
+            )[0]
+            for record in validated_data["records"]
+        ]
@@ -1,3 +1,88 @@
+from datetime import date
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import IdempotencyKey
+from core.testing import generate_dataset
+from medical.models import MedicalRecord
+from school.models import School
+from training_session.models import TrainingSession
+
+
+class RosterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.manager_user = School.objects.select_related("manager__user").get().manager.user
+        recorded = TrainingSession.objects.order_by("pk").first()
+        cls.team = recorded.team
+        # A session nobody recorded attendance for yet.
+        cls.session = TrainingSession.objects.create(
+            team=cls.team, coach=cls.team.coach, title="Friday practice", start_time=recorded.start_time,
+            end_time=recorded.end_time, location=recorded.location,
+        )
+        cls.injured, *cls.fit = cls.team.players.order_by("pk")
+        MedicalRecord.objects.create(
+            player=cls.injured, training_session=recorded, title="Hamstring strain", description="Right leg",
+            diagnosed_date=date(2024, 2, 20), recovery_date=date(2024, 3, 10), doctor_name="Dr. Karimi",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager_user)
+
+    def roster(self, day):
+        response = self.client.get(f"/api/attendance/roster/?training_session={self.session.pk}&date={day}")
+        self.assertEqual(response.status_code, 200)
+        return {entry["player"]: entry for entry in response.data["players"]}
+
+    def test_injured_player_is_pre_marked_excused(self):
+        players = self.roster("2024-02-29")
+        self.assertEqual(players[self.injured.pk]["status"], "excused")
+        self.assertEqual(players[self.injured.pk]["availability"]["status"], "injured")
+        self.assertEqual({players[player.pk]["status"] for player in self.fit}, {"present"})
+        self.assertIsNone(players[self.injured.pk]["attendance"])
+
+    def test_recovered_player_is_pre_marked_present(self):
+        players = self.roster("2024-03-10")
+        self.assertEqual({entry["status"] for entry in players.values()}, {"present"})
+
+
+class IdempotentBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.session = TrainingSession.objects.select_related("team__coach__user").order_by("pk").first()
+        cls.players = list(cls.session.team.players.order_by("pk").values_list("pk", flat=True))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.session.team.coach.user)
+
+    def post(self, key, status="present"):
+        records = [{"player": player, "status": status, "score": 80} for player in self.players]
+        return self.client.post("/api/attendance/", {"training_session": self.session.pk, "records": records},
+                                format="json", HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_is_replayed(self):
+        first = self.post("batch-1")
+        self.assertEqual(first.status_code, 201)
+        with mock.patch("attendance.api_views.AttendanceViewSet.record_batch") as record_batch:
+            retry = self.post("batch-1")
+        record_batch.assert_not_called()
+        self.assertEqual((retry.status_code, retry["Idempotent-Replayed"]), (201, "true"))
+        self.assertEqual(retry.json(), first.json())
+
+    def test_key_reused_for_another_body(self):
+        self.assertEqual(self.post("batch-1").status_code, 201)
+        self.assertEqual(self.post("batch-1", status="absent").status_code, 422)
 
-# Create your tests here.
+    def test_retry_after_a_rejected_request(self):
+        # Without ATOMIC_REQUESTS nothing else would roll the key back.
+        with mock.patch.dict(connection.settings_dict, {"ATOMIC_REQUESTS": False}):
+            self.assertEqual(self.post("batch-1", status="flying").status_code, 400)
+            self.assertFalse(IdempotencyKey.objects.filter(key="batch-1").exists())
+            self.assertEqual(self.post("batch-1").status_code, 201)
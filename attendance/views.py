@@ -16,6 +16,7 @@ from team.models import Team
 from coache.models import Coach
 from .mixins import IsManagerOfSchoolMixin, IsCoachOrManagerOfTeamMixin, IsCoachOfTeamMixin, IsUserCoachOfTeamMixin
 from players.models import Player
+from medical.availability import INJURED, player_availability
 
 
 
@@ -91,9 +92,17 @@ class CoachAttendanceCreateView(LoginRequiredMixin, IsCoachOfTeamMixin, View):
         if existing_attendance.exists():
             formset = AttendanceFormSet(queryset=existing_attendance)
         else:
-            # Create initial data for each player
-            players = Player.objects.filter(team=team)
-            initial_data = [{'player': player} for player in players]
+            # Create initial data for each player, injured players pre-marked excused
+            players = list(Player.objects.filter(team=team))
+            availability = player_availability([player.pk for player in players])
+            initial_data = [
+                {
+                    'player': player,
+                    'status': Attendance.Status.EXCUSED if availability[player.pk]['status'] == INJURED
+                    else Attendance.Status.PRESENT,
+                }
+                for player in players
+            ]
             formset = AttendanceFormSet(queryset=Attendance.objects.none(), initial=initial_data)
 
         return render(request, self.template_name, {
@@ -4,3 +4,5 @@ from django.apps import AppConfig
 class CoachConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "coach"
+    def ready(self):
+        import coach.signal
@@ -0,0 +1,131 @@
+from datetime import timedelta
+from operator import attrgetter
+
+from django.db.models import Count, Prefetch, Q
+
+from attendance.models import Attendance
+from core import cache
+from player.models import Player
+from team.models import Team
+from training_session.models import TrainingSession
+
+UPCOMING_DAYS = 7
+# Training sessions shown per team: the most recently created ones.
+RECENT_SESSIONS = 10
+
+# date.weekday() -> EventDay.name
+WEEKDAY_NAMES = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def home_scope(coach_id):
+    """Data version scope of a coach's home screen, bumped by coach/signal.py."""
+    return f"coach-home:{coach_id}"
+
+
+def get_home(coach_id, today):
+    """
+    Home screen payload of a coach, from the cache when nothing it is built
+    from changed since. Returns ``(payload, hit)``.
+    """
+    store = cache.get_cache()
+    scope = home_scope(coach_id)
+    key = f"{scope}:{cache.get_data_version(scope)}:{today.isoformat()}"
+    payload = store.get(key)
+    if payload is not None:
+        cache.record("hits")
+        return payload, True
+
+    cache.record("misses")
+    payload = build_home(coach_id, today)
+    store.set(key, payload, cache.get_timeout())
+    return payload, False
+
+
+def build_home(coach_id, today):
+    """
+    Teams with their weekly schedule, compact roster and last RECENT_SESSIONS
+    training sessions (with attendance counts), plus the team meetings of
+    today and the next UPCOMING_DAYS days. Always four queries, however many
+    teams, players or sessions.
+    """
+    attendance_counts = {
+        status: Count("attendances", filter=Q(attendances__status=status))
+        for status in Attendance.Status.values
+    }
+    teams = (
+        Team.objects.filter(coach_id=coach_id)
+        .only("id", "name", "location", "team_training_location", "start_date", "end_date", "start_time",
+              "class_duration")
+        .order_by("start_time", "id")
+        .prefetch_related(
+            "event_days",
+            Prefetch(
+                "players",
+                queryset=Player.objects.select_related("user")
+                .only("id", "jersey_number", "user__username", "user__first_name", "user__last_name")
+                .order_by("jersey_number", "id"),
+            ),
+            Prefetch(
+                "training_sessions",
+                # Sliced per team (a window function), so old sessions are never loaded.
+                queryset=TrainingSession.objects.filter(is_canceled=False)
+                .annotate(recorded=Count("attendances"), **attendance_counts)
+                .order_by("-created_at", "-id")[:RECENT_SESSIONS],
+                to_attr="recent_sessions",
+            ),
+        )
+    )
+
+    payload_teams, meetings = [], []
+    window = [today + timedelta(days=offset) for offset in range(UPCOMING_DAYS + 1)]
+    for team in teams:
+        days = sorted(day.name for day in team.event_days.all())
+        end_time = (team.start_time.hour * 60 + team.start_time.minute + team.class_duration) % (24 * 60)
+        payload_teams.append({
+            "id": team.id,
+            "name": team.name,
+            "location": team.team_training_location or team.location,
+            "start_date": team.start_date,
+            "end_date": team.end_date,
+            "days": days,
+            "start_time": team.start_time,
+            "end_time": team.start_time.replace(hour=end_time // 60, minute=end_time % 60),
+            "players": [
+                {
+                    "id": player.id,
+                    "username": player.user.username,
+                    "first_name": player.user.first_name,
+                    "last_name": player.user.last_name,
+                    "jersey_number": player.jersey_number,
+                }
+                for player in team.players.all()
+            ],
+            "sessions": [
+                {
+                    "id": session.id,
+                    "title": session.title,
+                    "session_type": session.session_type,
+                    "start_time": session.start_time,
+                    "end_time": session.end_time,
+                    "location": session.location,
+                    "attendance": {
+                        "recorded": session.recorded,
+                        **{status: getattr(session, status) for status in attendance_counts},
+                    },
+                }
+                for session in sorted(team.recent_sessions, key=attrgetter("start_time", "id"))
+            ],
+        })
+        meetings += [
+            {"date": day, "team": team.id, "start_time": team.start_time}
+            for day in window
+            if team.start_date <= day <= team.end_date and WEEKDAY_NAMES[day.weekday()] in days
+        ]
+
+    meetings.sort(key=lambda meeting: (meeting["date"], meeting["start_time"]))
+    return {
+        "date": today,
+        "teams": payload_teams,
+        "today": [meeting for meeting in meetings if meeting["date"] == today],
+        "upcoming": [meeting for meeting in meetings if meeting["date"] > today],
+    }
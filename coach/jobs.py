@@ -0,0 +1,11 @@
+from django.contrib.auth import get_user_model
+
+from core.jobs import job
+
+
+@job("coach.delete_user", priority=-10)
+def delete_user(user_id):
+    """Delete the user of a deleted coach, with everything that cascades from it."""
+    user = get_user_model().objects.filter(pk=user_id).first()
+    if user is not None:
+        user.delete()
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('manager', '0001_initial'),
+        ('school', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Coach',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('education', models.CharField(blank=True, help_text="Coach's educational background", max_length=255, null=True, verbose_name='Education Level')),
+                ('specialty', models.CharField(blank=True, help_text="Coach's main area of expertise (e.g., Goalkeeper, Striker, Defense)", max_length=100, null=True, verbose_name='Specialty')),
+                ('description', models.TextField(blank=True, help_text="Detailed description of coach's experience and skills", null=True, verbose_name='Professional Description')),
+                ('bank_account_number', models.CharField(blank=True, help_text="Coach's bank account for salary payments", max_length=26, null=True, validators=[django.core.validators.RegexValidator(message='Bank account must be in Sheba format (IR + 24 digits)', regex='^IR\\d{24}$')], verbose_name='Bank Account Number')),
+                ('cooperation_start_date', models.CharField(blank=True, help_text='When the coach started working with this school', null=True, verbose_name='Cooperation Start Date')),
+                ('is_active', models.BooleanField(default=True, help_text='Whether the coach is currently active', verbose_name='Is Active')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('manager', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coaches', to='manager.manager', verbose_name='Hiring Manager')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='coaches', to='school.school', verbose_name='School')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='coach', to=settings.AUTH_USER_MODEL, verbose_name='User Account')),
+            ],
+            options={
+                'verbose_name': 'Coach',
+                'verbose_name_plural': 'Coaches',
+                'ordering': ['-cooperation_start_date'],
+                'indexes': [models.Index(fields=['cooperation_start_date'], name='coach_coach_coopera_95bcde_idx'), models.Index(fields=['school'], name='coach_coach_school__b7fe87_idx'), models.Index(fields=['manager'], name='coach_coach_manager_664c5b_idx'), models.Index(fields=['is_active'], name='coach_coach_is_acti_161672_idx'), models.Index(fields=['specialty'], name='coach_coach_special_1af26f_idx')],
+            },
+        ),
+    ]
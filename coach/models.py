@@ -158,7 +158,10 @@ from django.dispatch import receiver
 
 
 @receiver(post_delete, sender=Coach)
-def delete_user_with_coach(sender, instance, **kwargs):
-    if instance.user:
-        instance.user.delete()
+def delete_user_with_coach(sender, instance, using, **kwargs):
+    if instance.user_id:
+        # The user's cascade runs in a background job; until then it cannot log in.
+        get_user_model().objects.using(using).filter(pk=instance.user_id).update(is_active=False)
+        from .jobs import delete_user
+        delete_user.enqueue(user_id=instance.user_id, using=using)
 
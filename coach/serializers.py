@@ -1,8 +1,12 @@
 from rest_framework import serializers
 from .models import Coach
 from account.models import Profile, User
+from account.serializers import UserSerializer
+from core.serializers import DynamicFieldsMixin
+from manager.serializers import ManagerSerializer
+from school.serializers import SchoolSerializer
 
-class CoachSerializer(serializers.ModelSerializer):
+class CoachSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.CharField(write_only=True)
     national_id = serializers.CharField(write_only=True)
     phone_number = serializers.CharField(write_only=True)
@@ -20,6 +24,11 @@ class CoachSerializer(serializers.ModelSerializer):
             "date_of_birth", "image_profile", "emergency_phone", "password"
         ]
         read_only_fields = ["user", "manager", "school"]
+        expandable_fields = {
+            "user": (UserSerializer, {}),
+            "manager": (ManagerSerializer, {}),
+            "school": (SchoolSerializer, {}),
+        }
 
     def create(self, validated_data):
         request = self.context["request"]
@@ -0,0 +1,78 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from account.models import User
+from attendance.models import Attendance
+from core.cache import bump_version
+from player.models import Player
+from team.models import Team
+from training_session.models import TrainingSession
+from .home import home_scope
+
+# Invalidate the cached home screen (coach/home.py) of every coach whose
+# teams, rosters, schedules, sessions or attendance changed.
+
+
+def bump_coaches(coach_ids):
+    bump_version(*(home_scope(coach_id) for coach_id in set(coach_ids) if coach_id is not None))
+
+
+def _player_coach_ids(player_ids):
+    return Team.objects.filter(players__in=player_ids).values_list("coach_id", flat=True)
+
+
+@receiver(pre_save, sender=Team)
+def remember_previous_coach(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk is not None:
+        instance._previous_coach_id = Team.objects.filter(pk=instance.pk).values_list("coach_id", flat=True).first()
+
+
+@receiver(post_save, sender=Team)
+@receiver(post_delete, sender=Team)
+def bump_team_coach(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_coaches([instance.coach_id, getattr(instance, "_previous_coach_id", None)])
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+@receiver(m2m_changed, sender=Team.event_days.through)
+def bump_on_team_relations(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if isinstance(instance, Team):
+        bump_coaches([instance.coach_id])
+    elif isinstance(instance, Player):
+        # pre_clear has no pk_set, the player's teams are still in place.
+        bump_coaches(Team.objects.filter(pk__in=pk_set).values_list("coach_id", flat=True) if pk_set
+                     else _player_coach_ids([instance.pk]))
+    else:
+        bump_coaches(Team.objects.filter(event_days=instance).values_list("coach_id", flat=True))
+
+
+@receiver(post_save, sender=TrainingSession)
+@receiver(post_delete, sender=TrainingSession)
+def bump_session_coach(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_coaches(Team.objects.filter(pk=instance.team_id).values_list("coach_id", flat=True))
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def bump_attendance_coach(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_coaches(Team.objects.filter(training_sessions=instance.training_session_id)
+                     .values_list("coach_id", flat=True))
+
+
+@receiver(post_save, sender=Player)
+def bump_player_coaches(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_coaches(_player_coach_ids([instance.pk]))
+
+
+@receiver(post_save, sender=User)
+def bump_player_user_coaches(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Logins only touch last_login, which the roster does not show.
+    if raw or instance.role != User.PLAYER or update_fields == frozenset({"last_login"}):
+        return
+    bump_coaches(_player_coach_ids(Player.objects.filter(user=instance).values("pk")))
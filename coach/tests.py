@@ -1,3 +1,30 @@
 from django.test import TestCase
+from django.utils.timezone import localdate
 
-# Create your tests here.
+from attendance.models import Attendance
+from core.testing import assert_max_queries, generate_dataset
+from training_session.models import TrainingSession
+from .home import RECENT_SESSIONS, build_home
+from .models import Coach
+
+
+class HomeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(teams=2, sessions=RECENT_SESSIONS + 5)
+        cls.coach = Coach.objects.get()
+
+    def test_sessions_are_bounded(self):
+        with assert_max_queries(4):
+            payload = build_home(self.coach.pk, localdate())
+
+        self.assertEqual(len(payload["teams"]), 2)
+        for team in payload["teams"]:
+            recent = TrainingSession.objects.filter(team=team["id"], is_canceled=False)
+            recent = set(recent.order_by("-created_at", "-id").values_list("id", flat=True)[:RECENT_SESSIONS])
+            sessions = team["sessions"]
+            self.assertEqual({session["id"] for session in sessions}, recent)
+            self.assertEqual(sessions, sorted(sessions, key=lambda session: (session["start_time"], session["id"])))
+            for session in sessions:
+                recorded = Attendance.objects.filter(training_session=session["id"]).count()
+                self.assertEqual(session["attendance"]["recorded"], recorded)
@@ -1,12 +1,15 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from drf_spectacular.utils import extend_schema
+from core.mixins import ConditionalGetMixin, SparseFieldsetMixin
+from .home import get_home
 from .models import Coach
 from .serializers import CoachSerializer
 from attendance.models import Attendance
 from player.models import Player
 from team.models import Team
-from django.utils.timezone import now
+from django.utils.timezone import localdate, now
 from datetime import date
 from django.db.models import Count, Q
 import calendar
@@ -16,14 +19,40 @@ class IsManager(permissions.BasePermission):
         return hasattr(request.user, "manager")
 
 
-class CoachViewSet(viewsets.ModelViewSet):
+class CoachViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Coach.objects.all()
     serializer_class = CoachSerializer
     permission_classes = [permissions.IsAuthenticated, IsManager]
+    query_budget = {"list": 5, "home": 7}
+    cursor_ordering = ("-created_at", "-id")
+    expand_related = {"user": "user__profile", "manager": "manager", "school": "school__manager"}
+    conditional_timestamp_fields = ("updated_at", "user__updated_at", "user__profile__updated_at")
 
     def get_queryset(self):
         return Coach.objects.filter(manager=self.request.user.manager)
 
+    @extend_schema(
+        tags=["Coach"],
+        summary="Coach app home screen",
+        description=(
+            "Everything the coach app shows on start in one response: the coach's teams with weekly "
+            "schedule, compact roster and latest training sessions with attendance counts, plus today's and "
+            "the next 7 days' team meetings.\n\n"
+            "Cached per coach until a team, roster, schedule, session or attendance of theirs changes; "
+            "`X-Cache` tells whether the cache answered."
+        ),
+    )
+    @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
+    def home(self, request):
+        coach_id = Coach.objects.filter(user=request.user).values_list("id", flat=True).first()
+        if coach_id is None:
+            return Response({"detail": "You are not a coach."}, status=status.HTTP_403_FORBIDDEN)
+
+        payload, hit = get_home(coach_id, localdate())
+        response = Response(payload)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
     # Equivalent of CoachDashboardView
     @action(detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated])
     def dashboard(self, request):
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('coach', '0001_initial'),
+        ('manager', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CoachContract',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.BigIntegerField()),
+                ('description', models.TextField(blank=True, help_text="Detailed description of coach's contarct", null=True, verbose_name=' Description')),
+                ('expiration_date', models.DateField(blank=True, null=True)),
+                ('start_at', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('coach', models.OneToOneField(on_delete=django.db.models.deletion.PROTECT, to='coach.coach')),
+                ('manager', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='manager.manager')),
+            ],
+            options={
+                'verbose_name': 'Coach Contract',
+                'verbose_name_plural': 'Coach Contracts',
+                'ordering': ['-expiration_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SalaryRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('unpaid', 'Unpaid'), ('paid', 'Paid'), ('pending', 'Pending')], default='unpaid', max_length=10)),
+                ('month', models.DateField()),
+                ('description', models.TextField(blank=True, help_text="Detailed description of coach's salary", null=True, verbose_name=' Description')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('coach_contract', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='coach_salaries.coachcontract')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SalaryPayment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('paid_at', models.DateTimeField(auto_now_add=True)),
+                ('amount', models.BigIntegerField()),
+                ('transaction_id', models.CharField(blank=True, max_length=100, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('description', models.TextField(blank=True, help_text="Detailed description of coach's salary payment", null=True, verbose_name=' Description')),
+                ('salary_record', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to='coach_salaries.salaryrecord')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['paid_at'], name='coach_salar_paid_at_18a214_idx')],
+            },
+        ),
+    ]
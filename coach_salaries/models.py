@@ -65,5 +65,10 @@ class SalaryPayment(models.Model):
         help_text=_("Detailed description of coach's salary payment")
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['paid_at']),
+        ]
+
     def __str__(self):
         return f'{self.salary_record} - {self.amount} paid at {self.paid_at}'
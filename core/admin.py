@@ -0,0 +1,46 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from .models import IdempotencyKey, Job, ReplicationHeartbeat, SchoolShard, ShardUser
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ('key', 'user', 'status_code', 'created_at', 'expires_at')
+    list_filter = ('status_code',)
+    search_fields = ('key',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(ReplicationHeartbeat)
+class ReplicationHeartbeatAdmin(admin.ModelAdmin):
+    list_display = ('id', 'beat_at')
+
+
+@admin.register(SchoolShard)
+class SchoolShardAdmin(admin.ModelAdmin):
+    """The shard directory: every school of every shard, in one list."""
+    list_display = ('name', 'alias', 'school_id', 'updated_at')
+    list_filter = ('alias',)
+    search_fields = ('name',)
+
+
+@admin.register(ShardUser)
+class ShardUserAdmin(admin.ModelAdmin):
+    list_display = ('phone_number', 'alias', 'user_id')
+    list_filter = ('alias',)
+    search_fields = ('phone_number',)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'priority', 'attempts', 'run_at', 'finished_at', 'worker')
+    list_filter = ('status', 'name')
+    search_fields = ('name', 'key')
+    actions = ['retry_jobs']
+
+    @admin.action(description="Retry selected jobs now")
+    def retry_jobs(self, request, queryset):
+        retried = queryset.exclude(status=Job.RUNNING).update(
+            status=Job.QUEUED, run_at=timezone.now(), attempts=0, worker='', finished_at=None)
+        self.message_user(request, f"{retried} jobs queued again.")
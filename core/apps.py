@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "core"
+    def ready(self):
+        import core.signal
+        from django.utils.module_loading import autodiscover_modules
+        # Job types (<app>/jobs.py), for the workers to find them by name.
+        autodiscover_modules("jobs")
+        from django.db.backends.signals import connection_created
+        from .slowlog import attach
+        connection_created.connect(attach, dispatch_uid="core-slow-query-log")
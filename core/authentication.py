@@ -0,0 +1,76 @@
+# Authentication for school sharding (core/sharding.py): logins look the
+# phone number up in the shard directory, tokens carry the user's shard in
+# a "shard" claim and requests authenticated by them run on that shard.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+
+from . import sharding
+
+SHARD_CLAIM = "shard"
+
+
+def activate_token_shard(token):
+    """Route the request to the shard of a validated token (tokens without the claim: "default")."""
+    if sharding.is_enabled():
+        alias = token.get(SHARD_CLAIM, DEFAULT_DB_ALIAS)
+        if alias not in sharding.get_shards():
+            raise InvalidToken("Token refers to an unknown shard.")
+        sharding.activate(alias)
+
+
+def request_token_shard(request):
+    """The shard of the request's bearer token, read without a query; None without a valid token."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = authentication.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except (InvalidToken, TokenError):
+        return None
+    alias = token.get(SHARD_CLAIM, DEFAULT_DB_ALIAS)
+    return alias if alias in sharding.get_shards() else None
+
+
+class ShardedModelBackend(ModelBackend):
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if not sharding.is_enabled():
+            return super().authenticate(request, username, password, **kwargs)
+        phone_number = username if username is not None else kwargs.get(get_user_model().USERNAME_FIELD)
+        alias = sharding.shard_for_phone_number(phone_number) if phone_number else None
+        with sharding.use_shard(alias or DEFAULT_DB_ALIAS):
+            user = super().authenticate(request, username, password, **kwargs)
+        if user is not None:
+            sharding.activate(sharding.shard_of(user._state.db))
+        return user
+
+
+class ShardedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        activate_token_shard(validated_token)
+        return super().get_user(validated_token)
+
+
+class ShardTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if sharding.is_enabled():
+            token[SHARD_CLAIM] = sharding.shard_of(user._state.db)
+        return token
+
+
+class ShardTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        activate_token_shard(self.token_class(attrs["refresh"]))
+        try:
+            return super().validate(attrs)
+        except get_user_model().DoesNotExist:
+            # The user moved to another shard (or was deleted): log in again.
+            raise AuthenticationFailed(self.error_messages["no_active_account"], "no_active_account")
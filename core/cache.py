@@ -0,0 +1,97 @@
+# Versioned response cache for read-heavy endpoints.
+#
+# Each school has a data version counter in the cache and cached responses
+# are keyed by it: a write bumps one counter (core/signal.py) and the old
+# entries are never read again, they just expire. Only get/add/incr are
+# used so the local-memory and file-based backends both work.
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import db_router, metrics
+
+ALL_SCHOOLS = "all"
+STATS_KEYS = ("hits", "misses", "bytes_served")
+
+
+def get_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def get_timeout():
+    # Data read from a lagging replica must not stay cached under the current version.
+    if db_router.read_from_replica():
+        return getattr(settings, "REPLICA_CACHE_TIMEOUT", 30)
+    return getattr(settings, "RESPONSE_CACHE_TIMEOUT", 60 * 60)
+
+
+def _version_key(scope):
+    return f"data-version:{scope}"
+
+
+def get_data_version(scope):
+    """
+    Current data version of a school id (or ALL_SCHOOLS).
+
+    A missing counter starts from the current time, so a counter evicted
+    from the cache can never fall back to a version that is still cached.
+    """
+    cache = get_cache()
+    key = _version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(*scopes):
+    """Invalidate every entry keyed by the data version of these scopes."""
+    cache = get_cache()
+    for scope in scopes:
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.add(_version_key(scope), time.time_ns(), timeout=None)
+
+
+def bump_data_version(school_id):
+    """Invalidate every cached response of a school, and the cross school ones."""
+    bump_version(school_id, ALL_SCHOOLS)
+
+
+def record(stat, amount=1):
+    if stat == "bytes_served":
+        metrics.registry.inc("response_cache_bytes_served_total", amount=amount)
+    else:
+        metrics.registry.inc("response_cache_requests_total", (("result", stat),), amount)
+    cache = get_cache()
+    key = f"response-cache:{stat}"
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        if not cache.add(key, amount, timeout=None):
+            cache.incr(key, amount)
+
+
+def get_stats():
+    values = get_cache().get_many([f"response-cache:{stat}" for stat in STATS_KEYS])
+    stats = {stat: values.get(f"response-cache:{stat}", 0) for stat in STATS_KEYS}
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+def request_fingerprint(request):
+    """Hash of what selects a representation: path, query, API version and media type."""
+    params = sorted(request.query_params.lists())
+    return hashlib.sha1(
+        repr((request.path, params, request.version, request.accepted_media_type)).encode()
+    ).hexdigest()
+
+
+def build_key(prefix, scope, version, request):
+    """Cache key of a request: view, principal scope, data version and query."""
+    return f"response:{prefix}:{scope}:{version}:{request_fingerprint(request)}"
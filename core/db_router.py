@@ -0,0 +1,163 @@
+# Read replica routing.
+#
+# Writes always go to "default". Reads go to a healthy replica alias from
+# DATABASE_REPLICAS when they are replica-safe: a model of REPLICA_APPS, or
+# any read of a safe (GET/HEAD) request whose view label matches
+# REPLICA_VIEWS (see ReplicaRoutingMiddleware). A user who wrote is pinned
+# to the primary for REPLICA_STICKY_SECONDS, so they read their own writes.
+# A replica is checked at most every REPLICA_HEALTH_CHECK_INTERVAL seconds:
+# it must answer and its replication heartbeat must be younger than
+# REPLICA_MAX_LAG_SECONDS, otherwise reads fall back to the primary.
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from fnmatch import fnmatch
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+from . import cache
+
+logger = logging.getLogger("core.db_router")
+
+current_routing = ContextVar("current_routing", default=None)
+
+
+@dataclass
+class RequestRouting:
+    request: object = None
+    replica_view: bool = False
+    wrote: bool = False
+    pinned: bool = None
+    replica: str = None
+
+
+def read_from_replica():
+    """Whether the current request has read from a replica (its data may lag)."""
+    routing = current_routing.get()
+    return routing is not None and routing.replica is not None
+
+
+def get_replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def is_replica_view(label, method):
+    if method not in ("GET", "HEAD"):
+        return False
+    return any(fnmatch(label, pattern) for pattern in getattr(settings, "REPLICA_VIEWS", []))
+
+
+def _pin_key(user_id):
+    return f"replica-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    cache.get_cache().set(_pin_key(user_id), True, getattr(settings, "REPLICA_STICKY_SECONDS", 5))
+
+
+def is_pinned(user_id):
+    return bool(cache.get_cache().get(_pin_key(user_id)))
+
+
+class ReplicaHealth:
+    """Cached health of each replica alias."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked = {}
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        interval = getattr(settings, "REPLICA_HEALTH_CHECK_INTERVAL", 10)
+        state = self.checked.get(alias)
+        if state is not None and now - state[0] < interval:
+            return state[1]
+        with self.lock:
+            state = self.checked.get(alias)
+            if state is None or now - state[0] >= interval:
+                healthy = self.check(alias)
+                if state is not None and state[1] != healthy:
+                    logger.warning("Replica %s is now %s", alias, "healthy" if healthy else "unhealthy")
+                state = self.checked[alias] = (now, healthy)
+        return state[1]
+
+    def check(self, alias):
+        from .models import ReplicationHeartbeat
+
+        try:
+            beat_at = ReplicationHeartbeat.objects.using(alias).values_list("beat_at", flat=True).first()
+        except DatabaseError as exc:
+            logger.warning("Health check of replica %s failed: %s", alias, exc)
+            connections[alias].close()
+            return False
+        max_lag = getattr(settings, "REPLICA_MAX_LAG_SECONDS", 30)
+        if max_lag is None:
+            return True
+        return beat_at is not None and (timezone.now() - beat_at).total_seconds() <= max_lag
+
+    def reset(self):
+        self.checked.clear()
+
+
+health = ReplicaHealth()
+
+
+def choose_replica(routing=None):
+    """A healthy replica alias (the request keeps the one it got), or None."""
+    if routing is not None and routing.replica is not None:
+        return routing.replica
+    healthy = [alias for alias in get_replicas() if health.is_healthy(alias)]
+    if not healthy:
+        return None
+    alias = random.choice(healthy)
+    if routing is not None:
+        routing.replica = alias
+    return alias
+
+
+class ReplicaRouter:
+    def _replica_allowed(self, model, routing):
+        if model._meta.app_label in getattr(settings, "REPLICA_APPS", []):
+            if routing is None or not routing.wrote:
+                return True
+        return routing is not None and routing.replica_view and not routing.wrote
+
+    def _user_pinned(self, routing):
+        if routing is None or routing.request is None:
+            return False
+        if routing.pinned is None:
+            user = getattr(routing.request, "user", None)
+            # Not known yet: the authentication query itself reads the primary.
+            if user is None or not user.is_authenticated:
+                return True
+            routing.pinned = is_pinned(user.pk)
+        return routing.pinned
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if not get_replicas():
+            return None
+        routing = current_routing.get()
+        if not self._replica_allowed(model, routing) or self._user_pinned(routing):
+            return DEFAULT_DB_ALIAS
+        return choose_replica(routing) or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        routing = current_routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replicas()
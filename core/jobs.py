@@ -0,0 +1,338 @@
+# Background jobs (see the run_jobs command).
+#
+# A job is a row of core.Job in the database of the write that enqueued it,
+# so it commits or rolls back with that write and no broker is needed. A
+# job type is a function registered with @job(name); its keyword arguments
+# are the payload, checked against the signature when the job is enqueued.
+# Apps keep their job types in <app>/jobs.py, imported when Django starts.
+#
+# Workers claim ready jobs, highest priority first, one at a time: with
+# SELECT ... FOR UPDATE SKIP LOCKED where the backend has it, otherwise
+# with an UPDATE conditional on the job still being queued, so any number
+# of worker processes can poll the same table. A job runs in a transaction
+# that also marks it done. A failed job is retried after an exponential
+# backoff until it runs out of attempts. A claim older than
+# JOB_LEASE_SECONDS belongs to a dead worker and is queued again.
+# JOB_SCHEDULE enqueues recurring jobs, once per period and database.
+import inspect
+import json
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone as dt_timezone
+from functools import partial
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, close_old_connections, connections, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from . import db_router, sharding
+from .metrics import register_collector, registry
+from .models import Job
+
+logger = logging.getLogger("core.jobs")
+
+# Keyword arguments of JobType.enqueue(), not available as payload names.
+ENQUEUE_OPTIONS = {"using", "priority", "run_at", "delay", "key"}
+# Ready jobs a claim tries before it gives up to the other workers.
+CLAIM_CANDIDATES = 5
+
+_job_types = {}
+
+
+class JobError(Exception):
+    pass
+
+
+class LeaseLost(JobError):
+    """The job was queued again, or claimed by another worker, while it ran."""
+
+
+class JobType:
+    def __init__(self, func, name, priority=0, max_attempts=5, retry_delay=10):
+        self.func = func
+        self.name = name
+        self.priority = priority
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.signature = inspect.signature(func)
+        clashes = ENQUEUE_OPTIONS & set(self.signature.parameters)
+        if clashes:
+            raise JobError(f"Job {name!r} cannot take {', '.join(sorted(clashes))}: enqueue() uses them.")
+
+    def __repr__(self):
+        return f"<JobType {self.name}>"
+
+    def __call__(self, **payload):
+        """Run the job right here."""
+        return self.func(**payload)
+
+    def check(self, payload):
+        try:
+            self.signature.bind(**payload)
+        except TypeError as exc:
+            raise TypeError(f"Job {self.name!r}: {exc}") from None
+        json.dumps(payload)
+
+    def enqueue(self, *, using=None, priority=None, run_at=None, delay=None, key=None, **payload):
+        """
+        Add a job in the current transaction of ``using`` (the database the
+        routers pick for a write by default). It runs at ``run_at``, or
+        ``delay`` seconds from now. A job with the ``key`` of an existing
+        one is not added: None is returned.
+        """
+        self.check(payload)
+        if run_at is None:
+            run_at = timezone.now() + timedelta(seconds=delay or 0)
+        job = Job(
+            name=self.name, payload=payload, priority=self.priority if priority is None else priority,
+            max_attempts=self.max_attempts, run_at=run_at, key=key,
+        )
+        if key is None:
+            job.save(using=using)
+        else:
+            try:
+                with transaction.atomic(using=using):
+                    job.save(using=using)
+            except IntegrityError:
+                return None
+        if getattr(settings, "JOB_RUN_EAGERLY", False):
+            transaction.on_commit(partial(run_eagerly, job._state.db, job.pk), using=job._state.db)
+        return job
+
+    def backoff(self, attempts):
+        """Seconds before retry number ``attempts``: doubling, capped, with some jitter."""
+        delay = min(self.retry_delay * 2 ** (attempts - 1), getattr(settings, "JOB_MAX_RETRY_DELAY", 60 * 60))
+        return delay * random.uniform(0.8, 1.2)
+
+
+def job(name, *, priority=0, max_attempts=5, retry_delay=10):
+    """Register a function as the job type ``name`` (``"<app>.<action>"``)."""
+    def register(func):
+        if name in _job_types:
+            raise JobError(f"Job type {name!r} is already registered.")
+        job_type = _job_types[name] = JobType(func, name, priority, max_attempts, retry_delay)
+        return job_type
+    return register
+
+
+def get_job_type(name):
+    try:
+        return _job_types[name]
+    except KeyError:
+        raise JobError(f"Unknown job type {name!r}.") from None
+
+
+def get_databases():
+    """The databases holding jobs: every shard, or just the default database."""
+    return sharding.get_shards() or [DEFAULT_DB_ALIAS]
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _ready(using, now):
+    return Job.objects.using(using).filter(status=Job.QUEUED, run_at__lte=now).order_by("-priority", "run_at", "pk")
+
+
+def _claim_update(worker, now):
+    return {"status": Job.RUNNING, "worker": worker, "claimed_at": now, "attempts": F("attempts") + 1}
+
+
+def claim(using, worker, pk=None):
+    """Mark the next ready job of ``using`` (or job ``pk``) as running for ``worker`` and return it, or None."""
+    now = timezone.now()
+    ready = _ready(using, now)
+    if pk is not None:
+        ready = ready.filter(pk=pk)
+    if connections[using].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=using):
+            candidates = list(ready.select_for_update(skip_locked=True).values_list("pk", flat=True)[:1])
+            if candidates:
+                Job.objects.using(using).filter(pk=candidates[0]).update(**_claim_update(worker, now))
+    else:
+        candidates = list(ready.values_list("pk", flat=True)[:CLAIM_CANDIDATES])
+        # Workers polling together see the same candidates: try them in turn.
+        for candidate in candidates:
+            if Job.objects.using(using).filter(pk=candidate, status=Job.QUEUED).update(
+                    **_claim_update(worker, now)):
+                candidates = [candidate]
+                break
+        else:
+            candidates = []
+    if not candidates:
+        return None
+    return Job.objects.using(using).get(pk=candidates[0])
+
+
+def job_context(using):
+    """Route the queries of a job running from ``using``: its shard, and no replica reads."""
+    stack = ExitStack()
+    if sharding.is_enabled():
+        stack.enter_context(sharding.use_shard(sharding.shard_of(using)))
+    token = db_router.current_routing.set(db_router.RequestRouting(wrote=True))
+    stack.callback(db_router.current_routing.reset, token)
+    return stack
+
+
+def execute(job, worker):
+    """Run a claimed job. Returns True when it succeeded."""
+    using = job._state.db
+    started = time.perf_counter()
+    mine = Job.objects.using(using).filter(pk=job.pk, status=Job.RUNNING, worker=worker)
+    try:
+        job_type = get_job_type(job.name)
+        with job_context(using), transaction.atomic(using=using):
+            job_type(**job.payload)
+            if not mine.update(status=Job.SUCCEEDED, finished_at=timezone.now(), last_error=""):
+                raise LeaseLost(f"{job} was claimed again while it ran; its work is rolled back.")
+        result = "succeeded"
+    except LeaseLost as exc:
+        logger.warning("%s", exc)
+        result = "lost"
+    except Exception:
+        error = traceback.format_exc()
+        job_type = _job_types.get(job.name)
+        now = timezone.now()
+        if job_type is not None and job.attempts < job.max_attempts:
+            mine.update(status=Job.QUEUED, worker="", last_error=error,
+                        run_at=now + timedelta(seconds=job_type.backoff(job.attempts)))
+            result = "retried"
+        else:
+            mine.update(status=Job.FAILED, finished_at=now, last_error=error)
+            result = "failed"
+        logger.warning("%s #%s %s (attempt %s of %s):\n%s",
+                       job.name, job.pk, result, job.attempts, job.max_attempts, error)
+    elapsed = time.perf_counter() - started
+    registry.inc("jobs_processed_total", (("name", job.name), ("result", result)))
+    registry.inc("job_duration_seconds_total", (("name", job.name),), elapsed)
+    return result == "succeeded"
+
+
+def run_eagerly(using, pk):
+    """Run a job right after the commit that enqueued it (JOB_RUN_EAGERLY)."""
+    job = claim(using, worker_name(), pk=pk)
+    if job is not None:
+        execute(job, worker_name())
+
+
+def requeue_expired(using, now=None):
+    """Queue again the jobs whose claim is older than JOB_LEASE_SECONDS, or fail them when out of attempts."""
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=getattr(settings, "JOB_LEASE_SECONDS", 10 * 60))
+    expired = Job.objects.using(using).filter(status=Job.RUNNING, claimed_at__lt=cutoff)
+    error = "The worker running the job stopped answering (its lease expired)."
+    failed = expired.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, finished_at=now, last_error=error)
+    requeued = expired.update(status=Job.QUEUED, worker="", run_at=now, last_error=error)
+    return requeued, failed
+
+
+def enqueue_scheduled(using, now=None):
+    """Enqueue the job of the current period of each JOB_SCHEDULE entry, unless it exists."""
+    now = now or timezone.now()
+    for name, period in getattr(settings, "JOB_SCHEDULE", {}).items():
+        slot = int(now.timestamp() // period)
+        key = f"schedule:{name}:{slot}"
+        if not Job.objects.using(using).filter(key=key).exists():
+            get_job_type(name).enqueue(
+                using=using, key=key, run_at=datetime.fromtimestamp(slot * period, tz=dt_timezone.utc))
+
+
+class Worker:
+    """Runs the jobs of ``databases`` until stop() is called (or, with ``once``, until none is ready)."""
+
+    def __init__(self, databases=None, poll_interval=None, once=False):
+        self.databases = list(databases or get_databases())
+        self.poll_interval = poll_interval if poll_interval is not None else getattr(
+            settings, "JOB_POLL_INTERVAL", 1.0)
+        self.once = once
+        self.name = worker_name()
+        self.stopping = threading.Event()
+        self.maintained_at = None
+        self.processed = 0
+
+    def stop(self, *args):
+        self.stopping.set()
+
+    def maintain(self):
+        """Requeue expired claims and enqueue scheduled jobs, at most once a minute."""
+        now = time.monotonic()
+        if self.maintained_at is not None and now - self.maintained_at < max(self.poll_interval, 60):
+            return
+        self.maintained_at = now
+        for using in self.databases:
+            requeued, failed = requeue_expired(using)
+            if requeued or failed:
+                logger.warning("Expired claims on %s: %s jobs queued again, %s failed.", using, requeued, failed)
+            enqueue_scheduled(using)
+
+    def run_once(self):
+        """Claim and run at most one job of each database. Returns how many ran."""
+        ran = 0
+        for using in self.databases:
+            if self.stopping.is_set():
+                break
+            job = claim(using, self.name)
+            if job is not None:
+                execute(job, self.name)
+                ran += 1
+        return ran
+
+    def run(self):
+        logger.info("Worker %s polling %s.", self.name, ", ".join(self.databases))
+        while not self.stopping.is_set():
+            close_old_connections()
+            self.maintain()
+            ran = self.run_once()
+            self.processed += ran
+            if not ran:
+                if self.once:
+                    break
+                self.stopping.wait(self.poll_interval)
+        close_old_connections()
+        return self.processed
+
+
+def queue_stats(using, now=None):
+    """Queued, running and failed jobs by type, and the wait of the oldest ready job."""
+    now = now or timezone.now()
+    jobs = Job.objects.using(using)
+    counts = {}
+    for row in (jobs.filter(status__in=[Job.QUEUED, Job.RUNNING, Job.FAILED])
+                .order_by().values("name", "status").annotate(count=Count("pk"))):
+        counts.setdefault(row["name"], {})[row["status"]] = row["count"]
+    ready = jobs.filter(status=Job.QUEUED, run_at__lte=now).aggregate(count=Count("pk"), oldest=Min("run_at"))
+    return {
+        "database": using,
+        "counts": counts,
+        "ready": ready["count"],
+        "oldest_ready_seconds": (now - ready["oldest"]).total_seconds() if ready["oldest"] else 0.0,
+    }
+
+
+@register_collector
+def job_queue_depth(counters):
+    for using in get_databases():
+        stats = queue_stats(using)
+        for name, statuses in sorted(stats["counts"].items()):
+            for status, count in sorted(statuses.items()):
+                yield ("jobs", "gauge", "Queued, running and failed background jobs by database, type and status.",
+                       (("database", using), ("name", name), ("status", status)), count)
+        yield ("jobs_ready", "gauge", "Background jobs due to run, by database.", (("database", using),),
+               stats["ready"])
+        yield ("jobs_oldest_ready_age_seconds", "gauge", "How long the oldest due job has waited, by database.",
+               (("database", using),), stats["oldest_ready_seconds"])
+
+
+@job("core.purge_jobs", priority=-10)
+def purge_jobs():
+    """Delete the finished jobs older than JOB_RETENTION_SECONDS (see JOB_SCHEDULE)."""
+    Job.purge_finished()
@@ -0,0 +1,337 @@
+# Concurrent end-to-end load harness (see the loadtest command).
+#
+# Virtual users replay scripted journeys of the mobile apps: a coach logs in
+# through djoser's JWT endpoint, opens the home screen and the dashboard,
+# loads a session roster and submits its attendance; a manager logs in and
+# lists invoices. Requests go either straight into the ASGI application in
+# this process or over HTTP to a running server. Every journey draws from a
+# random generator seeded per virtual user, so runs are reproducible; only
+# the idempotency keys change from run to run.
+import asyncio
+import contextvars
+import json
+import random
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import defaultdict
+
+from django.db import OperationalError, connections
+from django.db.backends.signals import connection_created
+from django.db.models import Count
+
+from coach.models import Coach
+from school.models import School
+from team.models import Team
+from training_session.models import TrainingSession
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+RECORDED_STATUSES = ["present", "present", "present", "present", "late", "absent", "excused"]
+
+current_endpoint = contextvars.ContextVar("loadtest_endpoint", default=None)
+
+
+class InProcessClient:
+    """Call an ASGI application directly, without sockets."""
+
+    def __init__(self, application, host="localhost"):
+        self.application = application
+        self.host = host
+
+    async def request(self, method, path, body=None, headers=None):
+        path, _, query = path.partition("?")
+        payload = json.dumps(body).encode() if body is not None else b""
+        raw_headers = [(b"host", self.host.encode()), (b"content-length", str(len(payload)).encode())]
+        if body is not None:
+            raw_headers.append((b"content-type", b"application/json"))
+        raw_headers += [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "headers": raw_headers,
+            "client": ("127.0.0.1", 0),
+            "server": (self.host, 80),
+        }
+        sent = False
+        response = {"status": None, "body": []}
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            # Nothing more to read: wait like a client that keeps the connection open.
+            await asyncio.Future()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        await self.application(scope, receive, send)
+        return response["status"], b"".join(response["body"])
+
+
+class HTTPClient:
+    """Send requests to a running server; blocking calls run in worker threads."""
+
+    def __init__(self, base_url, timeout=30):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _send(self, method, path, body, headers):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method, headers=dict(headers or {}))
+        if data is not None:
+            request.add_header("Content-Type", "application/json")
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read()
+
+    async def request(self, method, path, body=None, headers=None):
+        return await asyncio.to_thread(self._send, method, path, body, headers)
+
+
+class LockTracker:
+    """
+    Time the SQL of in-process requests per endpoint. A write that fails with
+    "database is locked", or that takes longer than ``threshold_ms`` waiting
+    on SQLite's busy timeout, counts as a lock wait.
+    """
+
+    WRITES = ("INSERT", "UPDATE", "DELETE", "BEGIN")
+
+    def __init__(self, stats, threshold_ms):
+        self.stats = stats
+        self.threshold = threshold_ms / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        endpoint = current_endpoint.get()
+        if endpoint is None:
+            return execute(sql, params, many, context)
+        stats = self.stats[endpoint]
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as exc:
+            if "locked" in str(exc):
+                stats["lock_errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats["db_time"] += elapsed
+            stats["queries"] += 1
+            if elapsed > self.threshold and sql.lstrip()[:6].upper().startswith(self.WRITES):
+                stats["lock_waits"] += 1
+                stats["lock_wait_time"] += elapsed
+
+    def install(self):
+        for connection in connections.all():
+            connection.execute_wrappers.append(self)
+        connection_created.connect(self.connection_created, weak=False)
+
+    def uninstall(self):
+        connection_created.disconnect(self.connection_created)
+        for connection in connections.all():
+            if self in connection.execute_wrappers:
+                connection.execute_wrappers.remove(self)
+
+    def connection_created(self, sender, connection, **kwargs):
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+
+def load_fixtures(limit):
+    """
+    Coaches with the sessions and rosters they record attendance for, and
+    school managers, picked from the current database. Users created by
+    generate_dataset all share one password.
+    """
+    coaches = list(
+        Coach.objects.annotate(team_count=Count("teams")).filter(team_count__gt=0)
+        .order_by("id").values_list("id", "user__phone_number")[:limit]
+    )
+    sessions = defaultdict(list)
+    for session_id, coach_id, team_id in TrainingSession.objects.filter(
+            team__coach_id__in=[coach_id for coach_id, _ in coaches]).order_by("id").values_list(
+            "id", "team__coach_id", "team_id"):
+        sessions[coach_id].append((session_id, team_id))
+    rosters = defaultdict(list)
+    team_ids = {team_id for entries in sessions.values() for _, team_id in entries}
+    for team_id, player_id in Team.players.through.objects.filter(team_id__in=team_ids).order_by(
+            "team_id", "player_id").values_list("team_id", "player_id"):
+        rosters[team_id].append(player_id)
+
+    managers = list(School.objects.order_by("id").values_list("manager__user__phone_number", flat=True)[:limit])
+    return {
+        "coaches": [
+            {"phone_number": str(phone), "sessions": [(session, rosters[team]) for session, team in sessions[coach]]}
+            for coach, phone in coaches
+            if any(rosters[team] for _, team in sessions[coach])
+        ],
+        "managers": [str(phone) for phone in managers],
+    }
+
+
+class LoadTest:
+    def __init__(self, client, fixtures, password, users, iterations, manager_share=0.1, ramp=0.0, seed=0,
+                 think_time=0.0):
+        self.client = client
+        self.fixtures = fixtures
+        self.password = password
+        self.users = users
+        self.iterations = iterations
+        self.manager_share = manager_share
+        self.ramp = ramp
+        self.seed = seed
+        self.think_time = think_time
+        # Idempotency keys follow the seed within a run but never repeat across runs:
+        # a rerun against the same database would only replay the stored responses.
+        self.run_id = uuid.uuid4()
+        self.samples = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.failures = defaultdict(int)
+        self.db = defaultdict(lambda: defaultdict(float))
+
+    async def call(self, endpoint, method, path, body=None, token=None, headers=None):
+        headers = dict(headers or {})
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        reset = current_endpoint.set(endpoint)
+        started = time.perf_counter()
+        try:
+            status, content = await self.client.request(method, path, body, headers)
+        except Exception as exc:
+            self.failures[endpoint] += 1
+            self.statuses[endpoint][type(exc).__name__] += 1
+            return None, None
+        finally:
+            current_endpoint.reset(reset)
+        self.samples[endpoint].append((time.perf_counter() - started) * 1000)
+        self.statuses[endpoint][str(status)] += 1
+        return status, content
+
+    async def login(self, phone_number):
+        status, content = await self.call(
+            "POST /auth/jwt/create/", "POST", "/auth/jwt/create/",
+            {"phone_number": phone_number, "password": self.password},
+        )
+        if status != 200:
+            return None
+        return json.loads(content)["access"]
+
+    async def pause(self, rng):
+        if self.think_time:
+            await asyncio.sleep(rng.uniform(0, 2 * self.think_time))
+
+    async def coach_journey(self, rng, coach, token):
+        await self.call("GET /api/coaches/home/", "GET", "/api/coaches/home/", token=token)
+        await self.call("GET /api/coaches/dashboard/", "GET", "/api/coaches/dashboard/", token=token)
+        session_id, roster = rng.choice([entry for entry in coach["sessions"] if entry[1]])
+        await self.pause(rng)
+        await self.call("GET /api/attendance/roster/", "GET",
+                        f"/api/attendance/roster/?training_session={session_id}", token=token)
+        await self.pause(rng)
+        records = [
+            {"player": player_id, "status": status,
+             "score": round(rng.uniform(40, 100), 2) if status in ("present", "late") else None}
+            for player_id in roster
+            for status in [rng.choice(RECORDED_STATUSES)]
+        ]
+        await self.call("POST /api/attendance/", "POST", "/api/attendance/",
+                        {"training_session": session_id, "records": records}, token=token,
+                        headers={"Idempotency-Key": str(uuid.uuid5(self.run_id, str(rng.getrandbits(128))))})
+
+    async def manager_journey(self, rng, token):
+        await self.call("GET /api/invoices/", "GET", "/api/invoices/", token=token)
+        await self.call("GET /api/invoices/?status=overdue", "GET", "/api/invoices/?status=overdue", token=token)
+
+    async def virtual_user(self, index):
+        rng = random.Random(f"{self.seed}:{index}")
+        if self.ramp:
+            await asyncio.sleep(self.ramp * index / self.users)
+        managers, coaches = self.fixtures["managers"], self.fixtures["coaches"]
+        is_manager = managers and (not coaches or rng.random() < self.manager_share)
+        coach = None if is_manager else coaches[index % len(coaches)]
+        # Like the apps, a user logs in once and keeps the token for every journey.
+        token = await self.login(managers[index % len(managers)] if is_manager else coach["phone_number"])
+        if token is None:
+            return
+        for _ in range(self.iterations):
+            await self.pause(rng)
+            if is_manager:
+                await self.manager_journey(rng, token)
+            else:
+                await self.coach_journey(rng, coach, token)
+
+    async def run(self):
+        started = time.perf_counter()
+        await asyncio.gather(*(self.virtual_user(index) for index in range(self.users)))
+        return time.perf_counter() - started
+
+    def report(self, elapsed):
+        endpoints = {}
+        for endpoint in sorted(set(self.samples) | set(self.statuses)):
+            latencies = sorted(self.samples[endpoint])
+            requests = sum(self.statuses[endpoint].values())
+            errors = sum(count for status, count in self.statuses[endpoint].items()
+                         if not status.isdigit() or int(status) >= 400)
+            db = self.db.get(endpoint, {})
+            endpoints[endpoint] = {
+                "requests": requests,
+                "throughput_rps": round(requests / elapsed, 2) if elapsed else None,
+                "error_rate": round(errors / requests, 4) if requests else None,
+                "statuses": dict(self.statuses[endpoint]),
+                "latency_ms": {
+                    "p50": percentile(latencies, 50),
+                    "p95": percentile(latencies, 95),
+                    "p99": percentile(latencies, 99),
+                    "max": round(latencies[-1], 2) if latencies else None,
+                    "histogram": histogram(latencies),
+                },
+                "db": {
+                    "queries": int(db.get("queries", 0)),
+                    "time_ms": round(db.get("db_time", 0) * 1000, 2),
+                    "lock_waits": int(db.get("lock_waits", 0)),
+                    "lock_wait_ms": round(db.get("lock_wait_time", 0) * 1000, 2),
+                    "lock_errors": int(db.get("lock_errors", 0)),
+                } if db else None,
+            }
+        total = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 2) if elapsed else None,
+            "endpoints": endpoints,
+        }
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))
+    return round(sorted_values[index], 2)
+
+
+def histogram(sorted_values):
+    """Request counts per latency bucket, keyed by the bucket's upper bound in ms."""
+    counts = {f"<={bound}": 0 for bound in LATENCY_BUCKETS_MS}
+    counts[f">{LATENCY_BUCKETS_MS[-1]}"] = 0
+    for value in sorted_values:
+        for bound in LATENCY_BUCKETS_MS:
+            if value <= bound:
+                counts[f"<={bound}"] += 1
+                break
+        else:
+            counts[f">{LATENCY_BUCKETS_MS[-1]}"] += 1
+    return counts
@@ -0,0 +1,81 @@
+import pstats
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.profiling import StoredStats, get_profile_dir, read_profiles
+
+
+class Command(BaseCommand):
+    help = (
+        "Aggregate the request profiles written by ProfilingMiddleware per view: folded stacks "
+        "(flamegraph.pl / speedscope input) for sampled profiles, merged .prof files for cProfile ones, "
+        "and a summary of durations and SQL timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", help="Profile directory (default PROFILING_DIR).")
+        parser.add_argument("--output", default="profile-report", help="Directory for the aggregated files.")
+        parser.add_argument("--view", help="Only views whose label contains this text.")
+        parser.add_argument("--hours", type=float, help="Only profiles of the last N hours.")
+        parser.add_argument("--delete", action="store_true", help="Delete the profiles that were aggregated.")
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(hours=options["hours"]) if options["hours"] else None
+        stacks = defaultdict(Counter)
+        stats = {}
+        summary = defaultdict(lambda: {"profiles": 0, "duration_ms": 0.0, "queries": 0, "db_time_ms": 0.0})
+        used = []
+
+        for path, profile in read_profiles(options["dir"]):
+            view = profile["view"]
+            if options["view"] and options["view"] not in view:
+                continue
+            if since and datetime.fromisoformat(profile["started_at"]) < since:
+                continue
+            used.append(path)
+            totals = summary[view]
+            totals["profiles"] += 1
+            totals["duration_ms"] += profile["duration_ms"]
+            totals["queries"] += profile["queries"]
+            totals["db_time_ms"] += profile["db_time_ms"]
+            if "stacks" in profile:
+                stacks[view].update(profile["stacks"])
+            elif "pstats" in profile:
+                loaded = StoredStats(profile["pstats"])
+                if view in stats:
+                    stats[view].add(loaded)
+                else:
+                    stats[view] = pstats.Stats(loaded)
+
+        if not used:
+            raise CommandError(f"No profiles found in {options['dir'] or get_profile_dir()}.")
+
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+        for view, counts in stacks.items():
+            with open(output / f"{self.file_name(view)}.folded", "w") as folded:
+                for stack, count in counts.most_common():
+                    folded.write(f"{stack} {count}\n")
+        for view, merged in stats.items():
+            merged.dump_stats(output / f"{self.file_name(view)}.prof")
+
+        self.stdout.write(f"{'view':<56}{'profiles':>9}{'avg ms':>10}{'avg queries':>13}{'avg db ms':>11}")
+        for view, totals in sorted(summary.items(), key=lambda item: -item[1]["duration_ms"]):
+            count = totals["profiles"]
+            self.stdout.write(
+                f"{view:<56}{count:>9}{totals['duration_ms'] / count:>10.1f}"
+                f"{totals['queries'] / count:>13.1f}{totals['db_time_ms'] / count:>11.1f}"
+            )
+        if options["delete"]:
+            for path in used:
+                path.unlink(missing_ok=True)
+        self.stdout.write(self.style.SUCCESS(f"Aggregated {len(used)} profiles into {output}/."))
+
+    @staticmethod
+    def file_name(view):
+        return re.sub(r"[^\w.-]", "_", view)
@@ -0,0 +1,242 @@
+import json
+import platform
+import statistics
+import time
+from datetime import date
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from coach.models import Coach
+from core import cache
+from player_fees.models import PlayerInvoice
+from school.models import School
+
+
+# Requests are built for this host, which handle() allows whatever ALLOWED_HOSTS says.
+HOST = "localhost"
+
+
+class Unavailable(Exception):
+    """The dataset has nothing to run a hot path against."""
+
+
+def render(response):
+    if hasattr(response, "render"):
+        response.render()
+    if response.status_code >= 400:
+        raise RuntimeError(f"HTTP {response.status_code}")
+    return response
+
+
+def coach_dashboard():
+    from coach.views import CoachViewSet
+
+    coach = Coach.objects.annotate(team_count=Count("teams")).filter(team_count__gt=0).order_by("-team_count", "id")
+    coach = coach.select_related("user").first()
+    if coach is None:
+        raise Unavailable("no coach with teams")
+    # Pass the @action overrides (permission classes) the way the router does.
+    view = CoachViewSet.as_view({"get": "dashboard"}, **CoachViewSet.dashboard.kwargs)
+
+    def run():
+        request = APIRequestFactory(SERVER_NAME=HOST).get("/api/coaches/dashboard/")
+        force_authenticate(request, user=coach.user)
+        render(view(request))
+
+    return run
+
+
+def attendance_school_list():
+    from attendance.views import AttendanceSchoolListView
+
+    school = School.objects.select_related("manager__user").annotate(
+        rows=Count("teams__training_sessions__attendances")).order_by("-rows", "id").first()
+    if school is None:
+        raise Unavailable("no school")
+    view = AttendanceSchoolListView.as_view()
+
+    def run():
+        request = RequestFactory(SERVER_NAME=HOST).get(f"/attendance/school/{school.pk}/")
+        request.user = school.manager.user
+        render(view(request, school_id=school.pk))
+
+    return run
+
+
+def player_list(cold):
+    from player.views import PlayerViewSet
+
+    school = School.objects.select_related("manager__user").annotate(
+        players=Count("player")).order_by("-players", "id").first()
+    if school is None:
+        raise Unavailable("no school")
+    view = PlayerViewSet.as_view({"get": "list"})
+
+    def run():
+        if cold:
+            cache.get_cache().clear()
+        request = APIRequestFactory(SERVER_NAME=HOST).get("/api/players/")
+        force_authenticate(request, user=school.manager.user)
+        render(view(request))
+
+    return run
+
+
+def invoice_update_status():
+    invoice = PlayerInvoice.objects.annotate(payment_count=Count("payments")).order_by("-payment_count", "id").first()
+    if invoice is None:
+        raise Unavailable("no invoice")
+
+    def run():
+        invoice.update_status()
+
+    return run
+
+
+def coach_serializer_create():
+    from coach.serializers import CoachSerializer
+
+    school = School.objects.select_related("manager__user").order_by("id").first()
+    if school is None:
+        raise Unavailable("no school")
+    request = APIRequestFactory(SERVER_NAME=HOST).post("/api/coaches/")
+    request.user = school.manager.user
+    data = {
+        "full_name": "Benchmark Coach",
+        "national_id": "0012345678",
+        "phone_number": "+989399999999",
+        "date_of_birth": date(1990, 1, 1),
+        "password": "benchmark-password",
+        "cooperation_start_date": "2024-01-01",
+    }
+
+    def run():
+        serializer = CoachSerializer(data=data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    return run
+
+
+HOT_PATHS = {
+    "coach_dashboard": coach_dashboard,
+    "attendance_school_list": attendance_school_list,
+    "player_list": lambda: player_list(cold=True),
+    "player_list_cached": lambda: player_list(cold=False),
+    "invoice_update_status": invoice_update_status,
+    "coach_serializer_create": coach_serializer_create,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time and query-count the hot paths against the current database (see generate_dataset). "
+        "Every iteration runs in a transaction that is rolled back, so writes do not accumulate. "
+        "Results can be saved as a JSON baseline and later runs compared against it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Timed iterations per hot path.")
+        parser.add_argument("--warmup", type=int, default=2, help="Untimed iterations per hot path.")
+        parser.add_argument("--only", nargs="+", choices=sorted(HOT_PATHS), help="Hot paths to run.")
+        parser.add_argument("--output", help="Write the results to this JSON file.")
+        parser.add_argument("--compare", help="Baseline JSON file to compare the results with.")
+        parser.add_argument("--tolerance", type=float, default=0.25,
+                            help="Allowed slowdown of the median over the baseline (0.25 = 25%%).")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, HOST]):
+            for name in options["only"] or HOT_PATHS:
+                results[name] = self.measure(HOT_PATHS[name], options["repeat"], options["warmup"])
+                self.report(name, results[name])
+
+        if options["output"]:
+            document = {"meta": self.metadata(options), "results": results}
+            with open(options["output"], "w") as output:
+                json.dump(document, output, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['output']}.")
+
+        if options["compare"]:
+            with open(options["compare"]) as baseline:
+                regressions = self.compare(json.load(baseline)["results"], results, options["tolerance"])
+            if regressions:
+                raise CommandError(f"{len(regressions)} regression(s): " + "; ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def measure(self, factory, repeat, warmup):
+        try:
+            run = factory()
+        except Unavailable as exc:
+            return {"status": "unavailable", "detail": str(exc)}
+        except Exception as exc:
+            return {"status": "error", "detail": f"{type(exc).__name__}: {exc}"}
+
+        timings, queries = [], []
+        for iteration in range(warmup + repeat):
+            try:
+                with transaction.atomic():
+                    with CaptureQueriesContext(connection) as captured:
+                        started = time.perf_counter()
+                        run()
+                        elapsed = time.perf_counter() - started
+                    transaction.set_rollback(True)
+            except Exception as exc:
+                return {"status": "error", "detail": f"{type(exc).__name__}: {exc}"}
+            if iteration >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured))
+
+        timings.sort()
+        return {
+            "status": "ok",
+            "iterations": repeat,
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, round(0.95 * (len(timings) - 1)))], 3),
+            "min_ms": round(timings[0], 3),
+            "queries": max(queries),
+        }
+
+    def report(self, name, result):
+        if result["status"] != "ok":
+            self.stdout.write(self.style.WARNING(f"{name:<26}{result['status']}: {result['detail']}"))
+            return
+        self.stdout.write(
+            f"{name:<26}{result['median_ms']:>10.2f} ms median{result['p95_ms']:>10.2f} ms p95"
+            f"{result['queries']:>6} queries"
+        )
+
+    @staticmethod
+    def compare(baseline, results, tolerance):
+        regressions = []
+        for name, result in results.items():
+            before = baseline.get(name)
+            if result["status"] != "ok" or not before or before.get("status") != "ok":
+                continue
+            if result["queries"] > before["queries"]:
+                regressions.append(f"{name} runs {result['queries']} queries (baseline {before['queries']})")
+            if result["median_ms"] > before["median_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{name} median {result['median_ms']:.2f} ms (baseline {before['median_ms']:.2f} ms)")
+        return regressions
+
+    @staticmethod
+    def metadata(options):
+        return {
+            "created_at": timezone.now().isoformat(),
+            "repeat": options["repeat"],
+            "warmup": options["warmup"],
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+        }
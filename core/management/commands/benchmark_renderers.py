@@ -0,0 +1,111 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.renderers import FastJSONRenderer, MessagePackRenderer
+
+
+class BaselineEncoder(JSONEncoder):
+    # The stock encoder cannot serialize PhoneNumber at all.
+    def default(self, obj):
+        if isinstance(obj, PhoneNumber):
+            return str(obj)
+        return super().default(obj)
+
+
+class BaselineJSONRenderer(JSONRenderer):
+    encoder_class = BaselineEncoder
+
+
+def attendance_payload(rows):
+    """Rows shaped like an attendance export: nested player, Decimal scores, dates, UUIDs."""
+    now = timezone.now()
+    statuses = ["present", "absent", "late", "excused"]
+    return [
+        {
+            "id": index,
+            "player": {
+                "id": index % 400,
+                "username": f"player{index % 400}",
+                "phone_number": PhoneNumber.from_string(f"+98912{index % 10000000:07d}"),
+                "uuid": uuid.uuid4(),
+            },
+            "training_session": index // 20,
+            "date": (now - timedelta(days=index // 20)).date(),
+            "status": random.choice(statuses),
+            "score": Decimal(random.randint(0, 10000)) / 100,
+            "trainer_note": "Good positioning, needs to work on the weak foot." if index % 3 else None,
+            "recorded_at": now - timedelta(minutes=index),
+        }
+        for index in range(rows)
+    ]
+
+
+def player_payload(rows):
+    """A page of expanded players as returned by /api/players/?expand=user."""
+    now = timezone.now().isoformat()
+    return {
+        "next": "http://localhost/api/players/?cursor=cD00",
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "user": {
+                    "id": index,
+                    "username": f"player{index}",
+                    "email": f"player{index}@example.com",
+                    "phone_number": f"+98912{index:07d}",
+                    "first_name": "Ali",
+                    "last_name": "Rezaei",
+                    "role": "player",
+                    "profile": {"id": index, "uuid": str(uuid.uuid4()), "created_at": now, "updated_at": now},
+                },
+                "school": 1,
+                "jersey_number": index % 99,
+                "manager": 1,
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+class Command(BaseCommand):
+    help = "Compare serialization time of the stock JSONRenderer with the project renderers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Rows per payload.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed renders per renderer.")
+
+    def handle(self, *args, **options):
+        random.seed(0)
+        payloads = {
+            "attendance": attendance_payload(options["rows"]),
+            "players": player_payload(options["rows"]),
+        }
+        renderers = {
+            "drf-json": BaselineJSONRenderer(),
+            "orjson": FastJSONRenderer(),
+            "msgpack": MessagePackRenderer(),
+        }
+
+        self.stdout.write(f"{'payload':<12}{'renderer':<10}{'ms/render':>12}{'bytes':>12}{'speedup':>10}")
+        for payload_name, data in payloads.items():
+            baseline = None
+            for renderer_name, renderer in renderers.items():
+                body = renderer.render(data)
+                started = time.perf_counter()
+                for _ in range(options["repeat"]):
+                    renderer.render(data)
+                elapsed = (time.perf_counter() - started) * 1000 / options["repeat"]
+                baseline = baseline or elapsed
+                self.stdout.write(
+                    f"{payload_name:<12}{renderer_name:<10}{elapsed:>12.2f}{len(body):>12}{baseline / elapsed:>9.1f}x"
+                )
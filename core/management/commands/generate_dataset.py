@@ -0,0 +1,271 @@
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, time as day_time, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from account.models import Profile, User
+from analytics import leaderboard
+from attendance.models import Attendance
+from coach.models import Coach
+from core.cache import bump_data_version
+from finance.models import SchoolMonthlyLedger
+from manager.models import Manager
+from player.models import Player
+from player_fees.models import PlayerFeePayment, PlayerInvoice
+from school.models import School
+from team.models import EventDay, Team
+from training_session.models import TrainingSession
+
+PASSWORD = "benchmark-password"
+SESSION_TYPES = ["tactical", "technical", "fitness", "friendly_match"]
+STATUS_WEIGHTS = [
+    (Attendance.Status.PRESENT, 70),
+    (Attendance.Status.LATE, 10),
+    (Attendance.Status.ABSENT, 15),
+    (Attendance.Status.EXCUSED, 5),
+]
+
+
+@contextmanager
+def manual_timestamps(*fields):
+    """
+    Let bulk_create store the given auto_now_add values as assigned, so the
+    generated history spreads over past days instead of all being "now".
+    """
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic dataset (schools, managers, coaches, teams, players, sessions, attendance, "
+        "invoices and payments) with bulk inserts. Signals are bypassed, so profiles get no QR codes; "
+        "ledgers and leaderboards are rebuilt at the end. Only meant for development and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--schools", type=int, default=2)
+        parser.add_argument("--coaches", type=int, default=3, help="Coaches per school.")
+        parser.add_argument("--teams", type=int, default=2, help="Teams per coach.")
+        parser.add_argument("--players", type=int, default=15, help="Players per team.")
+        parser.add_argument("--sessions", type=int, default=24, help="Training sessions per team.")
+        parser.add_argument("--invoices", type=int, default=3, help="Monthly invoices per player.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for reproducible datasets.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        if min(options[name] for name in ("schools", "coaches", "teams", "players", "sessions")) < 1:
+            raise CommandError("Every count must be at least 1.")
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.password = make_password(PASSWORD)
+        self.next_user = (User.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+        self.today = timezone.localdate()
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            schools = self.create_schools(options["schools"])
+            coaches = self.create_coaches(schools, options["coaches"])
+            teams = self.create_teams(coaches, options["teams"])
+            rosters = self.create_players(teams, options["players"])
+            sessions = self.create_sessions(teams, options["sessions"])
+            attendance = self.create_attendance(sessions, rosters)
+            invoices, payments = self.create_invoices(teams, rosters, options["invoices"])
+
+        school_ids = [school.pk for school in schools]
+        SchoolMonthlyLedger.rebuild(school_ids=school_ids)
+        leaderboard.rebuild(team_ids=[team.pk for team in teams])
+        for school_id in school_ids:
+            bump_data_version(school_id)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(schools)} schools, {len(coaches)} coaches, {len(teams)} teams, "
+            f"{sum(len(players) for players in rosters.values())} players, {len(sessions)} sessions, "
+            f"{attendance} attendance rows, {invoices} invoices and {payments} payments "
+            f"in {time.perf_counter() - started:.1f}s. Every user's password is '{PASSWORD}'."
+        ))
+
+    def create_users(self, count, role):
+        first = self.next_user
+        self.next_user += count
+        users = User.objects.bulk_create(
+            [
+                User(
+                    username=f"gen{number}",
+                    email=f"gen{number}@example.com",
+                    phone_number=f"+98935{number:07d}",
+                    password=self.password,
+                    role=role,
+                )
+                for number in range(first, first + count)
+            ],
+            batch_size=self.batch_size,
+        )
+        Profile.objects.bulk_create([Profile(user=user) for user in users], batch_size=self.batch_size)
+        return users
+
+    def create_schools(self, count):
+        users = self.create_users(count, User.MANAGER)
+        managers = Manager.objects.bulk_create([Manager(user=user) for user in users])
+        return School.objects.bulk_create([
+            School(
+                name=f"School {user.username}",
+                address=f"{self.random.randint(1, 300)} Azadi Street",
+                email=f"school-{user.username}@example.com",
+                manager=manager,
+            )
+            for user, manager in zip(users, managers)
+        ])
+
+    def create_coaches(self, schools, per_school):
+        users = iter(self.create_users(len(schools) * per_school, User.COACH))
+        return Coach.objects.bulk_create([
+            Coach(user=next(users), manager_id=school.manager_id, school=school,
+                  specialty=self.random.choice(["Goalkeeper", "Striker", "Defense", "Fitness"]))
+            for school in schools
+            for _ in range(per_school)
+        ])
+
+    def create_teams(self, coaches, per_coach):
+        days = [EventDay.objects.get_or_create(name=name)[0] for name, _ in EventDay.DAY_CHOICES]
+        teams = Team.objects.bulk_create([
+            Team(
+                name=f"Team {coach.pk}-{index + 1}",
+                coach=coach,
+                school_id=coach.school_id,
+                manager_id=coach.manager_id,
+                specialization_field="Football",
+                team_training_location=f"Field {self.random.randint(1, 8)}",
+                team_capacity=30,
+                start_date=self.today - timedelta(days=180),
+                end_date=self.today + timedelta(days=180),
+                start_time=day_time(self.random.choice([8, 10, 15, 17, 19])),
+                class_duration=90,
+                payment_type=Team.CASH,
+                price_per_month=self.random.choice([800_000, 1_200_000, 1_500_000]),
+            )
+            for coach in coaches
+            for index in range(per_coach)
+        ])
+        Team.event_days.through.objects.bulk_create([
+            Team.event_days.through(team_id=team.pk, eventday_id=day.pk)
+            for team in teams
+            for day in self.random.sample(days, 3)
+        ], batch_size=self.batch_size)
+        return teams
+
+    def create_players(self, teams, per_team):
+        users = iter(self.create_users(len(teams) * per_team, User.PLAYER))
+        players = Player.objects.bulk_create(
+            [
+                Player(user=next(users), school_id=team.school_id, manager_id=team.manager_id,
+                       jersey_number=number + 1)
+                for team in teams
+                for number in range(per_team)
+            ],
+            batch_size=self.batch_size,
+        )
+        rosters = {team.pk: players[index * per_team:(index + 1) * per_team] for index, team in enumerate(teams)}
+        Team.players.through.objects.bulk_create([
+            Team.players.through(team_id=team_id, player_id=player.pk)
+            for team_id, roster in rosters.items()
+            for player in roster
+        ], batch_size=self.batch_size)
+        return rosters
+
+    def create_sessions(self, teams, per_team):
+        sessions = TrainingSession.objects.bulk_create(
+            [
+                TrainingSession(
+                    team=team,
+                    coach_id=team.coach_id,
+                    title=f"Session {index + 1}",
+                    start_time=team.start_time,
+                    end_time=day_time(team.start_time.hour + 1, 30),
+                    location=team.team_training_location,
+                    session_type=self.random.choice(SESSION_TYPES),
+                )
+                for team in teams
+                for index in range(per_team)
+            ],
+            batch_size=self.batch_size,
+        )
+        # Sessions have no date: remember the day each one took place for the attendance rows.
+        for index, session in enumerate(sessions):
+            session.generated_day = self.today - timedelta(days=2 * (per_team - index % per_team))
+        return sessions
+
+    def create_attendance(self, sessions, rosters):
+        statuses, weights = zip(*STATUS_WEIGHTS)
+        talent = {player.pk: self.random.gauss(65, 12) for roster in rosters.values() for player in roster}
+
+        def rows():
+            for session in sessions:
+                recorded_at = timezone.make_aware(datetime.combine(session.generated_day, session.start_time))
+                for player in rosters[session.team_id]:
+                    status = self.random.choices(statuses, weights)[0]
+                    scored = status in (Attendance.Status.PRESENT, Attendance.Status.LATE)
+                    score = min(max(self.random.gauss(talent[player.pk], 8), 0), 100) if scored else None
+                    yield Attendance(
+                        player=player,
+                        training_session=session,
+                        status=status,
+                        score=round(score, 2) if score is not None else None,
+                        recorded_at=recorded_at,
+                    )
+
+        created = 0
+        with manual_timestamps(Attendance._meta.get_field("recorded_at")):
+            for batch in batched(rows(), self.batch_size):
+                Attendance.objects.bulk_create(batch)
+                created += len(batch)
+        return created
+
+    def create_invoices(self, teams, rosters, months):
+        invoices = []
+        for team in teams:
+            for player in rosters[team.pk]:
+                for month in range(months):
+                    issued = (self.today - timedelta(days=30 * (months - month))).replace(day=1)
+                    invoices.append(PlayerInvoice(
+                        player=player, team=team, amount=team.price_per_month,
+                        issued_date=issued, due_date=issued + timedelta(days=10),
+                    ))
+
+        payments = []
+        for invoice in invoices:
+            outcome = self.random.random()
+            paid = invoice.amount if outcome < 0.7 else invoice.amount // 2 if outcome < 0.85 else 0
+            if paid:
+                paid_day = invoice.issued_date + timedelta(days=self.random.randint(0, 20))
+                payments.append(PlayerFeePayment(
+                    invoice=invoice, amount=paid, method=self.random.choice(["cash", "online"]),
+                    date=paid_day, paid_at=timezone.make_aware(datetime.combine(paid_day, day_time(12))),
+                ))
+            if paid >= invoice.amount:
+                invoice.status = PlayerInvoice.STATUS_PAID
+            elif invoice.due_date < self.today:
+                invoice.status = PlayerInvoice.STATUS_OVERDUE
+
+        PlayerInvoice.objects.bulk_create(invoices, batch_size=self.batch_size)
+        with manual_timestamps(PlayerFeePayment._meta.get_field("paid_at")):
+            PlayerFeePayment.objects.bulk_create(payments, batch_size=self.batch_size)
+        return len(invoices), len(payments)
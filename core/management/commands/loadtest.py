@@ -0,0 +1,118 @@
+import asyncio
+import json
+import logging
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core import sqlite
+from core.loadtest import HTTPClient, InProcessClient, LoadTest, LockTracker, load_fixtures
+from core.management.commands.generate_dataset import PASSWORD
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent coach and manager journeys (JWT login, home, dashboard, roster, bulk attendance, "
+        "invoices) against the ASGI application in this process, or against a running server with --url. "
+        "Requests write to the configured database: run it on a dataset made by generate_dataset."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50, help="Concurrent virtual users.")
+        parser.add_argument("--iterations", type=int, default=1, help="Journeys per virtual user, after one login.")
+        parser.add_argument("--ramp", type=float, default=0.0, help="Seconds over which the users start.")
+        parser.add_argument("--think-time", type=float, default=0.0,
+                            help="Mean pause in seconds between the steps of a journey.")
+        parser.add_argument("--manager-share", type=float, default=0.1,
+                            help="Share of virtual users running the manager journey.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--password", default=PASSWORD, help="Password of the generated users.")
+        parser.add_argument("--url", help="Base URL of a running server, e.g. http://127.0.0.1:8000.")
+        parser.add_argument("--lock-threshold", type=float, default=50.0,
+                            help="Writes slower than this many ms count as lock waits (in-process only).")
+        parser.add_argument("--sqlite-profile", choices=["settings", "baseline"], default="settings",
+                            help="In-process: run with the configured SQLite profile (core/sqlite) or with "
+                                 "the settings it replaced, to compare their throughput.")
+        parser.add_argument("--output", help="Write the report to this JSON file.")
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["iterations"] < 1:
+            raise CommandError("--users and --iterations must be at least 1.")
+        if options["url"] and options["sqlite_profile"] != "settings":
+            raise CommandError("--sqlite-profile only applies to in-process runs.")
+        # Before the first query: connections open with the profile's pragmas.
+        if options["sqlite_profile"] == "baseline":
+            sqlite.use_baseline()
+        fixtures = load_fixtures(limit=options["users"])
+        if not fixtures["coaches"] and not fixtures["managers"]:
+            raise CommandError("No coaches with sessions or managers found; run generate_dataset first.")
+
+        if options["url"]:
+            client = HTTPClient(options["url"])
+        else:
+            from FootbalSchool.asgi import application
+            client = InProcessClient(application)
+
+        load = LoadTest(
+            client, fixtures, options["password"], options["users"], options["iterations"],
+            manager_share=options["manager_share"], ramp=options["ramp"], seed=options["seed"],
+            think_time=options["think_time"],
+        )
+        tracker = None if options["url"] else LockTracker(load.db, options["lock_threshold"])
+        # Failed requests are counted in the report; their tracebacks only at -v 2.
+        request_logger = logging.getLogger("django.request")
+        level = request_logger.level
+        if options["verbosity"] < 2:
+            request_logger.setLevel(logging.CRITICAL)
+        if tracker:
+            tracker.install()
+        try:
+            elapsed = asyncio.run(load.run())
+        finally:
+            if tracker:
+                tracker.uninstall()
+            request_logger.setLevel(level)
+
+        report = load.report(elapsed)
+        database = None if options["url"] else sqlite.describe()
+        self.print_report(report)
+        if database:
+            self.stdout.write("Database: " + ", ".join(f"{key} {value}" for key, value in database.items()))
+        if options["output"]:
+            report["meta"] = {
+                "created_at": timezone.now().isoformat(),
+                "target": options["url"] or "in-process",
+                "users": options["users"],
+                "iterations": options["iterations"],
+                "ramp": options["ramp"],
+                "think_time": options["think_time"],
+                "manager_share": options["manager_share"],
+                "seed": options["seed"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": database,
+            }
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Report written to {options['output']}.")
+
+    def print_report(self, report):
+        self.stdout.write(
+            f"{'endpoint':<36}{'reqs':>6}{'rps':>8}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'locks':>7}"
+        )
+        for name, endpoint in report["endpoints"].items():
+            latency, db = endpoint["latency_ms"], endpoint["db"]
+            locks = db["lock_waits"] + db["lock_errors"] if db else "-"
+            self.stdout.write(
+                f"{name:<36}{endpoint['requests']:>6}{endpoint['throughput_rps']:>8.1f}"
+                f"{100 * (endpoint['error_rate'] or 0):>7.1f}"
+                + "".join(f"{'-' if value is None else f'{value:.1f}':>9}"
+                          for value in (latency["p50"], latency["p95"], latency["p99"]))
+                + f"{locks:>7}"
+            )
+        self.stdout.write(
+            f"{report['requests']} requests in {report['elapsed_s']:.2f}s ({report['throughput_rps']} req/s); "
+            "latencies in ms."
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.sharding import ShardingError, move_school
+
+
+class Command(BaseCommand):
+    help = (
+        "Move a school with all of its data to another shard (SCHOOL_SHARDS). Its rows get new ids on the "
+        "target shard, so the school's users have to log in again and their apps resync."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Shard the school is on.")
+        parser.add_argument("school_id", type=int, help="Id of the school on the source shard.")
+        parser.add_argument("target", help="Shard to move it to.")
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would move.")
+
+    def handle(self, *args, **options):
+        try:
+            new_id, counts = move_school(
+                options["source"], options["school_id"], options["target"],
+                batch_size=options["batch_size"], dry_run=options["dry_run"],
+            )
+        except ShardingError as exc:
+            raise CommandError(str(exc))
+        for label, count in counts.items():
+            if count:
+                self.stdout.write(f"  {label:<36} {count:>8}")
+        total = sum(counts.values())
+        if options["dry_run"]:
+            self.stdout.write(f"Would move {total} rows.")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Moved {total} rows: school {options['school_id']} on {options['source']} "
+                f"is now school {new_id} on {options['target']}."
+            ))
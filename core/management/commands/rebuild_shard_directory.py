@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from account.models import User
+from core import sharding
+from core.models import SchoolShard, ShardUser
+from school.models import School
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the shard directory (where each school and phone number lives) from the shards. "
+        "Run it after turning SCHOOL_SHARDS on, or after loading data without signals (bulk inserts)."
+    )
+
+    def handle(self, *args, **options):
+        if not sharding.is_enabled():
+            raise CommandError("SCHOOL_SHARDS is empty.")
+        schools = [
+            SchoolShard(alias=alias, school_id=school["pk"], name=school["name"])
+            for alias, school in sharding.across_shards(School.objects.values("pk", "name"))
+        ]
+        users = [
+            ShardUser(alias=alias, user_id=user["pk"], phone_number=user["phone_number"])
+            for alias, user in sharding.across_shards(User.objects.values("pk", "phone_number"))
+        ]
+        with transaction.atomic(using=sharding.directory_alias()):
+            SchoolShard.objects.all().delete()
+            ShardUser.objects.all().delete()
+            SchoolShard.objects.bulk_create(schools, batch_size=500)
+            # Fails on a phone number used on two shards: logins could not tell them apart.
+            ShardUser.objects.bulk_create(users, batch_size=500)
+        self.stdout.write(self.style.SUCCESS(
+            f"Directory rebuilt: {len(schools)} schools and {len(users)} users on {len(sharding.get_shards())} shards."
+        ))
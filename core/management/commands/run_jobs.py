@@ -0,0 +1,75 @@
+import multiprocessing
+import signal
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from core.jobs import Worker, get_databases
+
+
+def run_worker(databases, poll_interval, once):
+    worker = Worker(databases, poll_interval=poll_interval, once=once)
+    # Finish the running job, then stop.
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    return worker.run()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs (core/jobs.py) in one or more worker processes, highest priority first. "
+        "Workers of any number of commands and hosts can share the job tables. SIGTERM or Ctrl-C lets "
+        "the running jobs finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes.")
+        parser.add_argument("--database", action="append", dest="databases",
+                            help="Only run the jobs of this database (repeatable; default: all of them).")
+        parser.add_argument("--poll-interval", type=float, help="Seconds between polls when idle "
+                                                                "(default JOB_POLL_INTERVAL).")
+        parser.add_argument("--once", action="store_true", help="Exit once no job is due.")
+
+    def handle(self, *args, **options):
+        if options["processes"] < 1:
+            raise CommandError("--processes must be at least 1.")
+        databases = options["databases"] or get_databases()
+        unknown = set(databases) - set(get_databases())
+        if unknown:
+            raise CommandError(f"Not a database holding jobs: {', '.join(sorted(unknown))}.")
+        arguments = (databases, options["poll_interval"], options["once"])
+
+        if options["processes"] == 1:
+            processed = run_worker(*arguments)
+            self.stdout.write(f"Ran {processed} jobs.")
+            return
+
+        # Forked workers open their own connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        stopping = False
+
+        def stop(*args):
+            nonlocal stopping
+            stopping = True
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        processes = [context.Process(target=run_worker, args=arguments) for _ in range(options["processes"])]
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} workers for {', '.join(databases)}.")
+        while any(process.is_alive() for process in processes):
+            time.sleep(1)
+            if stopping or options["once"]:
+                continue
+            for index, process in enumerate(processes):
+                if not process.is_alive() and process.exitcode != 0:
+                    self.stderr.write(f"Worker {process.pid} exited with {process.exitcode}; restarting it.")
+                    processes[index] = context.Process(target=run_worker, args=arguments)
+                    processes[index].start()
+        self.stdout.write("Workers stopped.")
@@ -0,0 +1,108 @@
+import json
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+def log_files(path):
+    """The log and its rotated backups, oldest first."""
+    path = Path(path)
+    backups = [backup for backup in path.parent.glob(f"{path.name}.*") if backup.suffix[1:].isdigit()]
+    backups.sort(key=lambda backup: -int(backup.suffix[1:]))
+    return backups + ([path] if path.exists() else [])
+
+
+def percentile(sorted_values, percent):
+    return sorted_values[min(len(sorted_values) - 1, max(0, round(percent / 100 * len(sorted_values)) - 1))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Summarize the slow-query log (core/slowlog.py): the fingerprints with the most total time, "
+        "their call sites, a daily breakdown and the latest query plan."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--log", help="Log file (default SLOW_QUERY_LOG).")
+        parser.add_argument("--hours", type=float, help="Only queries of the last N hours.")
+        parser.add_argument("--limit", type=int, default=10, help="Number of fingerprints to show.")
+        parser.add_argument("--sort", choices=["total", "count", "max", "p95"], default="total")
+        parser.add_argument("--json", action="store_true", help="Print the summary as JSON.")
+
+    def handle(self, *args, **options):
+        path = options["log"] or getattr(settings, "SLOW_QUERY_LOG", None)
+        if not path:
+            raise CommandError("No log file: pass --log or set SLOW_QUERY_LOG.")
+        since = timezone.now() - timedelta(hours=options["hours"]) if options["hours"] else None
+
+        groups = defaultdict(lambda: {
+            "durations": [], "sites": Counter(), "views": Counter(), "days": defaultdict(list),
+        })
+        for log in log_files(path):
+            with open(log) as lines:
+                for line in lines:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    at = datetime.fromisoformat(record["at"])
+                    if since and at < since:
+                        continue
+                    group = groups[record["fingerprint"]]
+                    group["durations"].append(record["duration_ms"])
+                    group["sites"][record["stack"][0]] += 1
+                    group["views"][record.get("view") or "-"] += 1
+                    group["days"][at.date().isoformat()].append(record["duration_ms"])
+                    group["first_seen"] = group.get("first_seen") or record["at"]
+                    group["last_seen"] = record["at"]
+                    group["example"] = {"sql": record["sql"], "params": record["params"], "stack": record["stack"]}
+                    if record.get("plan"):
+                        group["plan"] = record["plan"]
+
+        summary = []
+        for key, group in groups.items():
+            durations = sorted(group["durations"])
+            summary.append({
+                "fingerprint": key,
+                "count": len(durations),
+                "total_ms": round(sum(durations), 2),
+                "p95_ms": percentile(durations, 95),
+                "max_ms": durations[-1],
+                "first_seen": group["first_seen"],
+                "last_seen": group["last_seen"],
+                "sites": group["sites"].most_common(5),
+                "views": group["views"].most_common(5),
+                "days": {day: {"count": len(values), "total_ms": round(sum(values), 2)}
+                         for day, values in sorted(group["days"].items())},
+                "example": group["example"],
+                "plan": group.get("plan"),
+            })
+        sort_key = {"total": "total_ms", "count": "count", "max": "max_ms", "p95": "p95_ms"}[options["sort"]]
+        summary.sort(key=lambda entry: -entry[sort_key])
+        summary = summary[:options["limit"]]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        if not summary:
+            self.stdout.write("No slow queries logged.")
+            return
+        for rank, entry in enumerate(summary, start=1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{rank}  {entry['count']} queries, {entry['total_ms']:.0f} ms total, "
+                f"p95 {entry['p95_ms']:.0f} ms, max {entry['max_ms']:.0f} ms "
+                f"({entry['first_seen'][:16]} .. {entry['last_seen'][:16]})"
+            ))
+            self.stdout.write(f"  {entry['fingerprint'][:300]}")
+            for site, count in entry["sites"]:
+                self.stdout.write(f"  {count:>6}x {site}")
+            for view, count in entry["views"]:
+                self.stdout.write(f"  {count:>6}x view {view}")
+            self.stdout.write("  per day: " + ", ".join(
+                f"{day} {values['count']}x/{values['total_ms']:.0f}ms" for day, values in entry["days"].items()))
+            for step in entry["plan"] or []:
+                self.stdout.write(f"  plan: {step}")
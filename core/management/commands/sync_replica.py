@@ -0,0 +1,51 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from core.db_router import get_replicas
+from core.models import ReplicationHeartbeat
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary to each SQLite replica of DATABASE_REPLICAS, after touching the "
+        "replication heartbeat. Stands in for real replication when running with local database files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--watch", type=float, metavar="SECONDS",
+                            help="Repeat every SECONDS (the simulated replication lag) until interrupted.")
+
+    def handle(self, *args, **options):
+        replicas = get_replicas()
+        if not replicas:
+            raise CommandError("DATABASE_REPLICAS is empty.")
+        for alias in [DEFAULT_DB_ALIAS, *replicas]:
+            if connections[alias].vendor != "sqlite":
+                raise CommandError(f"Database {alias!r} is not SQLite; use the database's own replication.")
+        while True:
+            started = time.perf_counter()
+            self.sync(replicas)
+            self.stdout.write(self.style.SUCCESS(
+                f"Synced {', '.join(replicas)} in {(time.perf_counter() - started) * 1000:.0f} ms."
+            ))
+            if not options["watch"]:
+                return
+            time.sleep(options["watch"])
+
+    def sync(self, replicas):
+        ReplicationHeartbeat.beat(using=DEFAULT_DB_ALIAS)
+        source = sqlite3.connect(settings.DATABASES[DEFAULT_DB_ALIAS]["NAME"])
+        try:
+            for alias in replicas:
+                # The backup API copies a consistent snapshot, even with writers on the primary.
+                target = sqlite3.connect(settings.DATABASES[alias]["NAME"])
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+        finally:
+            source.close()
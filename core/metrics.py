@@ -0,0 +1,184 @@
+# Application metrics in the Prometheus text format (see MetricsMiddleware
+# and the metrics endpoint).
+#
+# Each process keeps its counters and histograms in dicts, so recording a
+# request is a few dict updates under a lock, and dumps them to
+# METRICS_DIR/<pid>.metrics at most every METRICS_FLUSH_INTERVAL seconds.
+# The exposition sums the files of every live worker process; the files of
+# exited processes are removed, which scrapers see as a counter reset.
+# Values computed at scrape time (cache hit ratio, queue depths) come from
+# collectors registered with register_collector().
+import atexit
+import marshal
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    "http_requests_total": ("counter", "Requests by view, method and status code."),
+    "http_request_duration_seconds": ("histogram", "Request latency by view."),
+    "db_queries_total": ("counter", "SQL statements run by requests, by view."),
+    "db_query_duration_seconds_total": ("counter", "Time spent in SQL by requests, by view."),
+    "response_cache_requests_total": ("counter", "Response cache lookups by result."),
+    "response_cache_bytes_served_total": ("counter", "Bytes of responses served from the response cache."),
+    "jobs_processed_total": ("counter", "Background jobs run by workers, by type and result."),
+    "job_duration_seconds_total": ("counter", "Time spent running background jobs, by type."),
+}
+
+
+def get_metrics_dir():
+    return Path(getattr(settings, "METRICS_DIR", Path(settings.BASE_DIR) / "metrics"))
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.pid = os.getpid()
+        self.flushed_at = time.monotonic()
+
+    def inc(self, name, labels=(), amount=1):
+        with self.lock:
+            self.counters[(name, labels)] += amount
+        self.maybe_flush()
+
+    def observe_request(self, view, method, status, duration, queries=None, db_time=None):
+        view_labels = (("view", view),)
+        with self.lock:
+            self.counters[("http_requests_total", (("method", method), ("status", str(status)), ("view", view)))] += 1
+            histogram = self.histograms.get(("http_request_duration_seconds", view_labels))
+            if histogram is None:
+                histogram = self.histograms[("http_request_duration_seconds", view_labels)] = (
+                    [0] * (len(REQUEST_BUCKETS) + 1) + [0.0])
+            histogram[bisect_left(REQUEST_BUCKETS, duration)] += 1
+            histogram[-1] += duration
+            if queries is not None:
+                self.counters[("db_queries_total", view_labels)] += queries
+                self.counters[("db_query_duration_seconds_total", view_labels)] += db_time
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if time.monotonic() - self.flushed_at >= getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0):
+            self.flush()
+
+    def flush(self):
+        if os.getpid() != self.pid:
+            # Forked worker: start from zero, the parent's values are its own.
+            with self.lock:
+                self.counters.clear()
+                self.histograms.clear()
+                self.pid = os.getpid()
+        with self.lock:
+            self.flushed_at = time.monotonic()
+            data = marshal.dumps({
+                "counters": dict(self.counters),
+                "histograms": {key: list(value) for key, value in self.histograms.items()},
+            })
+        directory = get_metrics_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = directory / f".{self.pid}.metrics"
+        temporary.write_bytes(data)
+        os.replace(temporary, directory / f"{self.pid}.metrics")
+
+
+registry = Registry()
+atexit.register(lambda: registry.counters and registry.flush())
+
+_collectors = []
+
+
+def register_collector(collector):
+    """
+    Add a callable run at every scrape with the summed counters. It returns
+    ``(name, type, help, labels, value)`` tuples, ``labels`` being a tuple
+    of (name, value) pairs.
+    """
+    _collectors.append(collector)
+    return collector
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect():
+    """Counters and histograms summed over the files of all live processes."""
+    registry.flush()
+    counters = defaultdict(float)
+    histograms = {}
+    for path in get_metrics_dir().glob("*.metrics"):
+        if not _alive(int(path.stem)):
+            path.unlink(missing_ok=True)
+            continue
+        try:
+            data = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError):
+            continue
+        for key, value in data["counters"].items():
+            counters[key] += value
+        for key, values in data["histograms"].items():
+            total = histograms.setdefault(key, [0] * len(values))
+            for index, value in enumerate(values):
+                total[index] += value
+    return counters, histograms
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _number(value):
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def exposition():
+    """The metrics of all processes in the Prometheus text format (version 0.0.4)."""
+    counters, histograms = collect()
+    families = defaultdict(list)
+    for (name, labels), value in sorted(counters.items()):
+        families[name].append(f"{name}{_labels(labels)} {_number(value)}")
+    for (name, labels), values in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip(REQUEST_BUCKETS + ("+Inf",), values[:-1]):
+            cumulative += count
+            families[name].append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+        families[name].append(f"{name}_sum{_labels(labels)} {_number(values[-1])}")
+        families[name].append(f"{name}_count{_labels(labels)} {cumulative}")
+    for collector in _collectors:
+        for name, kind, description, labels, value in collector(counters):
+            HELP.setdefault(name, (kind, description))
+            families[name].append(f"{name}{_labels(labels)} {_number(value)}")
+
+    lines = []
+    for name in sorted(families):
+        kind, description = HELP.get(name, ("untyped", name))
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}", *families[name]]
+    return "\n".join(lines) + "\n"
+
+
+@register_collector
+def response_cache_ratio(counters):
+    hits = counters.get(("response_cache_requests_total", (("result", "hits"),)), 0)
+    lookups = hits + counters.get(("response_cache_requests_total", (("result", "misses"),)), 0)
+    yield ("response_cache_hit_ratio", "gauge", "Share of response cache lookups answered from the cache.", (),
+           hits / lookups if lookups else 0.0)
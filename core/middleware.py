@@ -0,0 +1,275 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+from fnmatch import fnmatch
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+
+from . import authentication, db_router, metrics, profiling, sharding, sqlite
+from .querycount import INSTRUMENTATION_FILES, current_view, describe_duplicates, record_queries
+
+logger = logging.getLogger("core.queries")
+profile_logger = logging.getLogger("core.profiling")
+
+INSTRUMENTATION_FILES.add(str(Path(__file__).resolve()))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_query_budget(view_func, method):
+    """
+    The ``query_budget`` a view class declares: a number for every request,
+    or a dict keyed by viewset action (``{"list": 4, "roster": 5}``).
+    """
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        actions = getattr(view_func, "actions", None) or {}
+        return budget.get(actions.get(method.lower()))
+    return budget
+
+
+class QueryCountMiddleware:
+    """
+    Record the number of queries, DB time and repeated statements of each
+    request. With DEBUG they are returned in X-Query-* headers, otherwise
+    logged as one JSON line on the "core.queries" logger (a warning when a
+    statement repeats or the view's query budget is exceeded). With
+    QUERY_BUDGET_STRICT (the test helpers turn it on) an exceeded budget
+    raises QueryBudgetExceeded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, "QUERY_INSTRUMENTATION", True):
+            return self.get_response(request)
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        request.query_recorder = recorder
+
+        budget = getattr(request, "_query_budget", None)
+        over_budget = budget is not None and recorder.count > budget
+        duplicates = recorder.duplicates
+        if over_budget and getattr(settings, "QUERY_BUDGET_STRICT", False):
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ran {recorder.count} queries, budget is {budget}. "
+                f"Repeated: {describe_duplicates(duplicates) or 'none'}"
+            )
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(recorder.count)
+            response["X-Query-Time-Ms"] = str(recorder.time_ms)
+            if budget is not None:
+                response["X-Query-Budget"] = str(budget)
+            if duplicates:
+                response["X-Query-Duplicates"] = describe_duplicates(duplicates)
+        else:
+            record = {
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "budget": budget,
+                **recorder.summary(),
+            }
+            level = logging.WARNING if over_budget or duplicates else logging.INFO
+            logger.log(level, json.dumps(record), extra={"query_stats": record})
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._query_budget = get_query_budget(view_func, request.method)
+
+
+class MetricsMiddleware:
+    """
+    Count every request in the metrics registry (core/metrics.py) by view,
+    method and status, with its latency and, when QueryCountMiddleware runs
+    inside it, its SQL count and time.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            # Not reset(): under ASGI, process_view runs in a copy of this context.
+            if hasattr(request, "_metrics_view"):
+                current_view.set(None)
+        recorder = getattr(request, "query_recorder", None)
+        metrics.registry.observe_request(
+            getattr(request, "_metrics_view", "unresolved"),
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            recorder and recorder.count,
+            recorder and recorder.time,
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view = profiling.view_label(view_func, request.method)
+        current_view.set(request._metrics_view)
+
+
+class ProfilingMiddleware:
+    """
+    Profile a sample of requests (PROFILING_SAMPLE_RATE), or any request
+    whose PROFILING_HEADER carries PROFILING_TOKEN, and write the profile
+    with its SQL timings to PROFILING_DIR. The file name is returned in
+    the X-Profile-Id header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not profiling.should_profile(request):
+            return self.get_response(request)
+
+        request._profiled = True
+        started_at = timezone.now()
+        profiler = profiling.RequestProfiler()
+        with record_queries() as recorder:
+            profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.stop()
+
+        record = {
+            "view": getattr(request, "_profile_view", None) or "unresolved",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(profiler.duration * 1000, 2),
+            "mode": profiler.mode,
+            **recorder.summary(),
+            **profiler.data(),
+        }
+        try:
+            response["X-Profile-Id"] = profiling.write_profile(record)
+        except OSError:
+            profile_logger.exception("Could not write the profile of %s %s", request.method, request.path)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(request, "_profiled", False):
+            request._profile_view = profiling.view_label(view_func, request.method)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Give core.db_router.ReplicaRouter the context of the request: whether
+    its view may read from a replica, and whether it wrote. A user who
+    wrote is pinned to the primary for the next REPLICA_STICKY_SECONDS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = db_router.RequestRouting(request=request)
+        token = db_router.current_routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            db_router.current_routing.reset(token)
+        user = getattr(request, "user", None)
+        if routing.wrote and user is not None and user.is_authenticated:
+            db_router.pin_to_primary(user.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        routing = db_router.current_routing.get()
+        if routing is not None:
+            label = getattr(request, "_metrics_view", None) or profiling.view_label(view_func, request.method)
+            routing.replica_view = db_router.is_replica_view(label, request.method)
+
+
+class ShardMiddleware:
+    """
+    Hold the shard of the request (core/sharding.py). Authentication moves
+    it to the principal's shard; unauthenticated requests, e.g. sign-ups,
+    stay on SHARD_FOR_NEW_USERS.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        alias = getattr(settings, "SHARD_FOR_NEW_USERS", None) if sharding.is_enabled() else None
+        token = sharding.current_shard.set(sharding.ShardContext(alias))
+        try:
+            return self.get_response(request)
+        finally:
+            sharding.current_shard.reset(token)
+
+
+class ShardTransactionMiddleware:
+    """
+    With school sharding, run the view in a transaction of the request's
+    shard only: the shard of its bearer token, otherwise
+    SHARD_FOR_NEW_USERS. Django's ATOMIC_REQUESTS would begin one on every
+    shard, and writes for schools on different shards would then wait for
+    each other. Databases that are not shards keep their ATOMIC_REQUESTS.
+    It calls the view itself, so it must be the last middleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not sharding.is_enabled():
+            return None
+        alias = authentication.request_token_shard(request) or sharding.get_current_shard() or DEFAULT_DB_ALIAS
+        sharding.activate(alias)
+        shards = sharding.get_shards()
+        non_atomic = getattr(view_func, "_non_atomic_requests", set())
+        with ExitStack() as stack:
+            for using, settings_dict in connections.settings.items():
+                if (settings_dict["ATOMIC_REQUESTS"] and using not in non_atomic
+                        and (using == alias or using not in shards)):
+                    stack.enter_context(transaction.atomic(using=using))
+            return view_func(request, *view_args, **view_kwargs)
+
+
+class SQLiteReadTransactionMiddleware:
+    """
+    Keep the ATOMIC_REQUESTS transaction deferred on SQLite databases with
+    an IMMEDIATE transaction_mode (core/sqlite) when the request only
+    reads: safe methods, and views matching SQLITE_DEFERRED_VIEWS such as
+    the token views. They must not wait for, or hold, the write lock.
+    """
+
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            sqlite.restore_transaction_modes(getattr(request, "_deferred_transactions", ()))
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # The view's transaction only begins after process_view.
+        if request.method not in self.SAFE_METHODS:
+            label = getattr(request, "_metrics_view", None) or profiling.view_label(view_func, request.method)
+            if not any(fnmatch(label, pattern) for pattern in getattr(settings, "SQLITE_DEFERRED_VIEWS", [])):
+                return
+        request._deferred_transactions = sqlite.defer_transactions()
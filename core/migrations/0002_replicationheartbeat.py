@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReplicationHeartbeat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('beat_at', models.DateTimeField(verbose_name='Beat At')),
+            ],
+            options={
+                'verbose_name': 'Replication Heartbeat',
+                'verbose_name_plural': 'Replication Heartbeats',
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import phonenumber_field.modelfields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_replicationheartbeat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, verbose_name='Shard')),
+                ('school_id', models.BigIntegerField(verbose_name='School ID')),
+                ('name', models.CharField(max_length=255, verbose_name='School Name')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'School Shard',
+                'verbose_name_plural': 'School Shards',
+                'ordering': ['alias', 'school_id'],
+                'constraints': [models.UniqueConstraint(fields=('alias', 'school_id'), name='unique_school_per_shard')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ShardUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', phonenumber_field.modelfields.PhoneNumberField(max_length=128, region=None, unique=True, verbose_name='Phone Number')),
+                ('alias', models.CharField(max_length=100, verbose_name='Shard')),
+                ('user_id', models.BigIntegerField(verbose_name='User ID')),
+            ],
+            options={
+                'verbose_name': 'Shard User',
+                'verbose_name_plural': 'Shard Users',
+                'constraints': [models.UniqueConstraint(fields=('alias', 'user_id'), name='unique_user_per_shard')],
+            },
+        ),
+    ]
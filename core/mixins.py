@@ -0,0 +1,316 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+from django.http.request import RawPostDataException
+from django.db.models import Count, Max, Prefetch
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+from school.models import School
+from . import cache
+from .models import IdempotencyKey, get_idempotency_ttl
+from .serializers import DynamicFieldsMixin, parse_field_list
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin behind ``?fields=`` and ``?expand=`` on read requests.
+
+    The requested names are handed to a DynamicFieldsMixin serializer and the
+    queryset follows what that serializer will render:
+
+    - ``expand_related`` maps a relation to the join it needs when rendered
+      nested (a string path is select_related, a Prefetch is prefetched);
+      relations left as primary keys are not joined at all.
+    - Columns that no rendered field reads are deferred with only().
+
+    Actions whose serializer is not a DynamicFieldsMixin one (password
+    changes and the like) are left alone.
+    """
+    expand_related = {}
+
+    def get_requested_fields(self):
+        if self.request.method not in SAFE_METHODS:
+            return None
+        return parse_field_list(self.request.query_params.get("fields"))
+
+    def get_expanded_fields(self):
+        if self.request.method not in SAFE_METHODS:
+            return set()
+        return parse_field_list(self.request.query_params.get("expand")) or set()
+
+    def is_dynamic(self):
+        """Whether the action's serializer takes ``fields`` and ``expand``."""
+        return issubclass(self.get_serializer_class(), DynamicFieldsMixin)
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_dynamic():
+            kwargs.setdefault("fields", self.get_requested_fields())
+            kwargs.setdefault("expand", self.get_expanded_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS or not self.is_dynamic():
+            return queryset
+
+        fields = self.get_requested_fields()
+        rendered = self.get_serializer_class()(
+            fields=fields, expand=self.get_expanded_fields()
+        ).fields
+
+        joined = []
+        for name, field in rendered.items():
+            related = self.expand_related.get(name)
+            if related is None or not isinstance(field, BaseSerializer):
+                continue
+            if isinstance(related, Prefetch):
+                queryset = queryset.prefetch_related(related)
+            else:
+                queryset = queryset.select_related(related)
+                joined.append(related.split("__")[0])
+
+        if fields is not None:
+            columns = self.get_loaded_columns(queryset.model, rendered)
+            if columns is not None:
+                queryset = queryset.only(*columns, *joined)
+        return queryset
+
+    def get_loaded_columns(self, model, rendered):
+        """
+        Model fields read by the rendered serializer fields, or None when one
+        of them is not a plain model field (a method, property or dotted
+        source) and nothing can be deferred safely.
+        """
+        model_fields = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        for field in rendered.values():
+            if field.write_only:
+                continue
+            if field.source not in model_fields:
+                return None
+            columns.add(field.source)
+
+        # The cursor paginator reads its ordering fields from the last row.
+        ordering = getattr(self, "cursor_ordering", ())
+        for name in (ordering,) if isinstance(ordering, str) else ordering:
+            name = name.lstrip("-")
+            columns.add(model._meta.pk.name if name == "pk" else name)
+        return columns
+
+
+class CachedResponseMixin:
+    """
+    Serve ``cached_actions`` from the versioned response cache (core/cache.py).
+
+    Entries are shared within a principal scope: admins share the cross
+    school scope, a manager gets the scope of their school. Anybody else is
+    served without the cache. Responses carry ``X-Cache: HIT`` or ``MISS``.
+    """
+    cached_actions = ("list", "retrieve")
+
+    def get_cache_scope(self):
+        if not hasattr(self, "_cache_scope"):
+            self._cache_scope = self.resolve_cache_scope()
+        return self._cache_scope
+
+    def resolve_cache_scope(self):
+        user = self.request.user
+        if user.is_superuser:
+            return cache.ALL_SCHOOLS
+        if user.role == user.MANAGER:
+            return School.objects.filter(manager__user=user).values_list("id", flat=True).first()
+        return None
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        scope = self.get_cache_scope() if self.action in self.cached_actions else None
+        if scope is None:
+            return handler(request, *args, **kwargs)
+
+        store = cache.get_cache()
+        prefix = getattr(self, "basename", None) or type(self).__name__
+        key = cache.build_key(prefix, scope, cache.get_data_version(scope), request)
+        entry = store.get(key)
+        if entry is not None:
+            cache.record("hits")
+            status_code, data, headers = entry
+            response = Response(data, status=status_code, headers=headers)
+            response["X-Cache"] = "HIT"
+            response.add_post_render_callback(self._record_bytes_served)
+            return response
+
+        cache.record("misses")
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            headers = {name: value for name, value in response.items() if name.lower() != "content-type"}
+            store.set(key, (response.status_code, response.data, headers), cache.get_timeout())
+        response["X-Cache"] = "MISS"
+        return response
+
+    @staticmethod
+    def _record_bytes_served(response):
+        cache.record("bytes_served", len(response.content))
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified handling for ``conditional_actions``.
+
+    Validators are computed before the view does any work, so a matching
+    ``If-None-Match`` or ``If-Modified-Since`` is answered with a 304 without
+    serializing anything:
+
+    - ``conditional_timestamp_fields``: one aggregate query reading the
+      MAX() of these fields and the row count of the visible queryset.
+    - otherwise the school data version of CachedResponseMixin's scope.
+    """
+    conditional_actions = ("list", "retrieve")
+    conditional_timestamp_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def get_conditional_queryset(self):
+        queryset = self.get_queryset()
+        if self.action == "list":
+            return queryset
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg not in self.kwargs:
+            return None
+        return queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+
+    def get_conditional_validators(self):
+        """Return ``(etag_seed, last_modified_timestamp)`` or None when unknown."""
+        if self.conditional_timestamp_fields:
+            queryset = self.get_conditional_queryset()
+            if queryset is None:
+                return None
+            stats = queryset.order_by().aggregate(
+                count=Count("pk"),
+                **{f"last_{index}": Max(name) for index, name in enumerate(self.conditional_timestamp_fields)},
+            )
+            stamps = [value for key, value in stats.items() if key != "count" and value is not None]
+            last_modified = max(stamps) if stamps else None
+            seed = (stats["count"], *(stamp.isoformat() for stamp in stamps))
+            return seed, int(last_modified.timestamp()) if last_modified else None
+
+        scope = self.get_cache_scope() if hasattr(self, "get_cache_scope") else None
+        if scope is None:
+            return None
+        return (scope, cache.get_data_version(scope)), None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        validators = self.get_conditional_validators() if self.action in self.conditional_actions else None
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        seed, last_modified = validators
+        etag = quote_etag(hashlib.sha1(
+            repr((type(self).__name__, seed, cache.request_fingerprint(request))).encode()
+        ).hexdigest())
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+
+class IdempotentCreateMixin:
+    """
+    Honour an ``Idempotency-Key`` header on ``idempotent_actions``.
+
+    The first request with a key runs normally and its successful response is
+    stored for the user; a retry is answered from that row (one indexed read)
+    with ``Idempotent-Replayed: true`` and never reaches the domain tables.
+    Reusing a key for a different request is a 422, a retry that arrives
+    while the first request is still running a 409. Failed requests are not
+    stored, so the client may retry them under the same key.
+    """
+    idempotent_actions = ("create",)
+    idempotency_header = "Idempotency-Key"
+
+    def create(self, request, *args, **kwargs):
+        return self.idempotent_response(super().create, request, *args, **kwargs)
+
+    def get_request_hash(self, request):
+        try:
+            body = request.body
+        except RawPostDataException:
+            # Multipart bodies are consumed by the parser, hash what it produced.
+            body = repr(sorted(request.data.lists())).encode()
+        return hashlib.sha256(b"\n".join((request.method.encode(), request.path.encode(), body))).hexdigest()
+
+    def idempotent_response(self, handler, request, *args, **kwargs):
+        key = request.headers.get(self.idempotency_header)
+        if not key or self.action not in self.idempotent_actions:
+            return handler(request, *args, **kwargs)
+        if len(key) > 255:
+            return Response({"detail": f"{self.idempotency_header} must be at most 255 characters."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        request_hash = self.get_request_hash(request)
+        record = IdempotencyKey.objects.filter(user=request.user, key=key).first()
+        if record is not None and record.is_expired:
+            record.delete()
+            record = None
+        if record is None:
+            try:
+                with transaction.atomic():
+                    record = IdempotencyKey.objects.create(
+                        user=request.user, key=key, request_hash=request_hash,
+                        expires_at=timezone.now() + get_idempotency_ttl(),
+                    )
+            except IntegrityError:
+                return Response({"detail": "A request with this idempotency key is in progress."},
+                                status=status.HTTP_409_CONFLICT)
+            try:
+                # A savepoint, so the transaction is still usable to drop the key if it raises.
+                with transaction.atomic():
+                    response = handler(request, *args, **kwargs)
+            except Exception:
+                # Raised errors (is_valid(raise_exception=True) and the like) are failures
+                # too: the retry must run again, not wait for the key to expire.
+                record.delete()
+                raise
+            return self.store_response(record, response)
+
+        if record.request_hash != request_hash:
+            return Response({"detail": "This idempotency key was used for a different request."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        if not record.is_complete:
+            return Response({"detail": "A request with this idempotency key is in progress."},
+                            status=status.HTTP_409_CONFLICT)
+        response = Response(record.response_body, status=record.status_code)
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    @staticmethod
+    def store_response(record, response):
+        if response.status_code >= 400:
+            record.delete()
+            return response
+        record.status_code = response.status_code
+        record.response_body = response.data
+        record.save(update_fields=["status_code", "response_body"])
+        return response
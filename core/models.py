@@ -0,0 +1,181 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from phonenumber_field.modelfields import PhoneNumberField
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def get_idempotency_ttl():
+    return timedelta(seconds=getattr(settings, "IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+
+
+class IdempotencyKey(models.Model):
+    """
+    Outcome of a write sent with an ``Idempotency-Key`` header.
+
+    A retry with the same key and principal gets the stored response back
+    without the view running again (see IdempotentCreateMixin). Rows with
+    ``status_code`` unset belong to a request that is still running.
+    """
+
+    key = models.CharField(max_length=255, verbose_name="Key")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="idempotency_keys",
+                             verbose_name="User")
+    request_hash = models.CharField(max_length=64, verbose_name="Request Hash",
+                                    help_text="SHA-256 of method, path and body of the first request")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="Status Code")
+    response_body = models.JSONField(null=True, blank=True, encoder=JSONEncoder, verbose_name="Response Body")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+    expires_at = models.DateTimeField(verbose_name="Expires At")
+
+    class Meta:
+        verbose_name = "Idempotency Key"
+        verbose_name_plural = "Idempotency Keys"
+        constraints = [
+            # Also the index behind the lookup of a retry.
+            models.UniqueConstraint(fields=["user", "key"], name="unique_idempotency_key_per_user")
+        ]
+        indexes = [models.Index(fields=["expires_at"])]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
+
+    @property
+    def is_expired(self):
+        return self.expires_at <= timezone.now()
+
+    @property
+    def is_complete(self):
+        return self.status_code is not None
+
+    @classmethod
+    def purge_expired(cls, now=None):
+        """
+        Delete every expired key. Nothing cascades from this model and it has
+        no delete signals, so Django issues one DELETE on the expires_at index.
+        """
+        deleted, _ = cls.objects.filter(expires_at__lte=now or timezone.now()).delete()
+        return deleted
+
+
+class ReplicationHeartbeat(models.Model):
+    """
+    Single row the primary touches regularly (see the sync_replica command).
+    Its age on a replica is that replica's replication lag.
+    """
+
+    beat_at = models.DateTimeField(verbose_name="Beat At")
+
+    class Meta:
+        verbose_name = "Replication Heartbeat"
+        verbose_name_plural = "Replication Heartbeats"
+
+    def __str__(self):
+        return self.beat_at.isoformat()
+
+    @classmethod
+    def beat(cls, using="default"):
+        cls.objects.using(using).update_or_create(pk=1, defaults={"beat_at": timezone.now()})
+
+
+class SchoolShard(models.Model):
+    """
+    Directory entry of a school: the shard (database alias) holding it and
+    its data. Lives in SHARD_DIRECTORY_DATABASE, see core/sharding.py.
+    School ids are only unique within a shard.
+    """
+
+    alias = models.CharField(max_length=100, verbose_name="Shard")
+    school_id = models.BigIntegerField(verbose_name="School ID")
+    name = models.CharField(max_length=255, verbose_name="School Name")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+
+    class Meta:
+        ordering = ["alias", "school_id"]
+        verbose_name = "School Shard"
+        verbose_name_plural = "School Shards"
+        constraints = [
+            models.UniqueConstraint(fields=["alias", "school_id"], name="unique_school_per_shard")
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.alias}:{self.school_id})"
+
+
+class ShardUser(models.Model):
+    """
+    Directory entry of a user: the shard to log a phone number in on.
+    Also keeps phone numbers unique across shards.
+    """
+
+    phone_number = PhoneNumberField(unique=True, verbose_name="Phone Number")
+    alias = models.CharField(max_length=100, verbose_name="Shard")
+    user_id = models.BigIntegerField(verbose_name="User ID")
+
+    class Meta:
+        verbose_name = "Shard User"
+        verbose_name_plural = "Shard Users"
+        constraints = [
+            models.UniqueConstraint(fields=["alias", "user_id"], name="unique_user_per_shard")
+        ]
+
+    def __str__(self):
+        return f"{self.phone_number} ({self.alias}:{self.user_id})"
+
+
+class Job(models.Model):
+    """
+    A background job (see core/jobs.py): the name of its job type, the
+    keyword arguments to run it with and its state. It lives in the
+    database of the write that enqueued it.
+    """
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=100, verbose_name="Job Type")
+    payload = models.JSONField(default=dict, blank=True, verbose_name="Payload")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, verbose_name="Status")
+    priority = models.SmallIntegerField(default=0, verbose_name="Priority", help_text="Higher runs first")
+    run_at = models.DateTimeField(default=timezone.now, verbose_name="Run At", help_text="Not before this time")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="Attempts")
+    max_attempts = models.PositiveSmallIntegerField(default=5, verbose_name="Max Attempts")
+    key = models.CharField(max_length=255, null=True, blank=True, unique=True, verbose_name="Key",
+                           help_text="At most one job per key")
+    worker = models.CharField(max_length=255, blank=True, verbose_name="Worker")
+    claimed_at = models.DateTimeField(null=True, blank=True, verbose_name="Claimed At")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Finished At")
+    last_error = models.TextField(blank=True, verbose_name="Last Error")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Job"
+        verbose_name_plural = "Jobs"
+        indexes = [
+            # Claims: the ready jobs, highest priority first.
+            models.Index(fields=["status", "-priority", "run_at"], name="job_claim_idx"),
+            models.Index(fields=["status", "finished_at"], name="job_finished_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    @classmethod
+    def purge_finished(cls, now=None, using=None):
+        """Delete the jobs that finished more than JOB_RETENTION_SECONDS ago."""
+        retention = getattr(settings, "JOB_RETENTION_SECONDS", 7 * 24 * 60 * 60)
+        cutoff = (now or timezone.now()) - timedelta(seconds=retention)
+        deleted, _ = cls.objects.db_manager(using).filter(
+            status__in=[cls.SUCCEEDED, cls.FAILED], finished_at__lte=cutoff).delete()
+        return deleted
@@ -0,0 +1,34 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+LEGACY_API_VERSION = "1"
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Project wide pagination: keyset cursors with a bounded page size.
+
+    - Clients choose ``?page_size=`` up to ``max_page_size``.
+    - Views declare a stable ``cursor_ordering`` (``-id`` by default).
+    - Clients that negotiate API version 1
+      (``Accept: application/json; version=1``) keep receiving a bare list;
+      the next/previous page links are sent in the ``Link`` header.
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+    def get_ordering(self, request, queryset, view):
+        self.ordering = getattr(view, "cursor_ordering", self.ordering)
+        return super().get_ordering(request, queryset, view)
+
+    def get_paginated_response(self, data):
+        if getattr(self.request, "version", None) != LEGACY_API_VERSION:
+            return super().get_paginated_response(data)
+
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for rel, url in (("next", self.get_next_link()), ("prev", self.get_previous_link()))
+            if url
+        ]
+        return Response(data, headers={"Link": ", ".join(links)} if links else None)
@@ -0,0 +1,42 @@
+# Query parameters of views: a malformed value is a 400, never a 500.
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import ValidationError
+
+
+def parse_date_param(params, name):
+    """The date of ``?<name>=YYYY-MM-DD``, or None when it is not given."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        # Well formed but not a day, e.g. 2024-02-30.
+        parsed = None
+    if parsed is None:
+        raise ValidationError({name: "Enter a date in YYYY-MM-DD format."})
+    return parsed
+
+
+def parse_id_param(params, name):
+    """The integer id of ``?<name>=``, or None when it is not given."""
+    value = params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Must be an integer."})
+
+
+def parse_int_param(params, name, default, minimum, maximum=None):
+    """The integer ``?<name>=`` (``default`` when not given), within ``minimum``-``maximum``."""
+    value = params.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be an integer."})
+    if value < minimum or (maximum is not None and value > maximum):
+        raise ValidationError({name: f"Must be between {minimum} and {maximum}." if maximum is not None else
+                               f"Must be at least {minimum}."})
+    return value
@@ -0,0 +1,155 @@
+# Request profiles for production (see ProfilingMiddleware and the
+# aggregate_profiles command).
+#
+# A sampled request runs under either a stack sampler, a thread that reads
+# the request thread's frame every PROFILING_INTERVAL seconds and counts
+# folded stacks, or under cProfile. Its SQL is recorded with the query
+# recorder of core/querycount.py. Each profile is written as one gzipped
+# JSON file to PROFILING_DIR; only the newest PROFILING_MAX_FILES are kept.
+# Requests that are not sampled only pay for one random() call and a header
+# lookup.
+import base64
+import cProfile
+import gzip
+import hmac
+import json
+import marshal
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+SAMPLE = "sample"
+CPROFILE = "cprofile"
+
+
+def get_profile_dir():
+    return Path(getattr(settings, "PROFILING_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def should_profile(request):
+    """Profile a PROFILING_SAMPLE_RATE share of requests, and those with the PROFILING_HEADER token."""
+    token = getattr(settings, "PROFILING_TOKEN", None)
+    if token:
+        header = request.headers.get(getattr(settings, "PROFILING_HEADER", "X-Profile"))
+        if header and hmac.compare_digest(header, token):
+            return True
+    rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def view_label(view_func, method):
+    """``module.View.action`` for viewsets, ``module.View`` or ``module.function`` otherwise."""
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return f"{view_func.__module__}.{view_func.__name__}"
+    label = f"{view_class.__module__}.{view_class.__name__}"
+    action = (getattr(view_func, "actions", None) or {}).get(method.lower())
+    return f"{label}.{action}" if action else label
+
+
+def frame_label(code):
+    filename = code.co_filename
+    root = str(settings.BASE_DIR)
+    if filename.startswith(root):
+        filename = filename[len(root) + 1:]
+    elif "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{filename}:{code.co_name}"
+
+
+class StackSampler:
+    """Count the folded stacks of one thread, sampled from a background thread."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+class RequestProfiler:
+    def __init__(self, mode=None, interval=None):
+        self.mode = mode or getattr(settings, "PROFILING_MODE", SAMPLE)
+        self.interval = interval or getattr(settings, "PROFILING_INTERVAL", 0.005)
+        self.profile = None
+        self.sampler = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.mode == CPROFILE:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        else:
+            self.sampler = StackSampler(threading.get_ident(), self.interval)
+            self.sampler.start()
+
+    def stop(self):
+        if self.profile is not None:
+            self.profile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.duration = time.perf_counter() - self.started
+
+    def data(self):
+        if self.profile is not None:
+            self.profile.create_stats()
+            return {"pstats": base64.b64encode(marshal.dumps(self.profile.stats)).decode()}
+        return {"stacks": dict(self.sampler.stacks), "interval": self.interval}
+
+
+def write_profile(record, directory=None, max_files=None):
+    """Write one gzipped JSON profile and drop the oldest beyond ``max_files``; return its name."""
+    directory = Path(directory or get_profile_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    name = f"{timezone.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.json.gz"
+    with gzip.open(directory / f".{name}", "wt") as output:
+        json.dump(record, output)
+    os.replace(directory / f".{name}", directory / name)
+
+    max_files = max_files or getattr(settings, "PROFILING_MAX_FILES", 500)
+    profiles = sorted(directory.glob("*.json.gz"))
+    for old in profiles[:-max_files]:
+        old.unlink(missing_ok=True)
+    return name
+
+
+def read_profiles(directory=None):
+    for path in sorted(Path(directory or get_profile_dir()).glob("*.json.gz")):
+        with gzip.open(path, "rt") as profile:
+            yield path, json.load(profile)
+
+
+class StoredStats:
+    """Adapter that lets pstats.Stats load a profile's stored cProfile data."""
+
+    def __init__(self, encoded):
+        self.stats = marshal.loads(base64.b64decode(encoded))
+
+    def create_stats(self):
+        pass
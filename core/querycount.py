@@ -0,0 +1,108 @@
+# Per-request SQL instrumentation (see core/middleware.py and core/testing.py).
+#
+# A QueryRecorder is installed as an execute wrapper on the database
+# connections while a request or a test block runs. It counts statements,
+# sums their time and groups them by fingerprint: the SQL with parameter
+# placeholders and IN lists collapsed, so an N+1 loop shows up as one
+# fingerprint executed many times. The project frame that issued the first
+# repeat is kept as the call site to blame. Savepoint statements are not
+# counted, so a view costs the same inside a test case's transaction.
+import re
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_NUMBER = re.compile(r"\b\d+\b")
+# Label of the view handling the current request (set by MetricsMiddleware).
+current_view = ContextVar("current_view", default=None)
+
+# Frames of these files are never blamed for a query.
+INSTRUMENTATION_FILES = {str(Path(__file__).resolve())}
+_SAVEPOINT = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def fingerprint(sql):
+    """The statement with literal numbers and IN lists collapsed."""
+    return _NUMBER.sub("N", _IN_LIST.sub("IN (...)", sql))
+
+
+def project_stack(limit=1):
+    """``path:line in function`` of up to ``limit`` project frames, innermost first."""
+    root = str(Path(settings.BASE_DIR).resolve())
+    frames = []
+    frame = sys._getframe(1)
+    while frame is not None and len(frames) < limit:
+        filename = frame.f_code.co_filename
+        if filename.startswith(root) and filename not in INSTRUMENTATION_FILES and "site-packages" not in filename:
+            frames.append(f"{Path(filename).relative_to(root)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return frames
+
+
+def call_site():
+    """The innermost project frame outside the instrumentation."""
+    frames = project_stack()
+    return frames[0] if frames else "unknown"
+
+
+class QueryRecorder:
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.fingerprints = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.startswith(_SAVEPOINT):
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.time += time.perf_counter() - started
+            self.count += 1
+            key = fingerprint(sql)
+            entry = self.fingerprints.get(key)
+            if entry is None:
+                self.fingerprints[key] = {"count": 1, "site": None}
+            else:
+                entry["count"] += 1
+                if entry["site"] is None:
+                    entry["site"] = call_site()
+
+    @property
+    def time_ms(self):
+        return round(self.time * 1000, 2)
+
+    @property
+    def duplicates(self):
+        """Fingerprints executed more than once, most repeated first."""
+        repeated = [
+            {"sql": sql, "count": entry["count"], "site": entry["site"]}
+            for sql, entry in self.fingerprints.items()
+            if entry["count"] > 1
+        ]
+        return sorted(repeated, key=lambda duplicate: -duplicate["count"])
+
+    def summary(self):
+        return {"queries": self.count, "db_time_ms": self.time_ms, "duplicates": self.duplicates}
+
+
+@contextmanager
+def record_queries(using=None):
+    """Record the queries run on ``using`` (default every connection) inside the block."""
+    recorder = QueryRecorder()
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+
+def describe_duplicates(duplicates, limit=3):
+    return "; ".join(f"{duplicate['site']} x{duplicate['count']}" for duplicate in duplicates[:limit])
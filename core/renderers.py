@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+import msgpack
+import orjson
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_drf_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Fallback for values the fast encoders do not handle themselves.
+
+    Defers to DRF's JSONEncoder so lazy strings, timedeltas, querysets and
+    the like come out exactly as with the stock JSONRenderer.
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, PhoneNumber):
+        return str(obj)
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same documents through orjson.
+
+    orjson formats dates, times and UUIDs itself; OPT_UTC_Z gives UTC
+    datetimes the ``Z`` suffix DRF uses.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        ret = orjson.dumps(data, default=encode_default, option=options)
+
+        # Same as JSONRenderer: keep the output a strict javascript subset.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Binary MessagePack, negotiated with ``Accept: application/msgpack``.
+    Values are encoded like in the JSON renderers.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True, datetime=False)
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    """The text exposition format of core/metrics.py; the view hands it a ready string."""
+    media_type = 'text/plain'
+    format = 'txt'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, str):
+            return data.encode(self.charset)
+        # Errors (permission denied) come as dicts.
+        return "".join(f"# {key}: {value}\n" for key, value in data.items()).encode(self.charset)
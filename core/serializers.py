@@ -0,0 +1,46 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+def parse_field_list(value):
+    """Split a ``?fields=a,b`` style query parameter into a set of names."""
+    if value is None:
+        return None
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin for sparse fieldsets and on demand expansion.
+
+    - ``fields``: only these fields are rendered.
+    - ``expand``: relations listed in ``Meta.expandable_fields`` are rendered
+      with their nested serializer instead of a primary key.
+
+    ``Meta.expandable_fields`` maps a field name to ``(serializer_class, kwargs)``.
+    Both arguments are optional; without them the serializer behaves as before.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name in expand or ():
+            if name in expandable and (fields is None or name in fields):
+                serializer_class, options = expandable[name]
+                self.fields[name] = serializer_class(read_only=True, **options)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = [
+            "id", "name", "payload", "status", "priority", "run_at", "attempts", "max_attempts", "key",
+            "worker", "claimed_at", "finished_at", "last_error", "created_at",
+        ]
+        read_only_fields = fields
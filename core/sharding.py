@@ -0,0 +1,334 @@
+# School sharding.
+#
+# With SCHOOL_SHARDS set, every school lives with all of its data (its
+# manager, coaches, players and their users, teams, sessions, fees...) in
+# one of those database aliases. Each shard holds the full schema; the
+# directory database (SHARD_DIRECTORY_DATABASE) also holds SchoolShard and
+# ShardUser, which say where a school and a phone number live.
+#
+# SchoolShardRouter routes an ORM operation to, in this order: the
+# directory for the directory models, the database of the object it is
+# about (related lookups, assigning a related object), the shard of the
+# current principal (use_shard(), or the "shard" claim of the access token,
+# see core/authentication.py), and otherwise leaves it to the next router.
+# Primary keys are only unique within a shard: move_school() gives the rows
+# new ones, so the school's users have to log in again after a move.
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.db.models import F, Q
+
+from . import db_router
+
+logger = logging.getLogger("core.sharding")
+
+DIRECTORY_MODELS = {"core.schoolshard", "core.sharduser"}
+
+# What belongs to a school, parents first, as lookups from the model to the
+# school's primary key. move_school() copies them in this order.
+_USER_LOOKUPS = ("manager__school", "coach__school", "player__school")
+SCHOOL_DATA = (
+    ("account.User", _USER_LOOKUPS),
+    ("account.Profile", tuple(f"user__{lookup}" for lookup in _USER_LOOKUPS)),
+    ("manager.Manager", ("school",)),
+    ("school.School", ("pk",)),
+    ("school.Semester", ("school",)),
+    ("coach.Coach", ("school",)),
+    ("coach_salaries.CoachContract", ("coach__school",)),
+    ("coach_salaries.SalaryRecord", ("coach_contract__coach__school",)),
+    ("coach_salaries.SalaryPayment", ("salary_record__coach_contract__coach__school",)),
+    ("player.Player", ("school",)),
+    ("team.Team", ("school",)),
+    ("team.Team_players", ("team__school",)),
+    ("team.Team_event_days", ("team__school",)),
+    ("training_session.TrainingSession", ("team__school",)),
+    ("attendance.Attendance", ("training_session__team__school",)),
+    ("medical.MedicalRecord", ("player__school",)),
+    ("player_fees.PlayerInvoice", ("team__school",)),
+    ("player_fees.PlayerFeePayment", ("invoice__team__school",)),
+    ("expenses.Expense", ("school",)),
+    ("finance.SchoolMonthlyLedger", ("school",)),
+    ("finance.ReceivablesAgingSnapshot", ("school",)),
+    ("analytics.PlayerTeamStats", ("team__school",)),
+    ("core.IdempotencyKey", tuple(f"user__{lookup}" for lookup in _USER_LOOKUPS)),
+)
+# Shared lookup tables, matched between shards by a natural key.
+REFERENCE_DATA = {"team.eventday": "name"}
+# Related to school data but deliberately left behind by a move.
+NOT_MOVED = {
+    "admin.logentry",  # admin history of the source shard
+    "account.user_groups",  # roles are User.role, groups and permissions are unused
+    "account.user_user_permissions",
+}
+
+
+class ShardingError(Exception):
+    pass
+
+
+@dataclass
+class ShardContext:
+    alias: str = None
+
+
+current_shard = ContextVar("current_shard", default=None)
+
+
+def get_shards():
+    return list(getattr(settings, "SCHOOL_SHARDS", []))
+
+
+def is_enabled():
+    return bool(get_shards())
+
+
+def directory_alias():
+    return getattr(settings, "SHARD_DIRECTORY_DATABASE", DEFAULT_DB_ALIAS)
+
+
+def get_current_shard():
+    context = current_shard.get()
+    return context.alias if context is not None else None
+
+
+def activate(alias):
+    """Route the rest of the current request (see ShardMiddleware) to a shard."""
+    if alias is not None and alias not in get_shards():
+        raise ShardingError(f"{alias!r} is not in SCHOOL_SHARDS.")
+    context = current_shard.get()
+    if context is None:
+        current_shard.set(ShardContext(alias))
+    else:
+        context.alias = alias
+
+
+@contextmanager
+def use_shard(alias):
+    if alias is not None and alias not in get_shards():
+        raise ShardingError(f"{alias!r} is not in SCHOOL_SHARDS.")
+    token = current_shard.set(ShardContext(alias))
+    try:
+        yield alias
+    finally:
+        current_shard.reset(token)
+
+
+def shard_for_phone_number(phone_number):
+    from .models import ShardUser
+
+    return ShardUser.objects.filter(phone_number=str(phone_number)).values_list("alias", flat=True).first()
+
+
+def across_shards(queryset):
+    """
+    Evaluate ``queryset`` on every shard, one after the other, and yield
+    ``(alias, obj)`` pairs: the explicit way to list across shards.
+    """
+    for alias in get_shards() or [DEFAULT_DB_ALIAS]:
+        with use_shard(alias if is_enabled() else None):
+            for obj in queryset.using(alias):
+                yield alias, obj
+
+
+def make_cache_key(key, key_prefix, version):
+    """
+    KEY_FUNCTION of the caches: ids repeat between shards, so keys written
+    while a shard other than "default" is active are namespaced by it.
+    """
+    alias = get_current_shard()
+    if alias is not None and alias != DEFAULT_DB_ALIAS:
+        return f"{key_prefix}:{version}:{alias}:{key}"
+    return f"{key_prefix}:{version}:{key}"
+
+
+def shard_of(alias):
+    return DEFAULT_DB_ALIAS if alias in db_router.get_replicas() else alias
+
+
+class SchoolShardRouter:
+    def _route(self, model, hints):
+        if not is_enabled():
+            return None
+        if model._meta.label_lower in DIRECTORY_MODELS:
+            return directory_alias()
+        instance = hints.get("instance")
+        alias = shard_of(instance._state.db) if instance is not None else None
+        if alias is None:
+            alias = get_current_shard()
+        # The default shard is left to the next router (read replicas).
+        return alias if alias != DEFAULT_DB_ALIAS else None
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if not is_enabled():
+            return None
+        return shard_of(obj1._state.db) == shard_of(obj2._state.db)
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if model_name and f"{app_label}.{model_name}" in DIRECTORY_MODELS:
+            return db == directory_alias()
+        return None
+
+
+def school_querysets(school_id, using):
+    """(model, queryset of the school's rows on ``using``) for SCHOOL_DATA, parents first."""
+    for label, lookups in SCHOOL_DATA:
+        model = apps.get_model(label)
+        condition = Q()
+        for lookup in lookups:
+            condition |= Q(**{lookup: school_id})
+        queryset = model._base_manager.using(using).filter(condition)
+        if len(lookups) > 1:
+            queryset = queryset.distinct()
+        yield model, queryset.order_by("pk")
+
+
+def unplanned_models():
+    """Models referencing school data that a move would not know about."""
+    planned = {label.lower() for label, _ in SCHOOL_DATA}
+    known = planned | set(REFERENCE_DATA) | NOT_MOVED | DIRECTORY_MODELS
+    return sorted(
+        model._meta.label
+        for model in apps.get_models(include_auto_created=True)
+        if model._meta.label_lower not in known
+        and any(field.is_relation and field.related_model._meta.label_lower in planned
+                for field in model._meta.concrete_fields)
+    )
+
+
+@contextmanager
+def preserved_timestamps(model):
+    """Let bulk_create keep the auto_now/auto_now_add values of copied rows."""
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _reference_ids(model, ids, source, target):
+    """Map ids of a reference table on ``source`` to the same rows on ``target``, created if missing."""
+    key = REFERENCE_DATA[model._meta.label_lower]
+    mapping = {}
+    for obj in model._base_manager.using(source).filter(pk__in=ids):
+        fields = {field.attname: getattr(obj, field.attname) for field in model._meta.concrete_fields
+                  if not field.primary_key}
+        match, _ = model._base_manager.using(target).get_or_create(**{key: fields.pop(key)}, defaults=fields)
+        mapping[obj.pk] = match.pk
+    return mapping
+
+
+def _copy(model, rows, maps, source, target, batch_size):
+    """Insert ``rows`` on ``target`` with new primary keys and remapped foreign keys."""
+    label = model._meta.label_lower
+    relations = [field for field in model._meta.concrete_fields if field.is_relation]
+    for field in relations:
+        related = field.related_model._meta.label_lower
+        if related in REFERENCE_DATA and related not in maps:
+            ids = {getattr(row, field.attname) for row in rows} - {None}
+            maps[related] = _reference_ids(field.related_model, ids, source, target)
+
+    old_ids = []
+    for row in rows:
+        for field in relations:
+            value = getattr(row, field.attname)
+            if value is None:
+                continue
+            mapping = maps.get(field.related_model._meta.label_lower)
+            if mapping is None:
+                raise ShardingError(f"{model._meta.label}.{field.name} points outside the school data.")
+            if value in mapping:
+                setattr(row, field.attname, mapping[value])
+            elif field.null:
+                # A row of another school (e.g. the user who recorded a payment).
+                setattr(row, field.attname, None)
+            else:
+                raise ShardingError(
+                    f"{model._meta.label} {row.pk}: {field.name} {value} is not part of the school.")
+        old_ids.append(row.pk)
+        row.pk = None
+        row._state.adding, row._state.db = True, None
+
+    with preserved_timestamps(model):
+        created = model._base_manager.using(target).bulk_create(rows, batch_size=batch_size)
+    maps[label] = {old: obj.pk for old, obj in zip(old_ids, created)}
+
+
+def move_school(source, school_id, target, batch_size=500, dry_run=False):
+    """
+    Move a school and all of its data from the ``source`` shard to ``target``.
+
+    The school is locked on its shard for the whole move: the rows are
+    copied to ``target`` with new primary keys, the directory is switched
+    and they are deleted from the source, all before either shard commits. Returns the new id of the
+    school (None for a dry run) and the number of rows per model.
+    """
+    from .cache import bump_data_version
+    from .models import SchoolShard, ShardUser
+
+    for alias in (source, target):
+        if alias not in get_shards():
+            raise ShardingError(f"{alias!r} is not in SCHOOL_SHARDS.")
+    if source == target:
+        raise ShardingError("The source and target shards are the same.")
+    missing = unplanned_models()
+    if missing:
+        raise ShardingError(f"Not known to move_school (add to SCHOOL_DATA or NOT_MOVED): {', '.join(missing)}")
+
+    School = apps.get_model("school.School")
+    counts, maps = {}, {}
+    with transaction.atomic(using=source):
+        # A no-op write: holds the write lock of the school's row (of the whole file on SQLite) until the end.
+        if not School._base_manager.using(source).filter(pk=school_id).update(name=F("name")):
+            raise ShardingError(f"School {school_id} is not on {source!r}.")
+        name = School._base_manager.using(source).values_list("name", flat=True).get(pk=school_id)
+        data = [(model, list(queryset)) for model, queryset in school_querysets(school_id, source)]
+        counts = {model._meta.label: len(rows) for model, rows in data}
+        if dry_run:
+            transaction.set_rollback(True, using=source)
+            return None, counts
+
+        deletions = [(model, [row.pk for row in rows]) for model, rows in data]
+        phone_numbers = {row.pk: str(row.phone_number) for model, rows in data
+                         if model._meta.label_lower == "account.user" for row in rows}
+        # The target commits first: a failure before then leaves both shards as they were.
+        try:
+            with transaction.atomic(using=target):
+                for model, rows in data:
+                    _copy(model, rows, maps, source, target, batch_size)
+
+                new_school_id = maps["school.school"][school_id]
+                with transaction.atomic(using=directory_alias()):
+                    SchoolShard.objects.filter(alias=source, school_id=school_id).delete()
+                    SchoolShard.objects.create(alias=target, school_id=new_school_id, name=name)
+                    for old_id, new_id in maps["account.user"].items():
+                        ShardUser.objects.update_or_create(
+                            phone_number=phone_numbers[old_id], defaults={"alias": target, "user_id": new_id})
+
+                for model, ids in reversed(deletions):
+                    for start in range(0, len(ids), batch_size):
+                        batch = ids[start:start + batch_size]
+                        model._base_manager.using(source).filter(pk__in=batch)._raw_delete(source)
+        except IntegrityError as exc:
+            raise ShardingError(f"School {school_id} conflicts with data on {target!r}: {exc}") from exc
+
+    for alias, scope in ((source, school_id), (target, new_school_id)):
+        with use_shard(alias):
+            bump_data_version(scope)
+    logger.info("Moved school %s from %s to %s as school %s", school_id, source, target, new_school_id)
+    return new_school_id, counts
@@ -0,0 +1,96 @@
+from functools import partial
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+
+from . import sharding
+from .cache import bump_data_version
+from .models import SchoolShard, ShardUser
+
+# Models whose changes invalidate cached school and player responses: those
+# with a school, and the ones the cached payloads nest (a school's manager,
+# users and profiles of ?expand=user).
+VERSIONED_MODELS = (
+    "school.School", "player.Player", "team.Team", "coach.Coach", "manager.Manager",
+    settings.AUTH_USER_MODEL, "account.Profile",
+)
+
+
+def _user_school_ids(user_id):
+    ids = set(apps.get_model("school.School").objects.filter(manager__user_id=user_id).values_list("pk", flat=True))
+    for label in ("coach.Coach", "player.Player"):
+        ids.update(apps.get_model(label).objects.filter(user_id=user_id).values_list("school_id", flat=True))
+    return ids
+
+
+def _school_ids(instance):
+    label = instance._meta.label
+    if label == "school.School":
+        return {instance.pk}
+    if label == "manager.Manager":
+        return set(apps.get_model("school.School").objects.filter(manager=instance).values_list("pk", flat=True))
+    if label == settings.AUTH_USER_MODEL:
+        return _user_school_ids(instance.pk)
+    if label == "account.Profile":
+        return _user_school_ids(instance.user_id)
+    return {instance.school_id}
+
+
+def bump_school_version(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+    # After the commit: a reader caching before it would store the old data under the new version.
+    # A delete resolves the schools before the cascade removes the rows leading to them.
+    # Logins only touch last_login, which no cached payload shows.
+    if not raw and update_fields != frozenset({"last_login"}):
+        for school_id in _school_ids(instance):
+            transaction.on_commit(partial(bump_data_version, school_id), using=using)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_school_version, sender=model, dispatch_uid=f"bump-version-save-{model}")
+    pre_delete.connect(bump_school_version, sender=model, dispatch_uid=f"bump-version-delete-{model}")
+
+
+# Shard directory (core/sharding.py): where each school and phone number lives.
+# The request's transaction only covers its shard (ShardTransactionMiddleware):
+# directory writes take a transaction of the directory database explicitly,
+# nested in the request's when the directory is the request's shard.
+# Unchanged entries are not written: the directory's lock is not taken for them.
+def register_school(sender, instance, raw=False, using=None, **kwargs):
+    if sharding.is_enabled() and not raw:
+        entry = SchoolShard.objects.filter(alias=sharding.shard_of(using), school_id=instance.pk)
+        if entry.values_list("name", flat=True).first() == instance.name:
+            return
+        with transaction.atomic(using=sharding.directory_alias()):
+            SchoolShard.objects.update_or_create(
+                alias=sharding.shard_of(using), school_id=instance.pk, defaults={"name": instance.name})
+
+
+def unregister_school(sender, instance, using=None, **kwargs):
+    if sharding.is_enabled():
+        with transaction.atomic(using=sharding.directory_alias()):
+            SchoolShard.objects.filter(alias=sharding.shard_of(using), school_id=instance.pk).delete()
+
+
+def register_user(sender, instance, raw=False, using=None, **kwargs):
+    if sharding.is_enabled() and not raw:
+        entry = ShardUser.objects.filter(alias=sharding.shard_of(using), user_id=instance.pk)
+        if entry.values_list("phone_number", flat=True).first() == instance.phone_number:
+            return
+        with transaction.atomic(using=sharding.directory_alias()):
+            ShardUser.objects.update_or_create(
+                alias=sharding.shard_of(using), user_id=instance.pk,
+                defaults={"phone_number": instance.phone_number})
+
+
+def unregister_user(sender, instance, using=None, **kwargs):
+    if sharding.is_enabled():
+        with transaction.atomic(using=sharding.directory_alias()):
+            ShardUser.objects.filter(alias=sharding.shard_of(using), user_id=instance.pk).delete()
+
+
+post_save.connect(register_school, sender="school.School", dispatch_uid="shard-directory-school-save")
+post_delete.connect(unregister_school, sender="school.School", dispatch_uid="shard-directory-school-delete")
+post_save.connect(register_user, sender=settings.AUTH_USER_MODEL, dispatch_uid="shard-directory-user-save")
+post_delete.connect(unregister_user, sender=settings.AUTH_USER_MODEL, dispatch_uid="shard-directory-user-delete")
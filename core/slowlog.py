@@ -0,0 +1,107 @@
+# Slow-query log (see the slow_queries command).
+#
+# SlowQueryLogger wraps the execute path of every database connection (it
+# is attached on connection_created, see core/apps.py). A statement slower
+# than SLOW_QUERY_THRESHOLD_MS is logged as one JSON record on the
+# "core.slow_queries" logger with its fingerprint, parameters, the view
+# of the request and the project frames that issued it, innermost first. The query plan of a slow
+# SELECT is captured with the backend's EXPLAIN, once per fingerprint and
+# process every SLOW_QUERY_EXPLAIN_INTERVAL seconds, on a backend cursor
+# below the execute wrappers: the EXPLAIN is neither logged nor counted in
+# the request's queries (core/querycount.py).
+import json
+import logging
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+from .querycount import INSTRUMENTATION_FILES, current_view, fingerprint, project_stack
+
+logger = logging.getLogger("core.slow_queries")
+
+INSTRUMENTATION_FILES.add(str(Path(__file__).resolve()))
+MAX_PARAM_LENGTH = 200
+
+
+def _param(value):
+    text = repr(value)
+    return text if len(text) <= MAX_PARAM_LENGTH else text[:MAX_PARAM_LENGTH] + "..."
+
+
+def _params(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {name: _param(value) for name, value in params.items()}
+    return [_param(value) for value in params]
+
+
+class SlowQueryLogger:
+    def __init__(self):
+        self.explained = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        threshold = getattr(settings, "SLOW_QUERY_THRESHOLD_MS", None)
+        if threshold is None:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = execute(sql, params, many, context)
+            failed = False
+            return result
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            if elapsed >= threshold:
+                self.log(sql, params, many, elapsed, context["connection"], failed)
+
+    def log(self, sql, params, many, elapsed, connection, failed=False):
+        key = fingerprint(sql)
+        record = {
+            "at": timezone.now().isoformat(),
+            "database": connection.alias,
+            "view": current_view.get(),
+            "duration_ms": round(elapsed, 2),
+            "fingerprint": key,
+            "sql": sql,
+            "params": _params(params) if not many else None,
+            "stack": project_stack(limit=getattr(settings, "SLOW_QUERY_STACK_DEPTH", 6)) or ["unknown"],
+            "failed": failed,
+        }
+        # A failed statement may have broken the transaction: no EXPLAIN in it.
+        if not failed and not many and sql.lstrip()[:6].upper() == "SELECT" and self.should_explain(key):
+            record["plan"] = self.explain(connection, sql, params)
+        logger.warning(json.dumps(record))
+
+    def should_explain(self, key):
+        if not getattr(settings, "SLOW_QUERY_EXPLAIN", True):
+            return False
+        now = time.monotonic()
+        if now - self.explained.get(key, -float("inf")) < getattr(settings, "SLOW_QUERY_EXPLAIN_INTERVAL", 600):
+            return False
+        if len(self.explained) > 1000:
+            self.explained.clear()
+        self.explained[key] = now
+        return True
+
+    def explain(self, connection, sql, params):
+        # create_cursor() is the backend's own cursor (with its parameter style),
+        # not the CursorWrapper that runs connection.execute_wrappers.
+        cursor = connection.create_cursor()
+        try:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return [" | ".join(str(column) for column in row) for row in cursor.fetchall()]
+        except Exception as exc:
+            return [f"EXPLAIN failed: {type(exc).__name__}: {exc}"]
+        finally:
+            cursor.close()
+
+
+slow_query_logger = SlowQueryLogger()
+
+
+def attach(sender, connection, **kwargs):
+    if slow_query_logger not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_logger)
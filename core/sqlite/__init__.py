@@ -0,0 +1,80 @@
+# SQLite production profile.
+#
+# The "core.sqlite" database engine is Django's SQLite backend with:
+# - SQLITE_PRAGMAS set on every new connection. WAL journaling lets readers
+#   run next to the writer, synchronous=NORMAL syncs at checkpoints rather
+#   than at every commit, and busy_timeout makes a writer wait for the lock
+#   instead of failing with "database is locked" (it comes first so the
+#   other pragmas wait as well).
+# - With the "transaction_mode": "IMMEDIATE" option, transactions take the
+#   write lock when they begin, so one that read first can no longer fail
+#   to write on a snapshot another writer made stale. Within a process they
+#   queue on a lock per database file, which hands over at once, instead of
+#   in SQLite's busy handler, which polls with sleeps of up to 100 ms.
+# Requests that only read (safe methods, SQLITE_DEFERRED_VIEWS) keep their
+# ATOMIC_REQUESTS transaction deferred, see SQLiteReadTransactionMiddleware:
+# they neither queue behind writers nor hold the lock.
+#
+# The loadtest command takes --sqlite-profile baseline to measure the
+# settings this profile replaced.
+from django.conf import settings
+from django.db import connections
+
+# The settings before this profile: rollback journal, deferred transactions
+# and the driver's 5 s busy timeout.
+BASELINE_PRAGMAS = {"busy_timeout": 5000, "journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+def get_pragmas():
+    return getattr(settings, "SQLITE_PRAGMAS", {})
+
+
+def defer_transactions():
+    """
+    Let the next transactions of this thread's SQLite connections begin
+    deferred, when their transaction_mode asks otherwise. Returns what
+    restore_transaction_modes() needs to undo it.
+    """
+    deferred = []
+    for connection in connections.all():
+        if (connection.vendor == "sqlite" and connection.settings_dict["ATOMIC_REQUESTS"]
+                and connection.settings_dict["OPTIONS"].get("transaction_mode")):
+            # Connecting sets transaction_mode from the settings: connect first.
+            connection.ensure_connection()
+            deferred.append((connection, connection.transaction_mode))
+            connection.transaction_mode = None
+    return deferred
+
+
+def restore_transaction_modes(deferred):
+    for connection, mode in deferred:
+        connection.transaction_mode = mode
+
+
+def use_baseline():
+    """Switch this process back to the settings the profile replaced (for benchmarks)."""
+    settings.SQLITE_PRAGMAS = BASELINE_PRAGMAS
+    for alias in connections:
+        if connections[alias].vendor == "sqlite":
+            connections.settings[alias].get("OPTIONS", {}).pop("transaction_mode", None)
+            connections.settings[alias]["CONN_MAX_AGE"] = 0
+            connections[alias].close()
+            # Switch the journal mode now, while nothing else holds the file.
+            connections[alias].ensure_connection()
+
+
+def describe(alias="default"):
+    """The journal mode, synchronous level and transaction mode a connection runs with."""
+    connection = connections[alias]
+    if connection.vendor != "sqlite":
+        return {"vendor": connection.vendor}
+    connection.ensure_connection()
+    raw = connection.connection
+    return {
+        "vendor": "sqlite",
+        "journal_mode": raw.execute("PRAGMA journal_mode").fetchone()[0],
+        "synchronous": raw.execute("PRAGMA synchronous").fetchone()[0],
+        "busy_timeout_ms": raw.execute("PRAGMA busy_timeout").fetchone()[0],
+        "transaction_mode": connection.transaction_mode or "DEFERRED",
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE"),
+    }
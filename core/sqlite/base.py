@@ -0,0 +1,75 @@
+import logging
+import sqlite3
+import threading
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+from . import get_pragmas
+
+logger = logging.getLogger("core.sqlite")
+
+_write_locks = {}
+_write_locks_guard = threading.Lock()
+
+
+def get_write_lock(name):
+    """The lock queueing this process's write transactions on a database file."""
+    with _write_locks_guard:
+        return _write_locks.setdefault(str(name), threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    _write_lock = None
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in get_pragmas().items():
+            if name != "journal_mode":
+                conn.execute(f"PRAGMA {name} = {value}")
+                continue
+            # The journal mode is stored in the file and switching it needs the file
+            # to itself: while other processes use it, keep the mode it has.
+            if conn.execute("PRAGMA journal_mode").fetchone()[0] == str(value).lower():
+                continue
+            try:
+                conn.execute(f"PRAGMA journal_mode = {value}")
+            except sqlite3.OperationalError as exc:
+                logger.warning("Could not switch %s to journal_mode %s: %s", self.alias, value, exc)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self.transaction_mode == "IMMEDIATE" and not self.is_in_memory_db():
+            lock = get_write_lock(self.settings_dict["NAME"])
+            timeout = get_pragmas().get("busy_timeout", 5000) / 1000
+            if not lock.acquire(timeout=timeout):
+                raise OperationalError("database is locked")
+            self._write_lock = lock
+        try:
+            super()._start_transaction_under_autocommit()
+        except Exception:
+            self._release_write_lock()
+            raise
+
+    def _release_write_lock(self):
+        lock, self._write_lock = self._write_lock, None
+        if lock is not None:
+            lock.release()
+
+    def _commit(self):
+        try:
+            return super()._commit()
+        finally:
+            self._release_write_lock()
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self._release_write_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self._release_write_lock()
@@ -0,0 +1,48 @@
+from contextlib import contextmanager
+from io import StringIO
+
+from django.core.management import call_command
+from django.test.utils import override_settings
+
+from .querycount import describe_duplicates, record_queries
+
+
+SMALL_DATASET = {"schools": 1, "coaches": 1, "teams": 1, "players": 3, "sessions": 3, "invoices": 1}
+
+
+def generate_dataset(**counts):
+    """A small generate_dataset dataset, for setUpTestData."""
+    call_command("generate_dataset", stdout=StringIO(), **{**SMALL_DATASET, **counts})
+
+
+@contextmanager
+def assert_max_queries(budget, using=None):
+    """
+    Fail when the block runs more than ``budget`` queries; the message names
+    the call sites of repeated statements.
+    """
+    with record_queries(using) as recorder:
+        yield recorder
+    if recorder.count > budget:
+        raise AssertionError(
+            f"{recorder.count} queries executed, budget is {budget}. "
+            f"Repeated: {describe_duplicates(recorder.duplicates, limit=10) or 'none'}"
+        )
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin: every request made through the test client fails with
+    QueryBudgetExceeded when its view runs more queries than the
+    ``query_budget`` it declares.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        budgets = override_settings(QUERY_INSTRUMENTATION=True, QUERY_BUDGET_STRICT=True)
+        budgets.enable()
+        cls.addClassCleanup(budgets.disable)
+
+    def assertMaxQueries(self, budget, using=None):
+        return assert_max_queries(budget, using)
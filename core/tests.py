@@ -0,0 +1,431 @@
+import json
+import marshal
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+
+from django.apps import apps
+from django.db import DEFAULT_DB_ALIAS
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from account.models import User
+from attendance.models import Attendance
+from coach.models import Coach
+from core import cache, db_router, jobs, metrics, sharding
+from core.authentication import ShardTokenObtainPairSerializer
+from core.models import Job, ReplicationHeartbeat, SchoolShard, ShardUser
+from core.parsers import FastJSONParser, MessagePackParser
+from core.querycount import record_queries
+from core.renderers import FastJSONRenderer, MessagePackRenderer
+from core.slowlog import slow_query_logger
+from core.testing import QueryBudgetMixin, generate_dataset
+from player.models import Player
+from player_fees.models import PlayerInvoice
+from school.models import School
+from team.models import Team
+from training_session.models import TrainingSession
+
+# Values the test job types were run with.
+runs = []
+
+
+@jobs.job("core.tests.record")
+def record_job(value):
+    runs.append(value)
+
+
+@jobs.job("core.tests.fail", max_attempts=2, retry_delay=10)
+def failing_job():
+    raise RuntimeError("Boom")
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Every view declaring a query_budget, requested the way the apps do (JWT
+    and all) over a dataset with several rows per list, so an N+1 breaks it.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(coaches=3, teams=2, players=4, sessions=3, invoices=2)
+        cls.manager_user = School.objects.select_related("manager__user").get().manager.user
+        cls.coach_user = Coach.objects.select_related("user").order_by("id").first().user
+        cls.team = Team.objects.order_by("id").first()
+        cls.session = TrainingSession.objects.filter(team=cls.team).order_by("id").first()
+
+    def get(self, user, path):
+        client = APIClient()
+        token = ShardTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = client.get(path)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def test_manager_views(self):
+        paths = [
+            "/api/coaches/",
+            "/api/coaches/?expand=user,manager,school",
+            "/api/players/",
+            "/api/invoices/",
+            "/api/fee-payments/",
+            "/api/attendance/",
+            f"/api/attendance/roster/?training_session={self.session.pk}",
+            "/api/medical-records/",
+            f"/api/medical-records/availability/?team={self.team.pk}",
+            "/api/analytics/players/",
+            f"/api/analytics/leaderboard/?team={self.team.pk}",
+            "/api/analytics/heatmap/",
+        ]
+        for path in paths:
+            with self.subTest(path=path):
+                self.get(self.manager_user, path)
+
+    def test_coach_views(self):
+        for path in ("/api/coaches/home/", "/api/sync/"):
+            with self.subTest(path=path):
+                self.get(self.coach_user, path)
+
+
+class SlowQueryLogTests(TestCase):
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_EXPLAIN=True)
+    def test_explain_is_not_counted(self):
+        slow_query_logger.explained.clear()
+        with self.assertLogs("core.slow_queries", "WARNING") as logs, record_queries() as recorder:
+            list(School.objects.filter(pk=1))
+
+        self.assertEqual(recorder.count, 1)
+        self.assertEqual(len(logs.records), 1)
+        record = json.loads(logs.records[0].getMessage())
+        self.assertTrue(record["plan"])
+        self.assertFalse(record["plan"][0].startswith("EXPLAIN failed"), record["plan"])
+
+
+class JobTests(TestCase):
+    def setUp(self):
+        runs.clear()
+
+    def run_next(self):
+        job = jobs.claim(DEFAULT_DB_ALIAS, "worker")
+        if job is not None:
+            jobs.execute(job, "worker")
+            job.refresh_from_db()
+        return job
+
+    def test_claim_order(self):
+        record_job.enqueue(value="low", priority=-1)
+        record_job.enqueue(value="later", delay=60)
+        high = record_job.enqueue(value="high", priority=5)
+
+        claimed = jobs.claim(DEFAULT_DB_ALIAS, "worker")
+        self.assertEqual((claimed.pk, claimed.status, claimed.worker, claimed.attempts),
+                         (high.pk, Job.RUNNING, "worker", 1))
+        # Running jobs are not claimed twice.
+        self.assertEqual(self.run_next().payload, {"value": "low"})
+        self.assertIsNone(jobs.claim(DEFAULT_DB_ALIAS, "worker"))
+
+        self.assertTrue(jobs.execute(claimed, "worker"))
+        self.assertEqual(runs, ["low", "high"])
+        self.assertEqual(Job.objects.get(pk=high.pk).status, Job.SUCCEEDED)
+
+    def test_payload_is_checked(self):
+        with self.assertRaises(TypeError):
+            record_job.enqueue(other=1)
+        self.assertFalse(Job.objects.exists())
+
+    def test_retry_with_backoff(self):
+        failing_job.enqueue()
+        with self.assertLogs("core.jobs", "WARNING"):
+            job = self.run_next()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn("RuntimeError: Boom", job.last_error)
+        # 10 seconds, give or take the jitter: not ready yet.
+        delay = (job.run_at - timezone.now()).total_seconds()
+        self.assertTrue(7 < delay <= 12, delay)
+        self.assertIsNone(jobs.claim(DEFAULT_DB_ALIAS, "worker"))
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs("core.jobs", "WARNING"):
+            job = self.run_next()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+        self.assertIsNotNone(job.finished_at)
+
+    @override_settings(JOB_MAX_RETRY_DELAY=30)
+    def test_backoff_doubles_up_to_the_cap(self):
+        with mock.patch.object(jobs.random, "uniform", return_value=1.0):
+            self.assertEqual([failing_job.backoff(attempts) for attempts in (1, 2, 3)], [10, 20, 30])
+
+    @override_settings(JOB_LEASE_SECONDS=60)
+    def test_expired_leases_are_queued_again(self):
+        record_job.enqueue(value="lost")
+        last_try = failing_job.enqueue()
+        Job.objects.filter(pk=last_try.pk).update(attempts=1, max_attempts=1)
+        jobs.claim(DEFAULT_DB_ALIAS, "dead")
+        jobs.claim(DEFAULT_DB_ALIAS, "dead")
+        self.assertEqual(jobs.requeue_expired(DEFAULT_DB_ALIAS), (0, 0))
+
+        Job.objects.update(claimed_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(jobs.requeue_expired(DEFAULT_DB_ALIAS), (1, 1))
+        self.assertEqual(Job.objects.get(pk=last_try.pk).status, Job.FAILED)
+        job = Job.objects.get(name="core.tests.record")
+        self.assertEqual((job.status, job.worker), (Job.QUEUED, ""))
+
+        # The dead worker finishing late does not count: its run is rolled back and the job runs again.
+        with self.assertLogs("core.jobs", "WARNING"):
+            self.assertFalse(jobs.execute(job, "dead"))
+        self.assertEqual(Job.objects.get(pk=job.pk).status, Job.QUEUED)
+        self.assertEqual(self.run_next().status, Job.SUCCEEDED)
+        self.assertEqual(runs, ["lost", "lost"])
+
+    @override_settings(JOB_SCHEDULE={"core.purge_jobs": 3600})
+    def test_scheduled_jobs_are_enqueued_once_per_period(self):
+        now = timezone.now().replace(minute=30)
+        for _ in range(2):
+            jobs.enqueue_scheduled(DEFAULT_DB_ALIAS, now=now)
+        jobs.enqueue_scheduled(DEFAULT_DB_ALIAS, now=now + timedelta(minutes=20))
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(Job.objects.get().run_at, now.replace(minute=0, second=0, microsecond=0))
+
+        jobs.enqueue_scheduled(DEFAULT_DB_ALIAS, now=now + timedelta(hours=1))
+        self.assertEqual(Job.objects.count(), 2)
+
+
+@override_settings(SCHOOL_SHARDS=[DEFAULT_DB_ALIAS, "shard_test"])
+class ShardingTests(TestCase):
+    databases = {DEFAULT_DB_ALIAS, "shard_test"}
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(schools=2, invoices=1)
+        cls.school, cls.other_school = School.objects.order_by("id")
+
+    def rosters(self, using, school_id):
+        """The school's rosters, attendance and invoices by name: what a move must keep."""
+        teams = Team.objects.using(using).filter(school_id=school_id)
+        return {
+            team.name: (
+                sorted(team.players.values_list("user__username", flat=True)),
+                sorted(Attendance.objects.using(using).filter(training_session__team=team)
+                       .values_list("training_session__title", "player__user__username", "status")),
+                sorted(PlayerInvoice.objects.using(using).filter(team=team)
+                       .values_list("player__user__username", "amount", "payments__amount")),
+            )
+            for team in teams
+        }
+
+    def test_routing(self):
+        with sharding.use_shard("shard_test"):
+            self.assertEqual(School.objects.all().db, "shard_test")
+            self.assertEqual(SchoolShard.objects.all().db, DEFAULT_DB_ALIAS)
+            # A related lookup goes to the database of the object.
+            team = Team.objects.using(DEFAULT_DB_ALIAS).first()
+            self.assertEqual(team.school._state.db, DEFAULT_DB_ALIAS)
+        self.assertEqual(School.objects.all().db, DEFAULT_DB_ALIAS)
+
+        with self.assertRaises(sharding.ShardingError):
+            sharding.activate("elsewhere")
+        router = sharding.SchoolShardRouter()
+        elsewhere = School(name="Elsewhere")
+        elsewhere._state.db = "shard_test"
+        self.assertFalse(router.allow_relation(self.school, elsewhere))
+
+    def test_move_school(self):
+        before = self.rosters(DEFAULT_DB_ALIAS, self.school.pk)
+        users = set(User.objects.filter(player__school=self.school).values_list("phone_number", flat=True))
+        untouched = self.rosters(DEFAULT_DB_ALIAS, self.other_school.pk)
+
+        new_id, counts = sharding.move_school(DEFAULT_DB_ALIAS, self.school.pk, "shard_test")
+
+        self.assertEqual(counts["school.School"], 1)
+        self.assertEqual(self.rosters("shard_test", new_id), before)
+        self.assertFalse(School.objects.using(DEFAULT_DB_ALIAS).filter(pk=self.school.pk).exists())
+        self.assertFalse(User.objects.using(DEFAULT_DB_ALIAS).filter(phone_number__in=users).exists())
+        self.assertEqual(self.rosters(DEFAULT_DB_ALIAS, self.other_school.pk), untouched)
+        for label, count in counts.items():
+            with self.subTest(model=label):
+                model = apps.get_model(label)
+                self.assertEqual(model._base_manager.using("shard_test").count(), count)
+
+        # Foreign keys point at the copies.
+        player = Player.objects.using("shard_test").select_related("user").first()
+        self.assertEqual(player.school_id, new_id)
+        self.assertEqual(player.user.profile.user_id, player.user_id)
+        self.assertEqual(SchoolShard.objects.get(alias="shard_test").school_id, new_id)
+        self.assertEqual(ShardUser.objects.get(phone_number=str(player.user.phone_number)).user_id, player.user_id)
+
+        with self.assertRaises(sharding.ShardingError):
+            sharding.move_school(DEFAULT_DB_ALIAS, self.school.pk, "shard_test")
+
+    def test_failed_move_changes_nothing(self):
+        before = self.rosters(DEFAULT_DB_ALIAS, self.school.pk)
+        # The school's last user already exists on the target.
+        last_user = User.objects.filter(player__school=self.school).order_by("id").last()
+        User.objects.using("shard_test").bulk_create([
+            User(username=last_user.username, phone_number="+989350000000", email="taken@example.com"),
+        ])
+
+        with self.assertRaisesMessage(sharding.ShardingError, "conflicts with data"):
+            # One row per insert: the users before the clash were copied and must go away.
+            sharding.move_school(DEFAULT_DB_ALIAS, self.school.pk, "shard_test", batch_size=1)
+
+        self.assertEqual(self.rosters(DEFAULT_DB_ALIAS, self.school.pk), before)
+        self.assertEqual(list(User.objects.using("shard_test").values_list("username", flat=True)),
+                         [last_user.username])
+        self.assertFalse(School.objects.using("shard_test").exists())
+        self.assertFalse(SchoolShard.objects.filter(alias="shard_test").exists())
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.user = School.objects.select_related("manager__user").get().manager.user
+
+    def setUp(self):
+        cache.get_cache().clear()
+        db_router.health.reset()
+        self.addCleanup(db_router.health.reset)
+        self.router = db_router.ReplicaRouter()
+
+    def read_alias(self, routing, healthy=True):
+        token = db_router.current_routing.set(routing)
+        try:
+            with mock.patch.object(db_router.health, "check", return_value=healthy):
+                return self.router.db_for_read(School)
+        finally:
+            db_router.current_routing.reset(token)
+
+    def routing(self, **kwargs):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        kwargs.setdefault("replica_view", True)
+        return db_router.RequestRouting(request=request, **kwargs)
+
+    def test_unhealthy_replica_falls_back_to_the_primary(self):
+        self.assertEqual(self.read_alias(self.routing(), healthy=False), DEFAULT_DB_ALIAS)
+        # Checked again only after REPLICA_HEALTH_CHECK_INTERVAL.
+        self.assertEqual(self.read_alias(self.routing(), healthy=True), DEFAULT_DB_ALIAS)
+        db_router.health.reset()
+        self.assertEqual(self.read_alias(self.routing(), healthy=True), "replica")
+
+        self.assertEqual(self.read_alias(self.routing(replica_view=False)), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.read_alias(None), DEFAULT_DB_ALIAS)
+
+    @override_settings(REPLICA_MAX_LAG_SECONDS=30)
+    def test_health_check_measures_the_lag(self):
+        self.assertFalse(db_router.health.check(DEFAULT_DB_ALIAS))
+        ReplicationHeartbeat.beat()
+        self.assertTrue(db_router.health.check(DEFAULT_DB_ALIAS))
+        ReplicationHeartbeat.objects.update(beat_at=timezone.now() - timedelta(seconds=31))
+        self.assertFalse(db_router.health.check(DEFAULT_DB_ALIAS))
+
+    def test_writers_read_their_writes(self):
+        routing = self.routing()
+        self.assertEqual(self.read_alias(routing), "replica")
+        token = db_router.current_routing.set(routing)
+        self.router.db_for_write(School)
+        db_router.current_routing.reset(token)
+        self.assertTrue(routing.wrote)
+        self.assertEqual(self.read_alias(routing), DEFAULT_DB_ALIAS)
+
+        # The next requests of the user stay on the primary for a while.
+        self.assertEqual(self.read_alias(self.routing()), "replica")
+        db_router.pin_to_primary(self.user.pk)
+        self.assertEqual(self.read_alias(self.routing()), DEFAULT_DB_ALIAS)
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_a_write_request_pins_the_user(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/auth/users/me/").status_code, 200)
+        self.assertFalse(db_router.is_pinned(self.user.pk))
+        self.assertEqual(client.patch("/auth/users/me/", {"first_name": "Sara"}, format="json").status_code, 200)
+        self.assertTrue(db_router.is_pinned(self.user.pk))
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.enterContext(override_settings(METRICS_DIR=self.directory, METRICS_FLUSH_INTERVAL=3600))
+        self.registry = self.enterContext(mock.patch.object(metrics, "registry", metrics.Registry()))
+
+    def write(self, pid, counters=None, histograms=None):
+        data = marshal.dumps({"counters": counters or {}, "histograms": histograms or {}})
+        with open(os.path.join(self.directory, f"{pid}.metrics"), "wb") as file:
+            file.write(data)
+
+    def test_files_of_live_processes_are_summed(self):
+        view = (("view", "school.views.SchoolViewSet.list"),)
+        requests = ("http_requests_total", (("method", "GET"), ("status", "200")) + view)
+        self.registry.observe_request("school.views.SchoolViewSet.list", "GET", 200, 0.02)
+        self.registry.observe_request("school.views.SchoolViewSet.list", "GET", 200, 3.0)
+        histogram = [0] * (len(metrics.REQUEST_BUCKETS) + 1) + [0.0]
+        histogram[0], histogram[-1] = 2, 0.004
+        # The parent process is alive; an exited child is not.
+        self.write(os.getppid(), {requests: 2}, {("http_request_duration_seconds", view): histogram})
+        child = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"],
+                               capture_output=True, text=True, check=True)
+        dead = int(child.stdout)
+        self.write(dead, {requests: 100})
+
+        counters, histograms = metrics.collect()
+        self.assertEqual(counters[requests], 4)
+        merged = histograms[("http_request_duration_seconds", view)]
+        self.assertEqual(merged[:-1], [2, 0, 1, 0, 0, 0, 0, 0, 0, 1, 0, 0])
+        self.assertAlmostEqual(merged[-1], 3.024)
+        self.assertFalse(os.path.exists(os.path.join(self.directory, f"{dead}.metrics")))
+
+        text = metrics.exposition()
+        self.assertIn('http_requests_total{method="GET",status="200",view="school.views.SchoolViewSet.list"} 4\n',
+                      text)
+        self.assertIn('http_request_duration_seconds_count{view="school.views.SchoolViewSet.list"} 4\n', text)
+
+    def test_unreadable_files_are_skipped(self):
+        with open(os.path.join(self.directory, f"{os.getppid()}.metrics"), "wb") as file:
+            file.write(b"\x00garbage")
+        self.registry.inc("jobs_processed_total", (("name", "x"), ("result", "succeeded")))
+        counters, _ = metrics.collect()
+        self.assertEqual(dict(counters), {("jobs_processed_total", (("name", "x"), ("result", "succeeded"))): 1})
+
+
+class RendererTests(TestCase):
+    data = {
+        "amount": Decimal("1250000.50"),
+        "phone_number": PhoneNumber.from_string("+989351234567"),
+        "nested": [{"rate": Decimal("0.125")}],
+        "when": timezone.now().replace(microsecond=0),
+    }
+
+    def test_json_matches_the_stock_renderer(self):
+        rendered = FastJSONRenderer().render(self.data)
+        # The stock encoder does not know phone numbers: serializers hand it strings.
+        stock = JSONRenderer().render({**self.data, "phone_number": str(self.data["phone_number"])})
+        self.assertEqual(json.loads(rendered), json.loads(stock))
+        parsed = FastJSONParser().parse(BytesIO(rendered))
+        self.assertEqual(parsed["amount"], 1250000.5)
+        self.assertEqual(parsed["phone_number"], "+989351234567")
+        self.assertEqual(parsed["nested"], [{"rate": 0.125}])
+
+    def test_msgpack_round_trip(self):
+        parsed = MessagePackParser().parse(BytesIO(MessagePackRenderer().render(self.data)))
+        self.assertEqual(parsed, json.loads(FastJSONRenderer().render(self.data)))
+
+    def test_negotiation(self):
+        generate_dataset()
+        client = APIClient()
+        client.force_authenticate(School.objects.select_related("manager__user").get().manager.user)
+        packed = client.get("/auth/users/me/", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(packed["Content-Type"], "application/msgpack")
+        self.assertEqual(MessagePackParser().parse(BytesIO(packed.content)),
+                         json.loads(client.get("/auth/users/me/").content))
@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import JobAPIView, JobsAPIView, MetricsAPIView, ResponseCacheStatsAPIView, ShardSchoolsAPIView
+
+urlpatterns = [
+    path("cache/stats/", ResponseCacheStatsAPIView.as_view(), name="response-cache-stats"),
+    path("jobs/", JobsAPIView.as_view(), name="jobs"),
+    path("jobs/<int:pk>/", JobAPIView.as_view(), name="job"),
+    path("metrics/", MetricsAPIView.as_view(), name="metrics"),
+    path("shards/schools/", ShardSchoolsAPIView.as_view(), name="shard-schools"),
+]
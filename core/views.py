@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.db.models import Count
+from django.http import Http404
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import BasePermission, IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from school.models import School
+
+from . import jobs
+from .cache import get_stats
+from .models import Job
+from .metrics import exposition
+from .renderers import PrometheusTextRenderer
+from .serializers import JobSerializer
+from .sharding import across_shards
+
+
+@extend_schema(
+    tags=["Operations"],
+    summary="Response cache statistics",
+    description="Hits, misses, hit rate and bytes served from the response cache since the cache was created.",
+)
+class ResponseCacheStatsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+class IsMetricsScraper(BasePermission):
+    """Local metrics agents (METRICS_ALLOWED_IPS) and staff users."""
+
+    def has_permission(self, request, view):
+        allowed = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1", "::1"])
+        return request.META.get("REMOTE_ADDR") in allowed or bool(request.user and request.user.is_staff)
+
+
+@extend_schema(
+    tags=["Operations"],
+    summary="Metrics",
+    description=(
+        "Request counts and latency histograms per view, SQL counts and time, response cache lookups "
+        "and hit ratio, and queue depths, summed over all worker processes, in the Prometheus text format. "
+        "Open to METRICS_ALLOWED_IPS and staff users."
+    ),
+)
+class MetricsAPIView(APIView):
+    permission_classes = [IsMetricsScraper]
+    renderer_classes = [PrometheusTextRenderer]
+
+    def get(self, request):
+        return Response(exposition())
+
+
+@extend_schema(
+    tags=["Operations"],
+    summary="Schools across shards",
+    description=(
+        "Every school of every shard (SCHOOL_SHARDS) with its shard alias and player and team counts, "
+        "read shard by shard. Without sharding: the schools of the single database."
+    ),
+)
+class ShardSchoolsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        schools = School.objects.annotate(
+            players=Count("player", distinct=True), teams_count=Count("teams", distinct=True),
+        ).order_by("pk")
+        return Response([
+            {"shard": alias, "id": school.pk, "name": school.name, "is_active": school.is_active,
+             "players": school.players, "teams": school.teams_count}
+            for alias, school in across_shards(schools)
+        ])
+
+
+@extend_schema(
+    tags=["Operations"],
+    summary="Background jobs",
+    description=(
+        "For every database holding jobs: queued, running and failed jobs by type, the number of jobs due "
+        "and how long the oldest has waited, and the latest failures."
+    ),
+)
+class JobsAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        databases = []
+        for using in jobs.get_databases():
+            stats = jobs.queue_stats(using)
+            failures = Job.objects.using(using).filter(status=Job.FAILED).order_by("-finished_at")[:20]
+            stats["recent_failures"] = JobSerializer(failures, many=True).data
+            databases.append(stats)
+        return Response(databases)
+
+
+@extend_schema(
+    tags=["Operations"],
+    summary="Background job",
+    description="One job with its state, attempts and last error. With sharding, ?database= names its shard.",
+    responses=JobSerializer,
+)
+class JobAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, pk):
+        using = request.query_params.get("database", jobs.get_databases()[0])
+        job = Job.objects.using(using).filter(pk=pk).first() if using in jobs.get_databases() else None
+        if job is None:
+            raise Http404
+        return Response(JobSerializer(job).data)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('manager', '0001_initial'),
+        ('school', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Expense',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('category', models.CharField(choices=[('rent', 'Rent'), ('equipment', 'Equipment'), ('utilities', 'Utilities'), ('transport', 'Transport'), ('other', 'Other')], default='other', max_length=20)),
+                ('amount', models.BigIntegerField()),
+                ('date', models.DateField()),
+                ('description', models.TextField(blank=True, null=True)),
+                ('manager', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='manager.manager')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='school.school')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['school', 'date'], name='expenses_ex_school__d9d42d_idx')],
+            },
+        ),
+    ]
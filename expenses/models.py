@@ -1,12 +1,32 @@
 from django.db import models
 
 class Expense(models.Model):
+    CATEGORY_RENT = 'rent'
+    CATEGORY_EQUIPMENT = 'equipment'
+    CATEGORY_UTILITIES = 'utilities'
+    CATEGORY_TRANSPORT = 'transport'
+    CATEGORY_OTHER = 'other'
+
+    CATEGORY_CHOICES = [
+        (CATEGORY_RENT, 'Rent'),
+        (CATEGORY_EQUIPMENT, 'Equipment'),
+        (CATEGORY_UTILITIES, 'Utilities'),
+        (CATEGORY_TRANSPORT, 'Transport'),
+        (CATEGORY_OTHER, 'Other'),
+    ]
+
     school = models.ForeignKey('school.School', on_delete=models.CASCADE)
     manager = models.ForeignKey('manager.Manager', on_delete=models.CASCADE)
     title = models.CharField(max_length=255)
+    category = models.CharField(max_length=20, choices=CATEGORY_CHOICES, default=CATEGORY_OTHER)
     amount = models.BigIntegerField()
     date = models.DateField()
     description = models.TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['school', 'date']),
+        ]
+
     def __str__(self):
         return f"{self.title}"
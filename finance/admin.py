@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import ReceivablesAgingSnapshot, SchoolMonthlyLedger
+
+
+@admin.register(SchoolMonthlyLedger)
+class SchoolMonthlyLedgerAdmin(admin.ModelAdmin):
+    list_display = ('school', 'month', 'income', 'salary_cost', 'expense_total', 'updated_at')
+    list_filter = ('school',)
+    date_hierarchy = 'month'
+
+
+@admin.register(ReceivablesAgingSnapshot)
+class ReceivablesAgingSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('date', 'school', 'team', 'days_0_30', 'days_31_60', 'days_61_90', 'days_over_90', 'total')
+    list_filter = ('school',)
+    date_hierarchy = 'date'
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from finance.models import SchoolMonthlyLedger
+
+
+class Command(BaseCommand):
+    help = "Recompute the monthly school ledger from payments, salaries and expenses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--school",
+            type=int,
+            action="append",
+            dest="schools",
+            help="Only rebuild the given school id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        count = SchoolMonthlyLedger.rebuild(school_ids=options["schools"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} ledger rows."))
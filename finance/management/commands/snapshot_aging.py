@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from finance.models import ReceivablesAgingSnapshot
+
+
+class Command(BaseCommand):
+    help = "Store today's receivables aging report per team. Meant to run once a day."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            help="Snapshot date as YYYY-MM-DD (defaults to today).",
+        )
+        parser.add_argument(
+            "--school",
+            type=int,
+            action="append",
+            dest="schools",
+            help="Only snapshot the given school id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--date must be in YYYY-MM-DD format.")
+
+        count = ReceivablesAgingSnapshot.take(today, school_ids=options["schools"])
+        self.stdout.write(self.style.SUCCESS(f"Stored {count} aging rows for {today}."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('school', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolMonthlyLedger',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month', verbose_name='Month')),
+                ('income', models.BigIntegerField(default=0, help_text='Player fee payments received in Toman', verbose_name='Income')),
+                ('salary_cost', models.BigIntegerField(default=0, help_text='Coach salary payments in Toman', verbose_name='Salary Cost')),
+                ('expense_total', models.BigIntegerField(default=0, help_text='School expenses in Toman', verbose_name='Expenses')),
+                ('income_breakdown', models.JSONField(blank=True, default=dict, help_text='Income per payment method', verbose_name='Income Breakdown')),
+                ('expense_breakdown', models.JSONField(blank=True, default=dict, help_text='Expenses per category', verbose_name='Expense Breakdown')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_ledgers', to='school.school', verbose_name='School')),
+            ],
+            options={
+                'verbose_name': 'School Monthly Ledger',
+                'verbose_name_plural': 'School Monthly Ledgers',
+                'ordering': ['school', '-month'],
+                'constraints': [models.UniqueConstraint(fields=('school', 'month'), name='unique_ledger_month_per_school')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+        ('school', '0001_initial'),
+        ('team', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceivablesAgingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='Snapshot Date')),
+                ('not_due', models.BigIntegerField(default=0, verbose_name='Not Yet Due')),
+                ('days_0_30', models.BigIntegerField(default=0, verbose_name='0-30 Days')),
+                ('days_31_60', models.BigIntegerField(default=0, verbose_name='31-60 Days')),
+                ('days_61_90', models.BigIntegerField(default=0, verbose_name='61-90 Days')),
+                ('days_over_90', models.BigIntegerField(default=0, verbose_name='Over 90 Days')),
+                ('total', models.BigIntegerField(default=0, verbose_name='Total Outstanding')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aging_snapshots', to='school.school', verbose_name='School')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aging_snapshots', to='team.team', verbose_name='Team')),
+            ],
+            options={
+                'verbose_name': 'Receivables Aging Snapshot',
+                'verbose_name_plural': 'Receivables Aging Snapshots',
+                'ordering': ['-date', 'school', 'team'],
+                'constraints': [models.UniqueConstraint(fields=('school', 'date', 'team'), name='unique_aging_snapshot_per_team')],
+            },
+        ),
+    ]
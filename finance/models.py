@@ -0,0 +1,262 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import models, transaction
+from django.db.models import F, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from coach_salaries.models import SalaryPayment
+from expenses.models import Expense
+from player_fees.models import PlayerFeePayment, PlayerInvoice
+from school.models import School
+
+
+def month_start(value):
+    """Return the first day of the month that contains ``value``."""
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+    return value.replace(day=1)
+
+
+def add_months(month, count):
+    """Shift the first day of a month by ``count`` months (negative goes back)."""
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def next_month(month):
+    """Return the first day of the month following ``month``."""
+    return add_months(month, 1)
+
+
+def _aware(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class SchoolMonthlyLedger(models.Model):
+    """
+    Monthly profit and loss figures of a school.
+
+    Rows are maintained from the write paths of player fee payments, salary
+    payments and expenses (see finance/signal.py) so reports read one row per
+    month instead of aggregating the source tables. ``rebuild_ledger``
+    recomputes them from scratch when they drift.
+    """
+
+    school = models.ForeignKey('school.School', on_delete=models.CASCADE, related_name='monthly_ledgers',
+                               verbose_name="School")
+    month = models.DateField(verbose_name="Month", help_text="First day of the month")
+    income = models.BigIntegerField(default=0, verbose_name="Income",
+                                    help_text="Player fee payments received in Toman")
+    salary_cost = models.BigIntegerField(default=0, verbose_name="Salary Cost",
+                                         help_text="Coach salary payments in Toman")
+    expense_total = models.BigIntegerField(default=0, verbose_name="Expenses",
+                                           help_text="School expenses in Toman")
+    income_breakdown = models.JSONField(default=dict, blank=True, verbose_name="Income Breakdown",
+                                        help_text="Income per payment method")
+    expense_breakdown = models.JSONField(default=dict, blank=True, verbose_name="Expense Breakdown",
+                                         help_text="Expenses per category")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+
+    class Meta:
+        ordering = ['school', '-month']
+        verbose_name = "School Monthly Ledger"
+        verbose_name_plural = "School Monthly Ledgers"
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'month'], name='unique_ledger_month_per_school')
+        ]
+
+    def __str__(self):
+        return f"{self.school_id} - {self.month:%Y-%m}"
+
+    @property
+    def net(self):
+        """Income minus salaries and expenses."""
+        return self.income - self.salary_cost - self.expense_total
+
+    @staticmethod
+    def collect(school_ids=None, month=None):
+        """
+        Aggregate the source tables per (school, month).
+
+        Returns a dict keyed by ``(school_id, month)`` holding the field values
+        of a ledger row. Restrict it with ``school_ids`` and/or a single
+        ``month``; each source is read with one grouped query.
+        """
+        fees = PlayerFeePayment.objects.all()
+        salaries = SalaryPayment.objects.all()
+        expenses = Expense.objects.all()
+
+        if school_ids is not None:
+            fees = fees.filter(invoice__team__school_id__in=school_ids)
+            salaries = salaries.filter(salary_record__coach_contract__coach__school_id__in=school_ids)
+            expenses = expenses.filter(school_id__in=school_ids)
+        if month is not None:
+            end = next_month(month)
+            fees = fees.filter(date__gte=month, date__lt=end)
+            salaries = salaries.filter(paid_at__gte=_aware(month), paid_at__lt=_aware(end))
+            expenses = expenses.filter(date__gte=month, date__lt=end)
+
+        cells = defaultdict(lambda: {
+            'income': 0,
+            'salary_cost': 0,
+            'expense_total': 0,
+            'income_breakdown': {},
+            'expense_breakdown': {},
+        })
+
+        fee_rows = (
+            fees.values('method', school_key=F('invoice__team__school_id'), period=TruncMonth('date'))
+            .annotate(total=Sum('amount'))
+            .order_by()
+        )
+        for row in fee_rows:
+            cell = cells[(row['school_key'], row['period'])]
+            cell['income'] += row['total']
+            cell['income_breakdown'][row['method']] = row['total']
+
+        salary_rows = (
+            salaries.values(
+                school_key=F('salary_record__coach_contract__coach__school_id'),
+                period=TruncMonth('paid_at', output_field=models.DateField()),
+            )
+            .annotate(total=Sum('amount'))
+            .order_by()
+        )
+        for row in salary_rows:
+            cells[(row['school_key'], row['period'])]['salary_cost'] += row['total']
+
+        expense_rows = (
+            expenses.values('category', school_key=F('school_id'), period=TruncMonth('date'))
+            .annotate(total=Sum('amount'))
+            .order_by()
+        )
+        for row in expense_rows:
+            cell = cells[(row['school_key'], row['period'])]
+            cell['expense_total'] += row['total']
+            cell['expense_breakdown'][row['category']] = row['total']
+
+        return cells
+
+    @classmethod
+    def refresh(cls, school_id, month):
+        """Recompute the ledger row of one school and month."""
+        month = month_start(month)
+        if not School.objects.filter(pk=school_id).exists():
+            return None
+        values = cls.collect(school_ids=[school_id], month=month).get((school_id, month))
+        if values is None:
+            cls.objects.filter(school_id=school_id, month=month).delete()
+            return None
+        ledger, _ = cls.objects.update_or_create(school_id=school_id, month=month, defaults=values)
+        return ledger
+
+    @classmethod
+    def rebuild(cls, school_ids=None):
+        """Drop and recreate the ledger rows from the source tables."""
+        cells = cls.collect(school_ids=school_ids)
+        rows = [
+            cls(school_id=school_id, month=month, **values)
+            for (school_id, month), values in cells.items()
+        ]
+        with transaction.atomic():
+            existing = cls.objects.all()
+            if school_ids is not None:
+                existing = existing.filter(school_id__in=school_ids)
+            existing.delete()
+            cls.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
+
+
+class ReceivablesAgingSnapshot(models.Model):
+    """
+    Daily copy of the receivables aging report per team.
+
+    Buckets hold the outstanding invoice amounts by days past the due date;
+    ``not_due`` covers invoices whose due date is still ahead.
+    """
+
+    BUCKETS = ('not_due', 'days_0_30', 'days_31_60', 'days_61_90', 'days_over_90')
+
+    date = models.DateField(verbose_name="Snapshot Date")
+    school = models.ForeignKey('school.School', on_delete=models.CASCADE, related_name='aging_snapshots',
+                               verbose_name="School")
+    team = models.ForeignKey('team.Team', on_delete=models.CASCADE, related_name='aging_snapshots',
+                             verbose_name="Team")
+    not_due = models.BigIntegerField(default=0, verbose_name="Not Yet Due")
+    days_0_30 = models.BigIntegerField(default=0, verbose_name="0-30 Days")
+    days_31_60 = models.BigIntegerField(default=0, verbose_name="31-60 Days")
+    days_61_90 = models.BigIntegerField(default=0, verbose_name="61-90 Days")
+    days_over_90 = models.BigIntegerField(default=0, verbose_name="Over 90 Days")
+    total = models.BigIntegerField(default=0, verbose_name="Total Outstanding")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+
+    class Meta:
+        ordering = ['-date', 'school', 'team']
+        verbose_name = "Receivables Aging Snapshot"
+        verbose_name_plural = "Receivables Aging Snapshots"
+        constraints = [
+            models.UniqueConstraint(fields=['school', 'date', 'team'], name='unique_aging_snapshot_per_team')
+        ]
+
+    def __str__(self):
+        return f"{self.date} - {self.team_id}: {self.total:,} Toman"
+
+    @classmethod
+    def report(cls, today, school_ids=None, group_by='team'):
+        """
+        Outstanding amounts per aging bucket, grouped by school and team
+        (``group_by='team'``) or additionally by player (``group_by='player'``).
+
+        Runs as one grouped query: paid totals come from a correlated
+        subquery and every bucket is a filtered SUM over the same rows.
+        """
+        invoices = PlayerInvoice.objects.exclude(status=PlayerInvoice.STATUS_CANCELLED)
+        if school_ids is not None:
+            invoices = invoices.filter(team__school_id__in=school_ids)
+
+        group = ['team__school_id', 'team_id', 'team__name']
+        if group_by == 'player':
+            group += ['player_id', 'player__user__username']
+
+        return (
+            invoices.with_balances()
+            .filter(outstanding__gt=0)
+            .values(*group)
+            .annotate(
+                not_due=Sum('outstanding', default=0, filter=Q(due_date__gt=today)),
+                days_0_30=Sum('outstanding', default=0,
+                              filter=Q(due_date__lte=today, due_date__gte=today - timedelta(days=30))),
+                days_31_60=Sum('outstanding', default=0,
+                               filter=Q(due_date__lt=today - timedelta(days=30),
+                                        due_date__gte=today - timedelta(days=60))),
+                days_61_90=Sum('outstanding', default=0,
+                               filter=Q(due_date__lt=today - timedelta(days=60),
+                                        due_date__gte=today - timedelta(days=90))),
+                days_over_90=Sum('outstanding', default=0, filter=Q(due_date__lt=today - timedelta(days=90))),
+                total=Sum('outstanding', default=0),
+            )
+            .order_by(*group[:2])
+        )
+
+    @classmethod
+    def take(cls, today, school_ids=None):
+        """Persist the team level report of ``today``, replacing an earlier run of the same day."""
+        rows = [
+            cls(
+                date=today,
+                school_id=row['team__school_id'],
+                team_id=row['team_id'],
+                total=row['total'],
+                **{bucket: row[bucket] for bucket in cls.BUCKETS},
+            )
+            for row in cls.report(today, school_ids=school_ids)
+        ]
+        with transaction.atomic():
+            existing = cls.objects.filter(date=today)
+            if school_ids is not None:
+                existing = existing.filter(school_id__in=school_ids)
+            existing.delete()
+            cls.objects.bulk_create(rows, batch_size=500)
+        return len(rows)
@@ -0,0 +1,10 @@
+from rest_framework import permissions
+
+
+class IsManagerOrStaff(permissions.BasePermission):
+    """
+    Financial reports are available to school managers and staff users only.
+    """
+
+    def has_permission(self, request, view):
+        return request.user.is_staff or hasattr(request.user, "manager")
@@ -0,0 +1,43 @@
+from rest_framework import serializers
+from .models import SchoolMonthlyLedger
+
+
+class SchoolMonthlyLedgerSerializer(serializers.ModelSerializer):
+    net = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = SchoolMonthlyLedger
+        fields = [
+            "month",
+            "income",
+            "salary_cost",
+            "expense_total",
+            "net",
+            "income_breakdown",
+            "expense_breakdown",
+        ]
+        read_only_fields = fields
+
+
+class AgingReportSerializer(serializers.Serializer):
+    school = serializers.IntegerField(source="team__school_id")
+    team = serializers.IntegerField(source="team_id")
+    team_name = serializers.CharField(source="team__name")
+    player = serializers.IntegerField(source="player_id", required=False)
+    player_username = serializers.CharField(source="player__user__username", required=False)
+    not_due = serializers.IntegerField()
+    days_0_30 = serializers.IntegerField()
+    days_31_60 = serializers.IntegerField()
+    days_61_90 = serializers.IntegerField()
+    days_over_90 = serializers.IntegerField()
+    total = serializers.IntegerField()
+
+
+class AgingHistorySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    not_due = serializers.IntegerField()
+    days_0_30 = serializers.IntegerField()
+    days_31_60 = serializers.IntegerField()
+    days_61_90 = serializers.IntegerField()
+    days_over_90 = serializers.IntegerField()
+    total = serializers.IntegerField()
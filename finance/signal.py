@@ -0,0 +1,67 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from coach_salaries.models import SalaryPayment, SalaryRecord
+from expenses.models import Expense
+from player_fees.models import PlayerFeePayment, PlayerInvoice
+from .models import SchoolMonthlyLedger, month_start
+
+
+def ledger_cell(instance):
+    """Return the (school_id, month) ledger row affected by a source row."""
+    if isinstance(instance, Expense):
+        school_id, day = instance.school_id, instance.date
+    elif isinstance(instance, PlayerFeePayment):
+        school_id = PlayerInvoice.objects.filter(pk=instance.invoice_id).values_list(
+            'team__school_id', flat=True).first()
+        day = instance.date
+    else:
+        school_id = SalaryRecord.objects.filter(pk=instance.salary_record_id).values_list(
+            'coach_contract__coach__school_id', flat=True).first()
+        day = instance.paid_at
+
+    if school_id is None or day is None:
+        return None
+    return school_id, month_start(day)
+
+
+def _schedule_refresh(*cells):
+    for cell in set(filter(None, cells)):
+        transaction.on_commit(partial(SchoolMonthlyLedger.refresh, *cell))
+
+
+@receiver(pre_save, sender=PlayerFeePayment)
+@receiver(pre_save, sender=SalaryPayment)
+@receiver(pre_save, sender=Expense)
+def remember_previous_ledger_cell(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    instance._previous_ledger_cell = ledger_cell(previous) if previous else None
+
+
+@receiver(post_save, sender=PlayerFeePayment)
+@receiver(post_save, sender=SalaryPayment)
+@receiver(post_save, sender=Expense)
+def refresh_ledger_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _schedule_refresh(getattr(instance, '_previous_ledger_cell', None), ledger_cell(instance))
+
+
+@receiver(pre_delete, sender=PlayerFeePayment)
+@receiver(pre_delete, sender=SalaryPayment)
+@receiver(pre_delete, sender=Expense)
+def remember_deleted_ledger_cell(sender, instance, **kwargs):
+    # Resolve the school before a cascade removes the rows it is reached through.
+    instance._previous_ledger_cell = ledger_cell(instance)
+
+
+@receiver(post_delete, sender=PlayerFeePayment)
+@receiver(post_delete, sender=SalaryPayment)
+@receiver(post_delete, sender=Expense)
+def refresh_ledger_on_delete(sender, instance, **kwargs):
+    _schedule_refresh(getattr(instance, '_previous_ledger_cell', None))
@@ -0,0 +1,213 @@
+from datetime import date, datetime, time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from coach.models import Coach
+from coach_salaries.models import CoachContract, SalaryPayment, SalaryRecord
+from core.testing import generate_dataset
+from expenses.models import Expense
+from player.models import Player
+from player_fees.models import PlayerFeePayment, PlayerInvoice
+from school.models import School
+from team.models import Team
+from .models import ReceivablesAgingSnapshot, SchoolMonthlyLedger, add_months, month_start
+
+JANUARY = date(2020, 1, 1)
+FEBRUARY = date(2020, 2, 1)
+
+
+class LedgerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(invoices=2)
+        cls.school = School.objects.select_related("manager__user").get()
+        cls.invoice = PlayerInvoice.objects.order_by("id").first()
+        coach = Coach.objects.get()
+        cls.contract = CoachContract.objects.create(coach=coach, manager=cls.school.manager, price=5_000_000)
+
+    def cell(self, month):
+        return SchoolMonthlyLedger.objects.filter(school=self.school, month=month).values(
+            "income", "salary_cost", "expense_total", "income_breakdown", "expense_breakdown").first()
+
+    def ledger_rows(self):
+        return list(SchoolMonthlyLedger.objects.order_by("school", "month").values(
+            "school", "month", "income", "salary_cost", "expense_total", "income_breakdown", "expense_breakdown"))
+
+    def ledger_rows_rebuilt(self):
+        call_command("rebuild_ledger", stdout=StringIO())
+        return self.ledger_rows()
+
+    def test_payment_refreshes_its_month_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            payment = PlayerFeePayment.objects.create(invoice=self.invoice, amount=300_000, method="cash",
+                                                      date=date(2020, 1, 15))
+        self.assertIsNone(self.cell(JANUARY))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.cell(JANUARY), {"income": 300_000, "salary_cost": 0, "expense_total": 0,
+                                              "income_breakdown": {"cash": 300_000}, "expense_breakdown": {}})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            PlayerFeePayment.objects.create(invoice=self.invoice, amount=200_000, method="online",
+                                            date=date(2020, 1, 31))
+        self.assertEqual(self.cell(JANUARY)["income_breakdown"], {"cash": 300_000, "online": 200_000})
+
+        # A move to another month refreshes both months.
+        payment.date = date(2020, 2, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.save()
+        self.assertEqual((self.cell(JANUARY)["income"], self.cell(FEBRUARY)["income"]), (200_000, 300_000))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.delete()
+        self.assertIsNone(self.cell(FEBRUARY))
+        self.assertEqual(self.cell(JANUARY)["income"], 200_000)
+
+    def test_salary_payment(self):
+        record = SalaryRecord.objects.create(coach_contract=self.contract, month=JANUARY)
+        with self.captureOnCommitCallbacks(execute=True):
+            payment = SalaryPayment.objects.create(salary_record=record, amount=5_000_000)
+        this_month = month_start(timezone.localdate())
+        self.assertEqual(self.cell(this_month)["salary_cost"], 5_000_000)
+
+        payment.paid_at = timezone.make_aware(datetime.combine(date(2020, 1, 28), time(18)))
+        payment.amount = 4_500_000
+        with self.captureOnCommitCallbacks(execute=True):
+            payment.save()
+        self.assertEqual(self.cell(JANUARY)["salary_cost"], 4_500_000)
+        self.assertEqual(self.ledger_rows(), self.ledger_rows_rebuilt())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delete()
+        self.assertIsNone(self.cell(JANUARY))
+
+    def test_expense(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rent = Expense.objects.create(school=self.school, manager=self.school.manager, title="Rent",
+                                          category=Expense.CATEGORY_RENT, amount=2_000_000, date=date(2020, 1, 1))
+            Expense.objects.create(school=self.school, manager=self.school.manager, title="Balls",
+                                   category=Expense.CATEGORY_EQUIPMENT, amount=400_000, date=date(2020, 1, 9))
+        self.assertEqual(self.cell(JANUARY)["expense_total"], 2_400_000)
+        self.assertEqual(self.cell(JANUARY)["expense_breakdown"], {"rent": 2_000_000, "equipment": 400_000})
+
+        rent.date, rent.amount = date(2020, 2, 29), 2_100_000
+        with self.captureOnCommitCallbacks(execute=True):
+            rent.save()
+        self.assertEqual(self.cell(JANUARY)["expense_breakdown"], {"equipment": 400_000})
+        self.assertEqual(self.cell(FEBRUARY)["expense_breakdown"], {"rent": 2_100_000})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rent.delete()
+        self.assertIsNone(self.cell(FEBRUARY))
+
+    def test_rebuild_matches_the_incremental_rows(self):
+        before = self.ledger_rows()
+        self.assertTrue(before)
+        with self.captureOnCommitCallbacks(execute=True):
+            PlayerFeePayment.objects.create(invoice=self.invoice, amount=100_000, method="cash", date=JANUARY)
+            Expense.objects.create(school=self.school, manager=self.school.manager, title="Bus",
+                                   category=Expense.CATEGORY_TRANSPORT, amount=70_000, date=FEBRUARY)
+            SalaryPayment.objects.create(
+                salary_record=SalaryRecord.objects.create(coach_contract=self.contract, month=JANUARY),
+                amount=1_000_000,
+            )
+            moved = PlayerFeePayment.objects.filter(invoice__team__school=self.school).order_by("id").first()
+            moved.date = FEBRUARY
+            moved.save()
+            PlayerFeePayment.objects.filter(invoice__team__school=self.school).order_by("-id").first().delete()
+
+        incremental = self.ledger_rows()
+        self.assertNotEqual(incremental, before)
+        self.assertEqual(self.ledger_rows_rebuilt(), incremental)
+
+
+class DashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.school = School.objects.select_related("manager__user").get()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.school.manager.user)
+
+    def test_empty_months_are_filled(self):
+        SchoolMonthlyLedger.objects.all().delete()
+        this_month = month_start(timezone.localdate())
+        two_months_ago = add_months(this_month, -2)
+        SchoolMonthlyLedger.objects.create(school=self.school, month=two_months_ago, income=900_000,
+                                           expense_total=100_000, income_breakdown={"cash": 900_000})
+        # Outside the window.
+        SchoolMonthlyLedger.objects.create(school=self.school, month=add_months(this_month, -4), income=1)
+
+        response = self.client.get("/api/finance/dashboard/?months=4")
+        self.assertEqual(response.status_code, 200, response.content)
+        months = response.data["months"]
+        self.assertEqual([row["month"] for row in months],
+                         [str(add_months(this_month, offset)) for offset in range(-3, 1)])
+        self.assertEqual([row["income"] for row in months], [0, 900_000, 0, 0])
+        self.assertEqual([row["net"] for row in months], [0, 800_000, 0, 0])
+        self.assertEqual(months[0]["income_breakdown"], {})
+        self.assertEqual(response.data["totals"],
+                         {"income": 900_000, "salary_cost": 0, "expense_total": 100_000, "net": 800_000})
+
+
+class AgingTests(TestCase):
+    today = date(2024, 6, 30)
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(players=2, invoices=0)
+        cls.team = Team.objects.get()
+        cls.player, cls.other_player = Player.objects.order_by("id")
+        # Days past due -> amount, so every bucket sum tells which invoices it holds.
+        amounts = {-1: 100, 0: 200, 30: 400, 31: 800, 60: 1_600, 61: 3_200, 90: 6_400, 91: 12_800}
+        cls.invoices = {
+            days: PlayerInvoice.objects.create(
+                player=cls.other_player if days == 90 else cls.player, team=cls.team, amount=amount,
+                issued_date=date(2024, 1, 1), due_date=cls.today - timedelta(days=days),
+            )
+            for days, amount in amounts.items()
+        }
+        PlayerInvoice.objects.create(player=cls.player, team=cls.team, amount=25_600, issued_date=date(2024, 1, 1),
+                                     due_date=date(2024, 1, 1), status=PlayerInvoice.STATUS_CANCELLED)
+        PlayerFeePayment.objects.bulk_create([
+            PlayerFeePayment(invoice=cls.invoices[31], amount=300, method="cash"),
+            PlayerFeePayment(invoice=cls.invoices[61], amount=3_200, method="cash"),
+        ])
+
+    def buckets(self, row):
+        return {bucket: row[bucket] for bucket in ("total",) + ReceivablesAgingSnapshot.BUCKETS}
+
+    def test_bucket_edges(self):
+        rows = list(ReceivablesAgingSnapshot.report(self.today))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(self.buckets(rows[0]), {
+            "not_due": 100,
+            "days_0_30": 200 + 400,
+            "days_31_60": (800 - 300) + 1_600,
+            "days_61_90": 6_400,
+            "days_over_90": 12_800,
+            "total": 100 + 600 + 2_100 + 6_400 + 12_800,
+        })
+
+    def test_player_rows(self):
+        rows = {row["player_id"]: row for row in ReceivablesAgingSnapshot.report(self.today, group_by="player")}
+        self.assertEqual(set(rows), {self.player.pk, self.other_player.pk})
+        self.assertEqual(rows[self.other_player.pk]["days_61_90"], 6_400)
+        self.assertEqual(rows[self.player.pk]["days_61_90"], 0)
+        self.assertEqual(rows[self.player.pk]["total"], 100 + 600 + 2_100 + 12_800)
+
+    def test_snapshot_replaces_the_day(self):
+        call_command("snapshot_aging", date="2024-06-29", stdout=StringIO())
+        call_command("snapshot_aging", date=str(self.today), stdout=StringIO())
+        PlayerFeePayment.objects.create(invoice=self.invoices[91], amount=12_800, method="cash")
+        call_command("snapshot_aging", date=str(self.today), stdout=StringIO())
+
+        snapshot = ReceivablesAgingSnapshot.objects.get(date=self.today)
+        self.assertEqual((snapshot.team_id, snapshot.days_over_90, snapshot.total), (self.team.pk, 0, 9_200))
+        self.assertEqual(ReceivablesAgingSnapshot.objects.get(date=date(2024, 6, 29)).total, 22_000)
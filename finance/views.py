@@ -0,0 +1,132 @@
+from datetime import timedelta
+
+from django.db.models import Sum
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from core.params import parse_int_param
+from school.models import School
+from .models import ReceivablesAgingSnapshot, SchoolMonthlyLedger, add_months, month_start
+from .permissions import IsManagerOrStaff
+from .serializers import AgingHistorySerializer, AgingReportSerializer, SchoolMonthlyLedgerSerializer
+
+MAX_DASHBOARD_MONTHS = 36
+MAX_AGING_HISTORY_DAYS = 366
+
+
+class FinanceViewSet(viewsets.ViewSet):
+    """
+    Read-only financial reports of a school.
+    """
+    permission_classes = [IsAuthenticated, IsManagerOrStaff]
+
+    def get_school(self):
+        """
+        Managers always get their own school.
+        Staff users pick one with ?school=<id>.
+        """
+        user = self.request.user
+        school_id = self.request.query_params.get("school")
+        if user.is_staff and school_id:
+            return get_object_or_404(School, pk=school_id)
+        return get_object_or_404(School, manager__user=user)
+
+    @extend_schema(
+        tags=["Finance"],
+        summary="Monthly profit and loss of a school",
+        description=(
+            "Income, salary cost and expenses per month, oldest first, read from the monthly ledger.\n\n"
+            "- **Managers**: Their own school.\n"
+            "- **Admins**: Any school via `?school=<id>`."
+        ),
+        parameters=[
+            OpenApiParameter("months", int, description=f"Number of months to return (1-{MAX_DASHBOARD_MONTHS}, default 12)."),
+            OpenApiParameter("school", int, description="School id (admins only)."),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        school = self.get_school()
+        months = parse_int_param(request.query_params, "months", 12, 1, MAX_DASHBOARD_MONTHS)
+
+        last = month_start(timezone.localdate())
+        first = add_months(last, -(months - 1))
+        ledgers = {
+            ledger.month: ledger
+            for ledger in SchoolMonthlyLedger.objects.filter(
+                school=school, month__gte=first, month__lte=last
+            )
+        }
+        series = [
+            ledgers.get(month) or SchoolMonthlyLedger(school=school, month=month)
+            for month in (add_months(first, offset) for offset in range(months))
+        ]
+
+        totals = {
+            "income": sum(ledger.income for ledger in series),
+            "salary_cost": sum(ledger.salary_cost for ledger in series),
+            "expense_total": sum(ledger.expense_total for ledger in series),
+        }
+        totals["net"] = totals["income"] - totals["salary_cost"] - totals["expense_total"]
+
+        return Response({
+            "school": school.id,
+            "months": SchoolMonthlyLedgerSerializer(series, many=True).data,
+            "totals": totals,
+        })
+
+    @extend_schema(
+        tags=["Finance"],
+        summary="Receivables aging report",
+        description=(
+            "Outstanding invoice amounts by days past due (not due, 0-30, 31-60, 61-90, 90+), "
+            "per team or per player, computed from live invoices and payments."
+        ),
+        parameters=[
+            OpenApiParameter("group_by", str, enum=["team", "player"], description="Grouping level (default team)."),
+            OpenApiParameter("school", int, description="School id (admins only)."),
+        ],
+        responses={200: AgingReportSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"])
+    def aging(self, request):
+        school = self.get_school()
+        group_by = request.query_params.get("group_by", "team")
+        if group_by not in ("team", "player"):
+            raise ValidationError({"group_by": "Must be 'team' or 'player'."})
+
+        rows = ReceivablesAgingSnapshot.report(timezone.localdate(), school_ids=[school.id], group_by=group_by)
+        return Response(AgingReportSerializer(rows, many=True).data)
+
+    @extend_schema(
+        tags=["Finance"],
+        summary="Receivables aging trend",
+        description="School totals per aging bucket for each stored daily snapshot, oldest first.",
+        parameters=[
+            OpenApiParameter("days", int, description=f"How many days back to read (1-{MAX_AGING_HISTORY_DAYS}, default 90)."),
+            OpenApiParameter("school", int, description="School id (admins only)."),
+        ],
+        responses={200: AgingHistorySerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="aging/history")
+    def aging_history(self, request):
+        school = self.get_school()
+        days = parse_int_param(request.query_params, "days", 90, 1, MAX_AGING_HISTORY_DAYS)
+
+        since = timezone.localdate() - timedelta(days=days)
+        rows = (
+            ReceivablesAgingSnapshot.objects.filter(school=school, date__gte=since)
+            .values("date")
+            .annotate(
+                total=Sum("total"),
+                **{bucket: Sum(bucket) for bucket in ReceivablesAgingSnapshot.BUCKETS},
+            )
+            .order_by("date")
+        )
+        return Response(AgingHistorySerializer(rows, many=True).data)
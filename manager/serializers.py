@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from account.serializers import UserSerializer
+from core.serializers import DynamicFieldsMixin
 from .models import Manager
 
-class ManagerSerializer(serializers.ModelSerializer):
+class ManagerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Manager
         fields = ['id', 'user', 'bank_account_number', 'created_at']
-        read_only_fields = ['id', 'created_at']
\ No newline at end of file
+        read_only_fields = ['id', 'created_at']
+        expandable_fields = {'user': (UserSerializer, {})}
\ No newline at end of file
@@ -1,6 +1,7 @@
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from core.mixins import SparseFieldsetMixin
 from .models import Manager
 from .serializers import ManagerSerializer
 
@@ -12,10 +13,12 @@ from .serializers import ManagerSerializer
     partial_update=extend_schema(summary="Partially update manager information", tags=["Managers"]),
     destroy=extend_schema(summary="Remove a manager from the system", tags=["Managers"]),
 )
-class ManagerViewSet(viewsets.ModelViewSet):
+class ManagerViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Manager.objects.all()
     serializer_class = ManagerSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
+    expand_related = {"user": "user__profile"}
 
     def get_queryset(self):
         user = self.request.user
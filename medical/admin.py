@@ -1,3 +1,10 @@
 from django.contrib import admin
+from .models import MedicalRecord
 
-# Register your models here.
+
+@admin.register(MedicalRecord)
+class MedicalRecordAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'diagnosed_date', 'recovery_date', 'is_active')
+    list_filter = ('is_active',)
+    list_select_related = ('player__user',)
+    raw_id_fields = ('player', 'training_session', 'created_by')
@@ -0,0 +1,51 @@
+from django.db.models import Q
+from django.utils import timezone
+
+from team.models import Team
+from .models import MedicalRecord
+
+AVAILABLE = "available"
+INJURED = "injured"
+
+
+def injuries_on(player_ids, day):
+    """
+    Active medical records of ``player_ids`` that cover ``day``, keyed by
+    player (the most recent diagnosis wins). One query on the partial index
+    over active records.
+    """
+    records = (
+        MedicalRecord.objects.filter(
+            is_active=True,
+            player_id__in=player_ids,
+            diagnosed_date__lte=day,
+        )
+        .filter(Q(recovery_date__isnull=True) | Q(recovery_date__gt=day))
+        .order_by("player_id", "diagnosed_date", "id")
+        .values("id", "player_id", "title", "diagnosed_date", "recovery_date")
+    )
+    return {record["player_id"]: record for record in records}
+
+
+def player_availability(player_ids, day=None):
+    """Availability of each player on ``day`` (default today) as ``{player_id: {...}}``."""
+    day = day or timezone.localdate()
+    injuries = injuries_on(player_ids, day)
+    availability = {}
+    for player_id in player_ids:
+        record = injuries.get(player_id)
+        availability[player_id] = {
+            "status": INJURED if record else AVAILABLE,
+            "medical_record": record and record["id"],
+            "title": record and record["title"],
+            "expected_return": record and record["recovery_date"],
+        }
+    return availability
+
+
+def team_availability(team_id, day=None):
+    """Availability of every player on a team's roster: two queries."""
+    player_ids = list(
+        Team.players.through.objects.filter(team_id=team_id).order_by("player_id").values_list("player_id", flat=True)
+    )
+    return player_availability(player_ids, day)
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('player', '0001_initial'),
+        ('training_session', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MedicalRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200, verbose_name='Title')),
+                ('description', models.TextField(verbose_name='Description')),
+                ('diagnosed_date', models.DateField(verbose_name='Diagnosed Date')),
+                ('recovery_date', models.DateField(blank=True, null=True, verbose_name='Recovery Date')),
+                ('psychologist_note', models.CharField(blank=True, max_length=500, verbose_name='Psychologist Note')),
+                ('doctor_name', models.CharField(max_length=100, verbose_name='Doctor Name')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Is Active')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('created_by', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_medical_records', to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='medical_records', related_query_name='medical_record', to='player.player', verbose_name='Player')),
+                ('training_session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='medical_records', to='training_session.trainingsession', verbose_name='Training Session')),
+            ],
+            options={
+                'verbose_name': 'Medical Record',
+                'verbose_name_plural': 'Medical Records',
+                'db_table': 'medical_records',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('medical', '0001_initial'),
+        ('player', '0001_initial'),
+        ('training_session', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='medicalrecord',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['player', 'diagnosed_date'], name='medical_active_player_idx'),
+        ),
+    ]
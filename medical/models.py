@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 
@@ -57,24 +58,23 @@ class MedicalRecord(models.Model):
         verbose_name_plural = "Medical Records"
         ordering = ['-created_at']
         db_table = 'medical_records'
+        indexes = [
+            # Availability lookups only ever read active records.
+            models.Index(fields=['player', 'diagnosed_date'], condition=Q(is_active=True),
+                         name='medical_active_player_idx'),
+        ]
 
     def __str__(self):
-        try:
-            if self.player and getattr(self.player, 'user', None):
-                username = getattr(self.player.user, 'username', None)
-                player_name = username or 'Unknown Player'
-            else:
-                player_name = 'Unknown Player'
-            return f"{player_name} - {self.title}"
-        except AttributeError:
-            return f"Unknown Player - {self.title}"
+        return f"{self.get_player_name()} - {self.title}"
 
     def get_player_name(self):
-        """Get the player's full name for display purposes"""
-        try:
-            if self.player and getattr(self.player, 'user', None):
-                username = getattr(self.player.user, 'username', None)
-                return username or 'Unknown Player'
-            return 'Unknown Player'
-        except AttributeError:
-            return 'Unknown Player'
+        """
+        Get the player's username for display purposes.
+        Only reads the player and user when they were loaded with the record
+        (select_related('player__user')); otherwise falls back to the id.
+        """
+        player = self._meta.get_field('player').get_cached_value(self, default=None)
+        user = player._meta.get_field('user').get_cached_value(player, default=None) if player else None
+        if user is not None:
+            return user.username or 'Unknown Player'
+        return f"Player #{self.player_id}" if self.player_id else 'Unknown Player'
@@ -0,0 +1,52 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+
+from attendance.serializers import can_record_for_session
+from team.models import Team
+from training_session.models import TrainingSession
+from .models import MedicalRecord
+
+
+class MedicalRecordSerializer(serializers.ModelSerializer):
+    training_session = serializers.PrimaryKeyRelatedField(
+        queryset=TrainingSession.objects.select_related("team__coach", "team__school__manager")
+    )
+
+    class Meta:
+        model = MedicalRecord
+        fields = [
+            "id",
+            "player",
+            "training_session",
+            "title",
+            "description",
+            "diagnosed_date",
+            "recovery_date",
+            "psychologist_note",
+            "doctor_name",
+            "is_active",
+            "created_by",
+            "created_at",
+        ]
+        read_only_fields = ["id", "created_by", "created_at"]
+
+    def validate_training_session(self, session):
+        if not can_record_for_session(self.context["request"].user, session):
+            raise serializers.ValidationError("You can only add medical records for your own teams.")
+        return session
+
+    def validate(self, data):
+        session = data.get("training_session", getattr(self.instance, "training_session", None))
+        player = data.get("player", getattr(self.instance, "player", None))
+        if not Team.players.through.objects.filter(team_id=session.team_id, player_id=player.pk).exists():
+            raise serializers.ValidationError("Player is not on the session's team.")
+
+        fields = {
+            name: data.get(name, getattr(self.instance, name, None))
+            for name in ("diagnosed_date", "recovery_date")
+        }
+        try:
+            MedicalRecord(**fields).clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+        return data
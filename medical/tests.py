@@ -1,3 +1,57 @@
+from datetime import date
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.testing import generate_dataset
+from school.models import School
+from team.models import Team
+from .models import MedicalRecord
+
+
+def add_record(player, session, diagnosed, recovery=None, is_active=True):
+    return MedicalRecord.objects.create(
+        player=player, training_session=session, title="Sprained ankle", description="Left ankle",
+        diagnosed_date=diagnosed, recovery_date=recovery, doctor_name="Dr. Karimi", is_active=is_active,
+    )
+
+
+class AvailabilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.manager_user = School.objects.select_related("manager__user").get().manager.user
+        cls.team = Team.objects.get()
+        cls.player, *cls.others = cls.team.players.order_by("pk")
+        cls.session = cls.team.training_sessions.order_by("pk").first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager_user)
+
+    def availability(self, day):
+        response = self.client.get(f"/api/medical-records/availability/?team={self.team.pk}&date={day}")
+        self.assertEqual(response.status_code, 200)
+        return {entry["player"]: entry for entry in response.data["players"]}
+
+    def test_active_record_covering_the_day(self):
+        record = add_record(self.player, self.session, date(2024, 2, 20), date(2024, 3, 10))
+        players = self.availability("2024-02-29")
+
+        self.assertEqual(players[self.player.pk]["status"], "injured")
+        self.assertEqual(players[self.player.pk]["medical_record"], record.pk)
+        self.assertEqual(players[self.player.pk]["expected_return"], date(2024, 3, 10))
+        self.assertEqual({players[other.pk]["status"] for other in self.others}, {"available"})
+
+    def test_recovered_or_closed_records(self):
+        add_record(self.player, self.session, date(2024, 2, 1), date(2024, 2, 20))
+        add_record(self.others[0], self.session, date(2024, 2, 1), is_active=False)
+        # Not diagnosed yet on the day asked for.
+        add_record(self.others[1], self.session, date(2024, 3, 1))
+        players = self.availability("2024-02-29")
+
+        self.assertEqual({entry["status"] for entry in players.values()}, {"available"})
 
-# Create your tests here.
+    def test_impossible_date_is_rejected(self):
+        response = self.client.get(f"/api/medical-records/availability/?team={self.team.pk}&date=2024-02-30")
+        self.assertEqual(response.status_code, 400)
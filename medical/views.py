@@ -1,3 +1,109 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from rest_framework import mixins, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 
-# Create your views here.
+from attendance.serializers import can_record_for_team
+from core.mixins import IdempotentCreateMixin
+from core.params import parse_date_param, parse_id_param
+from team.models import Team
+from training_session.models import TrainingSession
+from .availability import team_availability
+from .models import MedicalRecord
+from .serializers import MedicalRecordSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List medical records",
+        tags=["Medical"],
+        parameters=[
+            OpenApiParameter("player", int),
+            OpenApiParameter("training_session", int),
+            OpenApiParameter("is_active", bool),
+        ],
+    ),
+    retrieve=extend_schema(summary="Retrieve a medical record", tags=["Medical"]),
+    create=extend_schema(
+        summary="Add a medical record",
+        description=(
+            "Send an `Idempotency-Key` header to make retries safe: a repeated request with the same key "
+            "returns the first response and creates nothing."
+        ),
+        tags=["Medical"],
+    ),
+)
+class MedicalRecordViewSet(IdempotentCreateMixin, mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                           mixins.CreateModelMixin, viewsets.GenericViewSet):
+    """
+    - **Coaches**: Records of their teams' sessions.
+    - **Managers**: Records of their school's sessions.
+    - **Admins**: All records.
+    """
+    serializer_class = MedicalRecordSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = {"list": 3, "availability": 5}
+    cursor_ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = MedicalRecord.objects.all()
+        if user.is_superuser:
+            pass
+        elif user.role == user.COACH:
+            queryset = queryset.filter(training_session__team__coach__user=user)
+        elif user.role == user.MANAGER:
+            queryset = queryset.filter(training_session__team__school__manager__user=user)
+        else:
+            return queryset.none()
+
+        params = self.request.query_params
+        player_id = parse_id_param(params, "player")
+        if player_id is not None:
+            queryset = queryset.filter(player_id=player_id)
+        session_id = parse_id_param(params, "training_session")
+        if session_id is not None:
+            queryset = queryset.filter(training_session_id=session_id)
+        if params.get("is_active") in ("true", "false"):
+            queryset = queryset.filter(is_active=params["is_active"] == "true")
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    @extend_schema(
+        summary="Player availability of a team",
+        description=(
+            "Each player on the roster of `team` (or of the team of `training_session`) with status "
+            "`injured` when an active medical record covers `date`, otherwise `available`."
+        ),
+        tags=["Medical"],
+        parameters=[
+            OpenApiParameter("team", int),
+            OpenApiParameter("training_session", int),
+            OpenApiParameter("date", str, description="Day to check (YYYY-MM-DD, default today)."),
+        ],
+    )
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        params = request.query_params
+        teams = Team.objects.select_related("coach", "school__manager")
+        session_id, team_id = parse_id_param(params, "training_session"), parse_id_param(params, "team")
+        if session_id is not None:
+            session = get_object_or_404(TrainingSession.objects.only("team_id"), pk=session_id)
+            team = get_object_or_404(teams, pk=session.team_id)
+        elif team_id is not None:
+            team = get_object_or_404(teams, pk=team_id)
+        else:
+            raise ValidationError({"team": "Pass team or training_session."})
+        if not can_record_for_team(request.user, team):
+            raise PermissionDenied("You can only see availability of your own teams.")
+
+        day = parse_date_param(params, "date")
+        availability = team_availability(team.pk, day)
+        return Response({
+            "team": team.pk,
+            "players": [{"player": player_id, **state} for player_id, state in availability.items()],
+        })
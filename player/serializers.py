@@ -1,7 +1,16 @@
 from rest_framework import serializers
+from account.serializers import UserSerializer
+from core.serializers import DynamicFieldsMixin
+from manager.serializers import ManagerSerializer
+from school.serializers import SchoolSerializer
 from .models import Player
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Player
-        fields = ["id", "user", "school", "jersey_number", "manager"]
\ No newline at end of file
+        fields = ["id", "user", "school", "jersey_number", "manager"]
+        expandable_fields = {
+            "user": (UserSerializer, {}),
+            "school": (SchoolSerializer, {}),
+            "manager": (ManagerSerializer, {}),
+        }
\ No newline at end of file
@@ -1,3 +1,42 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core import cache
+from core.testing import generate_dataset
+from school.models import School
+from .models import Player
+
+
+class PlayerCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.manager_user = School.objects.select_related("manager__user").get().manager.user
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager_user)
+
+    def test_expanded_user_edit_changes_etag(self):
+        first = self.client.get("/api/players/?expand=user")
+        self.assertEqual(first.status_code, 200)
+
+        user = Player.objects.select_related("user").order_by("pk").first().user
+        user.first_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+
+        response = self.client.get("/api/players/?expand=user", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertIn("Renamed", [player["user"]["first_name"] for player in response.data["results"]])
+
+    def test_version_bumps_after_commit(self):
+        version = cache.get_data_version(cache.ALL_SCHOOLS)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Player.objects.first().save()
+            self.assertEqual(cache.get_data_version(cache.ALL_SCHOOLS), version)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(cache.get_data_version(cache.ALL_SCHOOLS), version)
@@ -4,6 +4,7 @@ from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
 from drf_spectacular.utils import extend_schema, extend_schema_view
 
+from core.mixins import CachedResponseMixin, ConditionalGetMixin, SparseFieldsetMixin
 from school.models import School
 from .models import Player
 from .permissions import IsManagerOrReadOnly
@@ -19,19 +20,23 @@ from .serializers import PlayerSerializer
         "- **Admins**: Can see all players."
     ),
 )
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     DRF viewset to handle CRUD operations for players with proper permissions.
     """
     serializer_class = PlayerSerializer
     permission_classes = [IsManagerOrReadOnly]
+    query_budget = {"list": 4}
+    cursor_ordering = "-id"
+    expand_related = {"user": "user__profile", "school": "school__manager", "manager": "manager"}
+    cached_actions = ("list",)
 
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser:
-            return Player.objects.select_related('user', 'manager', 'school').all()
+            return Player.objects.all()
         if user.role == user.MANAGER:
-            return Player.objects.select_related('user', 'manager', 'school').filter(manager__user=user)
+            return Player.objects.filter(manager__user=user)
         return Player.objects.none()
 
     def perform_create(self, serializer):
@@ -62,19 +67,21 @@ class PlayerViewSet(viewsets.ModelViewSet):
     summary="List players of a school",
     description="Retrieve all players in the manager's school.\n\n- Managers: Only their school.\n- Admins: Can see all schools."
 )
-class SchoolPlayerListAPIView(generics.ListAPIView):
+class SchoolPlayerListAPIView(SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = PlayerSerializer
     permission_classes = [IsAuthenticated]
+    cursor_ordering = "-id"
+    expand_related = {"user": "user__profile", "school": "school__manager", "manager": "manager"}
 
     def get_queryset(self):
         user = self.request.user
 
         # Admin can see all
         if user.is_superuser:
-            return Player.objects.select_related('user', 'manager', 'school').all()
+            return Player.objects.all()
 
         # Manager sees only their school's players
         if user.role == user.MANAGER:
-            return Player.objects.select_related('user', 'manager', 'school').filter(manager__user=user)
+            return Player.objects.filter(manager__user=user)
 
         return Player.objects.none()
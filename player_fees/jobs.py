@@ -0,0 +1,11 @@
+from core.jobs import job
+
+from .models import PlayerInvoice
+
+
+@job("player_fees.update_invoice_status", priority=10)
+def update_invoice_status(invoice_id):
+    """Recompute the status of an invoice after its payments changed."""
+    invoice = PlayerInvoice.objects.filter(pk=invoice_id).first()
+    if invoice is not None:
+        invoice.update_status()
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('player', '0001_initial'),
+        ('team', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerInvoice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.BigIntegerField(help_text='Total invoice amount in Toman', verbose_name='Total Amount')),
+                ('issued_date', models.DateField(default=django.utils.timezone.localdate, verbose_name='Issued Date')),
+                ('due_date', models.DateField(verbose_name='Due Date')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('paid', 'Paid'), ('overdue', 'Overdue'), ('cancelled', 'Cancelled')], default='pending', max_length=20, verbose_name='Status')),
+                ('description', models.TextField(blank=True, help_text='Additional notes about the invoice', null=True, verbose_name='Description')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to='player.player', verbose_name='Player')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='invoices', to='team.team', verbose_name='Team')),
+            ],
+            options={
+                'verbose_name': 'Player Invoice',
+                'verbose_name_plural': 'Player Invoices',
+                'ordering': ['-issued_date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PlayerFeePayment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.BigIntegerField(verbose_name='Amount')),
+                ('paid_at', models.DateTimeField(auto_now_add=True, verbose_name='Paid At')),
+                ('receipt_number', models.CharField(blank=True, max_length=255, verbose_name='Receipt Number')),
+                ('note', models.TextField(blank=True, verbose_name='Note')),
+                ('method', models.CharField(choices=[('cash', 'Cash'), ('online', 'Online')], max_length=10, verbose_name='Payment Method')),
+                ('date', models.DateField(default=django.utils.timezone.now, verbose_name='Date')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Created By')),
+                ('invoice', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='player_fees.playerinvoice', verbose_name='Invoice')),
+            ],
+            options={
+                'verbose_name': 'Fee Payment',
+                'verbose_name_plural': 'Fee Payments',
+                'ordering': ('-paid_at',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='playerinvoice',
+            index=models.Index(fields=['status', 'due_date'], name='player_fees_status_d19227_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerinvoice',
+            index=models.Index(fields=['player', 'status'], name='player_fees_player__cd6c86_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerinvoice',
+            index=models.Index(fields=['issued_date'], name='player_fees_issued__28d52c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='playerfeepayment',
+            index=models.Index(fields=['date'], name='player_fees_date_70ac04_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('player_fees', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='playerfeepayment',
+            name='date',
+            field=models.DateField(default=django.utils.timezone.localdate, verbose_name='Date'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Coalesce, Greatest
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
@@ -9,6 +10,27 @@ from team.models import Team
 
 User = get_user_model()
 
+
+class PlayerInvoiceQuerySet(models.QuerySet):
+    def with_balances(self):
+        """
+        Annotate ``paid`` and ``outstanding`` in SQL so lists and reports
+        do not run one aggregate per invoice through ``total_paid``.
+        """
+        paid = (
+            PlayerFeePayment.objects.filter(invoice=models.OuterRef('pk'))
+            .order_by()
+            .values('invoice')
+            .annotate(total=models.Sum('amount'))
+            .values('total')
+        )
+        return self.annotate(
+            paid=Coalesce(models.Subquery(paid), 0, output_field=models.BigIntegerField()),
+        ).annotate(
+            outstanding=Greatest(models.F('amount') - models.F('paid'), 0, output_field=models.BigIntegerField()),
+        )
+
+
 class PlayerInvoice(models.Model):
     """Represents an invoice issued to a player for football school fees."""
 
@@ -32,6 +54,8 @@ class PlayerInvoice(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name="Status")
     description = models.TextField(blank=True, null=True, verbose_name="Description", help_text="Additional notes about the invoice")
 
+    objects = PlayerInvoiceQuerySet.as_manager()
+
     class Meta:
         ordering = ['-issued_date']
         verbose_name = "Player Invoice"
@@ -89,14 +113,18 @@ class PlayerFeePayment(models.Model):
     note = models.TextField(blank=True, verbose_name="Note")
     method = models.CharField(max_length=10, choices=METHOD_CHOICES, verbose_name="Payment Method")
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="Created By")
-    date = models.DateField(default=timezone.now, verbose_name="Date")
+    date = models.DateField(default=timezone.localdate, verbose_name="Date")
 
     class Meta:
         ordering = ("-paid_at",)
         verbose_name = "Fee Payment"
         verbose_name_plural = "Fee Payments"
+        indexes = [
+            models.Index(fields=['date']),
+        ]
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
-        if self.invoice:
-            self.invoice.update_status()
+        if self.invoice_id:
+            from .jobs import update_invoice_status
+            update_invoice_status.enqueue(invoice_id=self.invoice_id, using=self._state.db)
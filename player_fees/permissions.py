@@ -0,0 +1,21 @@
+from rest_framework import permissions
+
+
+class IsSchoolManagerOrReadOnly(permissions.IsAuthenticated):
+    """
+    Invoices and payments are written by the manager of the team's school.
+    Anyone who can see them (their own player, the manager, admins) may read them.
+    """
+
+    def has_permission(self, request, view):
+        if not super().has_permission(request, view):
+            return False
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return request.user.is_superuser or hasattr(request.user, "manager")
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS or request.user.is_superuser:
+            return True
+        invoice = getattr(obj, "invoice", obj)
+        return invoice.team.school.manager.user_id == request.user.id
@@ -0,0 +1,88 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from .models import PlayerInvoice, PlayerFeePayment
+
+
+class PlayerInvoiceSerializer(serializers.ModelSerializer):
+    """
+    paid/outstanding come from the with_balances() annotations when the
+    invoice was loaded through the viewset queryset.
+    """
+    player_username = serializers.CharField(source="player.user.username", read_only=True)
+    team_name = serializers.CharField(source="team.name", read_only=True)
+    paid = serializers.SerializerMethodField()
+    outstanding = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PlayerInvoice
+        fields = [
+            "id",
+            "player",
+            "player_username",
+            "team",
+            "team_name",
+            "amount",
+            "paid",
+            "outstanding",
+            "issued_date",
+            "due_date",
+            "status",
+            "description",
+        ]
+        read_only_fields = ["id", "status"]
+
+    def get_paid(self, obj):
+        return obj.paid if hasattr(obj, "paid") else obj.total_paid
+
+    def get_outstanding(self, obj):
+        return obj.outstanding if hasattr(obj, "outstanding") else obj.outstanding_amount
+
+    def validate(self, data):
+        user = self.context["request"].user
+        team = data.get("team", getattr(self.instance, "team", None))
+        player = data.get("player", getattr(self.instance, "player", None))
+
+        if not user.is_superuser and team.school.manager.user_id != user.id:
+            raise serializers.ValidationError("You can only invoice teams of your own school.")
+        if player.school_id != team.school_id:
+            raise serializers.ValidationError("Player does not belong to the team's school.")
+
+        fields = {
+            name: data.get(name, getattr(self.instance, name, None))
+            for name in ("amount", "issued_date", "due_date")
+        }
+        try:
+            PlayerInvoice(**{k: v for k, v in fields.items() if v is not None}).clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+        return data
+
+
+class PlayerFeePaymentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PlayerFeePayment
+        fields = [
+            "id",
+            "invoice",
+            "amount",
+            "method",
+            "receipt_number",
+            "note",
+            "date",
+            "paid_at",
+            "created_by",
+        ]
+        read_only_fields = ["id", "paid_at", "created_by"]
+
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Payment amount must be positive.")
+        return value
+
+    def validate_invoice(self, invoice):
+        user = self.context["request"].user
+        if not user.is_superuser and invoice.team.school.manager.user_id != user.id:
+            raise serializers.ValidationError("You can only record payments for your own school.")
+        if invoice.status == PlayerInvoice.STATUS_CANCELLED:
+            raise serializers.ValidationError("Cannot pay a cancelled invoice.")
+        return invoice
@@ -1,3 +1,107 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core.models import Job
+from core.testing import generate_dataset
+from player.models import Player
+from school.models import School
+from team.models import Team
+from .models import PlayerFeePayment, PlayerInvoice
+
+
+class InvoiceAPITests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(schools=2, invoices=2)
+        cls.school, cls.other_school = School.objects.select_related("manager__user").order_by("id")
+        cls.team = Team.objects.filter(school=cls.school).get()
+        cls.other_team = Team.objects.filter(school=cls.other_school).get()
+        cls.player = Player.objects.filter(school=cls.school).select_related("user").order_by("id").first()
+        cls.invoice = PlayerInvoice.objects.filter(player=cls.player).order_by("id").first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.school.manager.user)
+
+    def list_invoices(self, query=""):
+        response = self.client.get(f"/api/invoices/{query}")
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data["results"]
+
+    def pay(self, invoice, amount):
+        response = self.client.post("/api/fee-payments/", {"invoice": invoice.pk, "amount": amount, "method": "cash"})
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data
+
+    def test_balances_match_the_payments(self):
+        PlayerFeePayment.objects.filter(invoice=self.invoice).delete()
+        PlayerFeePayment.objects.bulk_create([
+            PlayerFeePayment(invoice=self.invoice, amount=100_000, method="cash"),
+            PlayerFeePayment(invoice=self.invoice, amount=50_000, method="online"),
+        ])
+        overpaid = PlayerInvoice.objects.filter(team=self.team).exclude(pk=self.invoice.pk).order_by("id").first()
+        PlayerFeePayment.objects.create(invoice=overpaid, amount=overpaid.amount + 1, method="cash")
+
+        invoices = self.list_invoices()
+        self.assertEqual(len(invoices), PlayerInvoice.objects.filter(team__school=self.school).count())
+        for row in invoices:
+            invoice = PlayerInvoice.objects.get(pk=row["id"])
+            self.assertEqual((row["paid"], row["outstanding"]), (invoice.total_paid, invoice.outstanding_amount))
+        rows = {row["id"]: row for row in invoices}
+        self.assertEqual((rows[self.invoice.pk]["paid"], rows[self.invoice.pk]["outstanding"]),
+                         (150_000, self.invoice.amount - 150_000))
+        self.assertEqual(rows[overpaid.pk]["outstanding"], 0)
+
+    def test_payment_enqueues_a_status_update(self):
+        PlayerFeePayment.objects.filter(invoice=self.invoice).delete()
+        PlayerInvoice.objects.filter(pk=self.invoice.pk).update(status=PlayerInvoice.STATUS_PENDING)
+
+        self.pay(self.invoice, self.invoice.amount)
+        job = Job.objects.get(name="player_fees.update_invoice_status")
+        self.assertEqual(job.payload, {"invoice_id": self.invoice.pk})
+        # The view only queues the job: the status changes when it runs.
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, PlayerInvoice.STATUS_PENDING)
+
+        with override_settings(JOB_RUN_EAGERLY=True), self.captureOnCommitCallbacks(execute=True):
+            payment = self.pay(self.invoice, 1)
+        self.invoice.refresh_from_db()
+        self.assertEqual(self.invoice.status, PlayerInvoice.STATUS_PAID)
+
+        response = self.client.delete(f"/api/fee-payments/{payment['id']}/")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(Job.objects.filter(name="player_fees.update_invoice_status", status=Job.QUEUED).count(), 2)
+
+    def test_manager_cannot_invoice_another_school(self):
+        other_player = Player.objects.filter(school=self.other_school).order_by("id").first()
+        data = {"player": other_player.pk, "team": self.other_team.pk, "amount": 1_000_000,
+                "issued_date": "2024-03-01", "due_date": "2024-03-10"}
+        response = self.client.post("/api/invoices/", data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["non_field_errors"], ["You can only invoice teams of your own school."])
+
+        response = self.client.post("/api/invoices/", {**data, "team": self.team.pk})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["non_field_errors"], ["Player does not belong to the team's school."])
+
+        response = self.client.post("/api/invoices/", {**data, "player": self.player.pk, "team": self.team.pk})
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.data["outstanding"], 1_000_000)
+
+        self.assertFalse({row["team"] for row in self.list_invoices()} - {self.team.pk})
+        self.assertEqual(self.list_invoices(f"?team={self.other_team.pk}"), [])
+
+    def test_player_reads_only_their_own_invoices(self):
+        self.client.force_authenticate(self.player.user)
+        invoices = self.list_invoices()
+        self.assertEqual({row["id"] for row in invoices},
+                         set(PlayerInvoice.objects.filter(player=self.player).values_list("id", flat=True)))
+
+        someone_else = PlayerInvoice.objects.filter(team=self.team).exclude(player=self.player).first()
+        self.assertEqual(self.client.get(f"/api/invoices/{someone_else.pk}/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/invoices/{self.invoice.pk}/").status_code, 200)
+
+        response = self.client.patch(f"/api/invoices/{self.invoice.pk}/", {"amount": 1})
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post("/api/fee-payments/", {"invoice": self.invoice.pk, "amount": 1, "method": "cash"})
+        self.assertEqual(response.status_code, 403)
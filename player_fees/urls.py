@@ -0,0 +1,8 @@
+from rest_framework.routers import DefaultRouter
+from .views import PlayerInvoiceViewSet, PlayerFeePaymentViewSet
+
+router = DefaultRouter()
+router.register(r"invoices", PlayerInvoiceViewSet, basename="invoice")
+router.register(r"fee-payments", PlayerFeePaymentViewSet, basename="fee-payment")
+
+urlpatterns = router.urls
@@ -1,3 +1,127 @@
-from django.shortcuts import render
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from rest_framework import viewsets
 
-# Create your views here.
+from core.params import parse_date_param, parse_id_param
+from .jobs import update_invoice_status
+from .models import PlayerInvoice, PlayerFeePayment
+from .permissions import IsSchoolManagerOrReadOnly
+from .serializers import PlayerInvoiceSerializer, PlayerFeePaymentSerializer
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List player invoices",
+        tags=["Player Fees"],
+        parameters=[
+            OpenApiParameter("status", str, enum=[choice for choice, _ in PlayerInvoice.STATUS_CHOICES]),
+            OpenApiParameter("due_before", str, description="Due on or before this date (YYYY-MM-DD)."),
+            OpenApiParameter("due_after", str, description="Due on or after this date (YYYY-MM-DD)."),
+            OpenApiParameter("player", int),
+            OpenApiParameter("team", int),
+        ],
+    ),
+    retrieve=extend_schema(summary="Retrieve a player invoice", tags=["Player Fees"]),
+    create=extend_schema(summary="Issue an invoice to a player", tags=["Player Fees"]),
+    update=extend_schema(summary="Update an invoice", tags=["Player Fees"]),
+    partial_update=extend_schema(summary="Partially update an invoice", tags=["Player Fees"]),
+    destroy=extend_schema(summary="Delete an invoice", tags=["Player Fees"]),
+)
+class PlayerInvoiceViewSet(viewsets.ModelViewSet):
+    """
+    Invoices with paid and outstanding totals annotated in SQL.
+
+    - **Managers**: Invoices of their school's teams.
+    - **Players**: Their own invoices (read-only).
+    - **Admins**: All invoices.
+    """
+    serializer_class = PlayerInvoiceSerializer
+    permission_classes = [IsSchoolManagerOrReadOnly]
+    query_budget = {"list": 3}
+    cursor_ordering = ("-issued_date", "-id")
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = PlayerInvoice.objects.select_related("player__user", "team").with_balances()
+
+        if user.is_superuser:
+            pass
+        elif user.role == user.MANAGER:
+            queryset = queryset.filter(team__school__manager__user=user)
+        elif user.role == user.PLAYER:
+            queryset = queryset.filter(player__user=user)
+        else:
+            return queryset.none()
+
+        params = self.request.query_params
+        # status + due date ranges use the (status, due_date) index,
+        # player + status the (player, status) index.
+        if params.get("status"):
+            queryset = queryset.filter(status=params["status"])
+        due_after = parse_date_param(params, "due_after")
+        if due_after:
+            queryset = queryset.filter(due_date__gte=due_after)
+        due_before = parse_date_param(params, "due_before")
+        if due_before:
+            queryset = queryset.filter(due_date__lte=due_before)
+        player_id = parse_id_param(params, "player")
+        if player_id is not None:
+            queryset = queryset.filter(player_id=player_id)
+        team_id = parse_id_param(params, "team")
+        if team_id is not None:
+            queryset = queryset.filter(team_id=team_id)
+        return queryset
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="List fee payments",
+        tags=["Player Fees"],
+        parameters=[
+            OpenApiParameter("invoice", int),
+            OpenApiParameter("method", str, enum=[choice for choice, _ in PlayerFeePayment.METHOD_CHOICES]),
+        ],
+    ),
+    retrieve=extend_schema(summary="Retrieve a fee payment", tags=["Player Fees"]),
+    create=extend_schema(summary="Record a fee payment", tags=["Player Fees"]),
+    update=extend_schema(summary="Update a fee payment", tags=["Player Fees"]),
+    partial_update=extend_schema(summary="Partially update a fee payment", tags=["Player Fees"]),
+    destroy=extend_schema(summary="Delete a fee payment", tags=["Player Fees"]),
+)
+class PlayerFeePaymentViewSet(viewsets.ModelViewSet):
+    """
+    Payments against player invoices. Saving or deleting a payment
+    queues a recomputation of the invoice status (a background job).
+    """
+    serializer_class = PlayerFeePaymentSerializer
+    permission_classes = [IsSchoolManagerOrReadOnly]
+    query_budget = {"list": 3}
+    cursor_ordering = ("-paid_at", "-id")
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = PlayerFeePayment.objects.select_related("invoice__team")
+
+        if user.is_superuser:
+            pass
+        elif user.role == user.MANAGER:
+            queryset = queryset.filter(invoice__team__school__manager__user=user)
+        elif user.role == user.PLAYER:
+            queryset = queryset.filter(invoice__player__user=user)
+        else:
+            return queryset.none()
+
+        params = self.request.query_params
+        invoice_id = parse_id_param(params, "invoice")
+        if invoice_id is not None:
+            queryset = queryset.filter(invoice_id=invoice_id)
+        if params.get("method"):
+            queryset = queryset.filter(method=params["method"])
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(created_by=self.request.user)
+
+    def perform_destroy(self, instance):
+        invoice_id, using = instance.invoice_id, instance._state.db
+        instance.delete()
+        update_invoice_status.enqueue(invoice_id=invoice_id, using=using)
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('manager', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='School',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, validators=[django.core.validators.MinLengthValidator(2)], verbose_name='School Name')),
+                ('address', models.TextField(verbose_name='Address')),
+                ('email', models.EmailField(max_length=254, unique=True, verbose_name='Official Email')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Is Active')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('manager', models.OneToOneField(on_delete=django.db.models.deletion.PROTECT, related_name='school', to='manager.manager')),
+            ],
+            options={
+                'verbose_name': 'School',
+                'verbose_name_plural': 'Schools',
+                'ordering': ['-is_active', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Semester',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='semesters', to='school.school')),
+            ],
+            options={
+                'ordering': ['-start_date'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='school',
+            index=models.Index(fields=['email'], name='school_scho_email_678939_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='school',
+            index=models.Index(fields=['is_active'], name='school_scho_is_acti_3637d4_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='semester',
+            constraint=models.UniqueConstraint(fields=('name', 'school'), name='unique_team_name_per_school'),
+        ),
+    ]
@@ -1,10 +1,11 @@
 from rest_framework import serializers
+from core.serializers import DynamicFieldsMixin
 from .models import School
 from manager.models import Manager
 from manager.serializers import ManagerSerializer
 
 
-class SchoolSerializer(serializers.ModelSerializer):
+class SchoolSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     manager = ManagerSerializer(read_only=True)
     manager_id = serializers.PrimaryKeyRelatedField(
         queryset=Manager.objects.all(),
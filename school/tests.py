@@ -1,3 +1,34 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from core import cache
+from core.testing import generate_dataset
+from .models import School
+
+
+class SchoolCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset()
+        cls.manager = School.objects.select_related("manager__user").get().manager
+
+    def setUp(self):
+        cache.get_cache().clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.manager.user)
+
+    def test_manager_edit_changes_etag(self):
+        first = self.client.get("/api/schools/")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.client.get("/api/schools/")["X-Cache"], "HIT")
+
+        sheba = "IR" + "1" * 24
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f"/api/managers/{self.manager.pk}/", {"bank_account_number": sheba})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get("/api/schools/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], first["ETag"])
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["manager"]["bank_account_number"], sheba)
@@ -1,6 +1,7 @@
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
+from core.mixins import CachedResponseMixin, ConditionalGetMixin, SparseFieldsetMixin
 from .permissions import IsSchoolManager
 from .models import School
 from .serializers import SchoolSerializer
@@ -16,12 +17,14 @@ from .serializers import SchoolSerializer
     ),
     responses={200: SchoolSerializer(many=True)},
 )
-class SchoolViewSet(viewsets.ModelViewSet):
+class SchoolViewSet(ConditionalGetMixin, CachedResponseMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing Schools.
     """
     serializer_class = SchoolSerializer
     permission_classes = [IsAuthenticated, IsSchoolManager]
+    cursor_ordering = ("-created_at", "-id")
+    expand_related = {"manager": "manager"}
 
     def get_queryset(self):
         """
@@ -29,7 +32,7 @@ class SchoolViewSet(viewsets.ModelViewSet):
         Admins see all schools.
         """
         user = self.request.user
-        qs = School.objects.select_related("manager")
+        qs = School.objects.all()
 
         if user.is_superuser:  # allow admin full access
             return qs
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import ChangeLogEntry, ChangeLogCompaction
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'team_id', 'model', 'object_id', 'action', 'created_at')
+    list_filter = ('model', 'action')
+
+
+admin.site.register(ChangeLogCompaction)
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from sync.models import ChangeLogCompaction
+
+
+class Command(BaseCommand):
+    help = "Remove superseded and expired change log entries. Meant to run once a day."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Keep entries of the last N days (default 30). Clients that did not sync "
+                 "within that window do a full fetch.",
+        )
+
+    def handle(self, *args, **options):
+        if options["days"] < 1:
+            raise CommandError("--days must be at least 1.")
+
+        compaction = ChangeLogCompaction.compact(timezone.now() - timedelta(days=options["days"]))
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {compaction.removed} entries; horizon is #{compaction.compacted_through}."
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogCompaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('compacted_through', models.BigIntegerField(verbose_name='Compacted Through')),
+                ('removed', models.PositiveIntegerField(default=0, verbose_name='Removed Entries')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Change Log Compaction',
+                'verbose_name_plural': 'Change Log Compactions',
+                'ordering': ['-compacted_through'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_id', models.BigIntegerField(verbose_name='Team')),
+                ('model', models.CharField(choices=[('team', 'Team'), ('player', 'Player'), ('roster', 'Roster membership'), ('training_session', 'Training Session'), ('attendance', 'Attendance'), ('medical_record', 'Medical Record')], max_length=20, verbose_name='Model')),
+                ('object_id', models.BigIntegerField(verbose_name='Object ID')),
+                ('action', models.CharField(choices=[('upsert', 'Created or updated'), ('delete', 'Deleted')], max_length=10, verbose_name='Action')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+            ],
+            options={
+                'verbose_name': 'Change Log Entry',
+                'verbose_name_plural': 'Change Log Entries',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['team_id', 'id'], name='sync_change_team_id_9126f2_idx'), models.Index(fields=['created_at'], name='sync_change_created_2ea12c_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,118 @@
+from django.db import models, transaction
+from django.db.models import Max
+
+
+class ChangeLogEntry(models.Model):
+    """
+    Append-only record of a change visible to a team's coach.
+
+    The primary key doubles as the sync sequence: it only grows, so
+    ``id > cursor`` is exactly what a client has not seen yet. A change
+    that concerns several teams (a player on two rosters) gets one entry
+    per team.
+    """
+
+    TEAM = "team"
+    PLAYER = "player"
+    ROSTER = "roster"
+    TRAINING_SESSION = "training_session"
+    ATTENDANCE = "attendance"
+    MEDICAL_RECORD = "medical_record"
+
+    MODEL_CHOICES = [
+        (TEAM, "Team"),
+        (PLAYER, "Player"),
+        (ROSTER, "Roster membership"),
+        (TRAINING_SESSION, "Training Session"),
+        (ATTENDANCE, "Attendance"),
+        (MEDICAL_RECORD, "Medical Record"),
+    ]
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+    ACTION_CHOICES = [(UPSERT, "Created or updated"), (DELETE, "Deleted")]
+
+    # Plain ids rather than foreign keys: entries must outlive the rows they describe.
+    team_id = models.BigIntegerField(verbose_name="Team")
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES, verbose_name="Model")
+    object_id = models.BigIntegerField(verbose_name="Object ID")
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, verbose_name="Action")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Change Log Entry"
+        verbose_name_plural = "Change Log Entries"
+        indexes = [
+            models.Index(fields=['team_id', 'id']),
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.action} {self.model} {self.object_id} (team {self.team_id})"
+
+    @classmethod
+    def record(cls, model, object_id, team_ids, action=UPSERT):
+        cls.objects.bulk_create([
+            cls(team_id=team_id, model=model, object_id=object_id, action=action)
+            for team_id in set(team_ids)
+            if team_id is not None
+        ])
+
+    @classmethod
+    def current_cursor(cls, horizon=None):
+        """
+        Cursor of a client that has seen everything: the last entry, or the
+        compaction horizon once compaction removed every entry up to it.
+        """
+        if horizon is None:
+            horizon = ChangeLogCompaction.horizon()
+        return max(cls.objects.aggregate(cursor=Max('id'))['cursor'] or 0, horizon)
+
+
+class ChangeLogCompaction(models.Model):
+    """
+    Compaction runs. Entries up to ``compacted_through`` may be gone, so a
+    client whose cursor is older has to start over with a full fetch.
+    """
+
+    compacted_through = models.BigIntegerField(verbose_name="Compacted Through")
+    removed = models.PositiveIntegerField(default=0, verbose_name="Removed Entries")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Created At")
+
+    class Meta:
+        ordering = ['-compacted_through']
+        verbose_name = "Change Log Compaction"
+        verbose_name_plural = "Change Log Compactions"
+
+    def __str__(self):
+        return f"Compacted through #{self.compacted_through}"
+
+    @classmethod
+    def horizon(cls):
+        return cls.objects.aggregate(horizon=Max('compacted_through'))['horizon'] or 0
+
+    @classmethod
+    def compact(cls, before):
+        """
+        Drop log entries that no client needs.
+
+        Entries superseded by a later entry for the same object and team are
+        always removed: sync answers with current rows, so only the last one
+        matters. Entries created before ``before`` are removed as well, which
+        moves the horizon and makes clients behind it start over.
+        """
+        with transaction.atomic():
+            latest_ids = (
+                ChangeLogEntry.objects.values('team_id', 'model', 'object_id')
+                .annotate(latest=Max('id'))
+                .values('latest')
+            )
+            superseded, _ = ChangeLogEntry.objects.exclude(id__in=latest_ids).delete()
+
+            expired = ChangeLogEntry.objects.filter(created_at__lt=before)
+            through = expired.aggregate(through=Max('id'))['through']
+            removed, _ = expired.delete()
+            if through is None:
+                through = cls.horizon()
+            return cls.objects.create(compacted_through=through, removed=superseded + removed)
@@ -0,0 +1,110 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from attendance.models import Attendance
+from medical.models import MedicalRecord
+from player.models import Player
+from team.models import Team
+from training_session.models import TrainingSession
+from .models import ChangeLogEntry
+
+# Entries are written on the connection of the change itself, so with
+# ATOMIC_REQUESTS (or any atomic block) they commit or roll back together.
+
+
+def _session_team_ids(training_session_id):
+    return TrainingSession.objects.filter(pk=training_session_id).values_list('team_id', flat=True)
+
+
+def _player_team_ids(player_id):
+    return Team.players.through.objects.filter(player_id=player_id).values_list('team_id', flat=True)
+
+
+@receiver(post_save, sender=Team)
+def log_team_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ChangeLogEntry.record(ChangeLogEntry.TEAM, instance.pk, [instance.pk])
+
+
+@receiver(post_delete, sender=Team)
+def log_team_deleted(sender, instance, **kwargs):
+    ChangeLogEntry.record(ChangeLogEntry.TEAM, instance.pk, [instance.pk], ChangeLogEntry.DELETE)
+
+
+@receiver(post_save, sender=Player)
+def log_player_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ChangeLogEntry.record(ChangeLogEntry.PLAYER, instance.pk, _player_team_ids(instance.pk))
+
+
+@receiver(pre_delete, sender=Player)
+def remember_player_teams(sender, instance, **kwargs):
+    # Roster rows are removed by the cascade before post_delete fires.
+    instance._sync_team_ids = list(_player_team_ids(instance.pk))
+
+
+@receiver(post_delete, sender=Player)
+def log_player_deleted(sender, instance, **kwargs):
+    ChangeLogEntry.record(
+        ChangeLogEntry.PLAYER, instance.pk, getattr(instance, '_sync_team_ids', ()), ChangeLogEntry.DELETE
+    )
+
+
+@receiver(m2m_changed, sender=Team.players.through)
+def log_roster_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_clear':
+        if reverse:
+            instance._sync_cleared = list(_player_team_ids(instance.pk))
+        else:
+            instance._sync_cleared = list(instance.players.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    entry_action = ChangeLogEntry.UPSERT if action == 'post_add' else ChangeLogEntry.DELETE
+    related_ids = getattr(instance, '_sync_cleared', ()) if action == 'post_clear' else pk_set
+    # Roster entries are keyed by player; forward changes come from the team side.
+    pairs = [(pk, instance.pk) for pk in related_ids] if reverse else [(instance.pk, pk) for pk in related_ids]
+    entries = [
+        ChangeLogEntry(team_id=team_id, model=ChangeLogEntry.ROSTER, object_id=player_id, action=entry_action)
+        for team_id, player_id in pairs
+    ]
+    if action == 'post_add':
+        # The player row is new to this team's coach as well.
+        entries += [
+            ChangeLogEntry(team_id=team_id, model=ChangeLogEntry.PLAYER, object_id=player_id, action=entry_action)
+            for team_id, player_id in pairs
+        ]
+    ChangeLogEntry.objects.bulk_create(entries)
+
+
+@receiver(post_save, sender=TrainingSession)
+def log_session_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        ChangeLogEntry.record(ChangeLogEntry.TRAINING_SESSION, instance.pk, [instance.team_id])
+
+
+@receiver(post_delete, sender=TrainingSession)
+def log_session_deleted(sender, instance, **kwargs):
+    ChangeLogEntry.record(ChangeLogEntry.TRAINING_SESSION, instance.pk, [instance.team_id], ChangeLogEntry.DELETE)
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_save, sender=MedicalRecord)
+def log_session_record_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        model = ChangeLogEntry.ATTENDANCE if sender is Attendance else ChangeLogEntry.MEDICAL_RECORD
+        ChangeLogEntry.record(model, instance.pk, _session_team_ids(instance.training_session_id))
+
+
+@receiver(pre_delete, sender=Attendance)
+@receiver(pre_delete, sender=MedicalRecord)
+def remember_session_record_teams(sender, instance, **kwargs):
+    instance._sync_team_ids = list(_session_team_ids(instance.training_session_id))
+
+
+@receiver(post_delete, sender=Attendance)
+@receiver(post_delete, sender=MedicalRecord)
+def log_session_record_deleted(sender, instance, **kwargs):
+    model = ChangeLogEntry.ATTENDANCE if sender is Attendance else ChangeLogEntry.MEDICAL_RECORD
+    ChangeLogEntry.record(model, instance.pk, getattr(instance, '_sync_team_ids', ()), ChangeLogEntry.DELETE)
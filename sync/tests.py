@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from coach.models import Coach
+from core.testing import generate_dataset
+from team.models import Team
+from training_session.models import TrainingSession
+from .models import ChangeLogCompaction, ChangeLogEntry
+
+
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # generate_dataset bypasses signals: the log starts empty.
+        generate_dataset(coaches=2, teams=2)
+        cls.coach, cls.other_coach = Coach.objects.select_related("user").order_by("id")
+        cls.team, cls.second_team = Team.objects.filter(coach=cls.coach).order_by("id")
+        cls.other_team = Team.objects.filter(coach=cls.other_coach).order_by("id").first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.coach.user)
+
+    def sync(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get("/api/sync/", params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_entry_commits_and_rolls_back_with_the_change(self):
+        with transaction.atomic():
+            self.team.name = "Renamed"
+            self.team.save()
+            self.assertTrue(ChangeLogEntry.objects.filter(model=ChangeLogEntry.TEAM, object_id=self.team.pk).exists())
+            transaction.set_rollback(True)
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+    def test_paging(self):
+        cursor = self.sync()["cursor"]
+        sessions = list(TrainingSession.objects.filter(team=self.team).order_by("id")[:3])
+        for session in sessions:
+            session.save()
+
+        first = self.sync(cursor, limit=2)
+        self.assertTrue(first["has_more"])
+        self.assertEqual([row["id"] for row in first["changes"]["training_session"]["upserts"]],
+                         [session.pk for session in sessions[:2]])
+
+        second = self.sync(first["cursor"], limit=2)
+        self.assertFalse(second["has_more"])
+        self.assertEqual([row["id"] for row in second["changes"]["training_session"]["upserts"]], [sessions[2].pk])
+        self.assertEqual(self.sync(second["cursor"]), {"cursor": second["cursor"], "reset": False,
+                                                       "has_more": False, "changes": {}})
+
+    def test_only_the_coach_teams_are_synced(self):
+        cursor = self.sync()["cursor"]
+        self.other_team.save()
+        self.assertEqual(self.sync(cursor)["changes"], {})
+
+        self.team.save()
+        changes = self.sync(cursor)["changes"]
+        self.assertEqual([row["id"] for row in changes["team"]["upserts"]], [self.team.pk])
+
+    def test_roster_add_and_remove(self):
+        cursor = self.sync()["cursor"]
+        player = self.second_team.players.order_by("id").first()
+
+        self.team.players.add(player)
+        added = self.sync(cursor)
+        self.assertEqual(added["changes"]["roster"]["upserts"], [{"team_id": self.team.pk, "player_id": player.pk}])
+        self.assertEqual([row["id"] for row in added["changes"]["player"]["upserts"]], [player.pk])
+
+        self.team.players.remove(player)
+        removed = self.sync(added["cursor"])
+        self.assertEqual(removed["changes"]["roster"]["deletes"], [{"team_id": self.team.pk, "player_id": player.pk}])
+
+    def test_cascaded_deletes(self):
+        cursor = self.sync()["cursor"]
+        session = TrainingSession.objects.filter(team=self.team, attendances__isnull=False).first()
+        session_id, attendance_ids = session.pk, sorted(session.attendances.values_list("id", flat=True))
+        session.delete()
+
+        changes = self.sync(cursor)["changes"]
+        self.assertEqual(changes["training_session"], {"upserts": [], "deletes": [session_id]})
+        self.assertEqual(changes["attendance"], {"upserts": [], "deletes": attendance_ids})
+
+    def test_compaction(self):
+        stale = self.sync()["cursor"]
+        self.team.save()
+        cursor = self.sync(stale)["cursor"]
+        ChangeLogCompaction.compact(before=timezone.now() + timedelta(seconds=1))
+        self.assertFalse(ChangeLogEntry.objects.exists())
+
+        # Up to date: no reset, however often the app asks.
+        for _ in range(3):
+            self.assertEqual(self.sync(cursor), {"cursor": cursor, "reset": False, "has_more": False, "changes": {}})
+
+        # Behind the horizon: one reset to a cursor that then sticks.
+        reset = self.sync(stale)
+        self.assertEqual((reset["reset"], reset["cursor"]), (True, cursor))
+        self.assertFalse(self.sync(reset["cursor"])["reset"])
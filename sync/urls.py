@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import SyncAPIView
+
+urlpatterns = [
+    path("sync/", SyncAPIView.as_view(), name="sync"),
+]
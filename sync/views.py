@@ -0,0 +1,142 @@
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from attendance.models import Attendance
+from core.params import parse_int_param
+from medical.models import MedicalRecord
+from player.models import Player
+from team.models import Team
+from training_session.models import TrainingSession
+from .models import ChangeLogCompaction, ChangeLogEntry
+
+DEFAULT_SYNC_LIMIT = 500
+MAX_SYNC_LIMIT = 2000
+
+# Current state of each logged model: the queryset restricted to the coach's
+# teams and the columns sent to the app.
+SYNC_SOURCES = {
+    ChangeLogEntry.TEAM: (
+        lambda team_ids: Team.objects.filter(id__in=team_ids),
+        ('id', 'name', 'school_id', 'coach_id', 'semester_id', 'start_date', 'end_date', 'start_time',
+         'class_duration', 'team_training_location', 'team_capacity', 'modified_at'),
+    ),
+    ChangeLogEntry.PLAYER: (
+        lambda team_ids: Player.objects.filter(team__in=team_ids).distinct(),
+        ('id', 'user_id', 'school_id', 'jersey_number', 'user__username', 'user__first_name', 'user__last_name'),
+    ),
+    ChangeLogEntry.TRAINING_SESSION: (
+        lambda team_ids: TrainingSession.objects.filter(team_id__in=team_ids),
+        ('id', 'team_id', 'coach_id', 'title', 'start_time', 'end_time', 'location', 'description',
+         'session_type', 'is_canceled', 'created_at'),
+    ),
+    ChangeLogEntry.ATTENDANCE: (
+        lambda team_ids: Attendance.objects.filter(training_session__team_id__in=team_ids),
+        ('id', 'player_id', 'training_session_id', 'status', 'score', 'trainer_note', 'recorded_at'),
+    ),
+    ChangeLogEntry.MEDICAL_RECORD: (
+        lambda team_ids: MedicalRecord.objects.filter(training_session__team_id__in=team_ids),
+        ('id', 'player_id', 'training_session_id', 'title', 'description', 'diagnosed_date', 'recovery_date',
+         'doctor_name', 'is_active', 'created_at'),
+    ),
+}
+
+
+@extend_schema(
+    tags=["Sync"],
+    summary="Changes since a cursor for the coach app",
+    description=(
+        "Rows of the coach's teams, players, rosters, training sessions, attendance and medical records "
+        "changed after `since`, in sequence order.\n\n"
+        "- Each object appears once with its current state, or as a deleted id.\n"
+        "- Store the returned `cursor` and pass it as `since` next time; repeat while `has_more` is true.\n"
+        "- `reset: true` means the cursor is missing, older than the compacted log or ahead of the log "
+        "(issued before the school moved to another shard): "
+        "fetch everything once and continue from the returned cursor."
+    ),
+    parameters=[
+        OpenApiParameter("since", int, description="Cursor returned by the previous sync."),
+        OpenApiParameter("limit", int, description=f"Log entries to read (1-{MAX_SYNC_LIMIT}, default {DEFAULT_SYNC_LIMIT})."),
+    ],
+)
+class SyncAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    query_budget = 5
+
+    def get(self, request):
+        user = request.user
+        if user.role != user.COACH:
+            raise PermissionDenied("Only coaches can sync.")
+
+        params = request.query_params
+        limit = parse_int_param(params, "limit", DEFAULT_SYNC_LIMIT, 1, MAX_SYNC_LIMIT)
+        since = None if params.get("since") in (None, "") else parse_int_param(params, "since", 0, 0)
+        horizon = ChangeLogCompaction.horizon()
+        if since is None or since < horizon:
+            return Response(self.reset_response(ChangeLogEntry.current_cursor(horizon)))
+
+        team_ids = list(Team.objects.filter(coach__user=user).values_list('id', flat=True))
+        entries = list(
+            ChangeLogEntry.objects.filter(team_id__in=team_ids, id__gt=since)
+            .order_by('id')
+            .values_list('id', 'team_id', 'model', 'object_id', 'action')[:limit + 1]
+        )
+        has_more = len(entries) > limit
+        entries = entries[:limit]
+        if not entries:
+            cursor = ChangeLogEntry.current_cursor(horizon)
+            if since > cursor:
+                return Response(self.reset_response(cursor))
+            return Response({"cursor": since, "reset": False, "has_more": False, "changes": {}})
+
+        # Later entries win: one change per object (per team for roster rows).
+        latest = {}
+        for entry_id, team_id, model, object_id, action in entries:
+            key = (model, object_id, team_id if model == ChangeLogEntry.ROSTER else None)
+            latest[key] = action
+
+        return Response({
+            "cursor": entries[-1][0],
+            "reset": False,
+            "has_more": has_more,
+            "changes": self.collect_changes(latest, team_ids),
+        })
+
+    @staticmethod
+    def reset_response(cursor):
+        return {"cursor": cursor, "reset": True, "has_more": False, "changes": {}}
+
+    def collect_changes(self, latest, team_ids):
+        """Read the current rows of the changed objects, one query per model."""
+        upserts, deletes = {}, {}
+        for (model, object_id, team_id), action in latest.items():
+            bucket = upserts if action == ChangeLogEntry.UPSERT else deletes
+            bucket.setdefault(model, set()).add(object_id if team_id is None else (team_id, object_id))
+
+        changes = {}
+        for model, ids in upserts.items():
+            if model == ChangeLogEntry.ROSTER:
+                current = set(
+                    Team.players.through.objects.filter(
+                        team_id__in={team_id for team_id, _ in ids}, player_id__in={player for _, player in ids}
+                    ).values_list('team_id', 'player_id')
+                )
+                rows = [{"team_id": team_id, "player_id": player_id} for team_id, player_id in sorted(ids & current)]
+                gone = ids - current
+            else:
+                queryset, columns = SYNC_SOURCES[model]
+                rows = list(queryset(team_ids).filter(id__in=ids).values(*columns).order_by('id'))
+                gone = ids - {row['id'] for row in rows}
+            changes[model] = {"upserts": rows, "deletes": []}
+            if gone:
+                deletes.setdefault(model, set()).update(gone)
+
+        for model, ids in deletes.items():
+            if model == ChangeLogEntry.ROSTER:
+                removed = [{"team_id": team_id, "player_id": player_id} for team_id, player_id in sorted(ids)]
+            else:
+                removed = sorted(ids)
+            changes.setdefault(model, {"upserts": []})["deletes"] = removed
+        return changes
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.3 on 2026-10-19 16:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('coach', '0001_initial'),
+        ('manager', '0001_initial'),
+        ('player', '0001_initial'),
+        ('school', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(choices=[('sat', 'Saturday'), ('sun', 'Sunday'), ('mon', 'Monday'), ('tue', 'Tuesday'), ('wed', 'Wednesday'), ('thu', 'Thursday'), ('fri', 'Friday')], max_length=3, unique=True)),
+            ],
+            options={
+                'verbose_name': 'Event Day',
+                'verbose_name_plural': 'Event Days',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Team',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Team Name')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('modified_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('specialization_field', models.CharField(max_length=150)),
+                ('location', models.CharField(blank=True, max_length=255, null=True, verbose_name='General Location')),
+                ('team_training_location', models.CharField(max_length=255, verbose_name='Specific Training Location')),
+                ('team_capacity', models.PositiveIntegerField(verbose_name='Team Capacity')),
+                ('start_date', models.DateField(verbose_name='Start Date')),
+                ('end_date', models.DateField(verbose_name='End Date')),
+                ('start_time', models.TimeField(verbose_name='Class Start Time')),
+                ('class_duration', models.PositiveIntegerField(verbose_name='Class Duration')),
+                ('special_equipment_required', models.BooleanField(default=False, verbose_name='Special Equipment Required')),
+                ('special_equipment_description', models.TextField(blank=True, null=True, verbose_name='Special Equipment Description')),
+                ('payment_type', models.CharField(choices=[('card_transfer', 'card transfer'), ('cash', 'cash'), ('online', 'online')], max_length=50)),
+                ('price_per_month', models.PositiveIntegerField(default=0)),
+                ('coach', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='coach.coach', verbose_name='Coach')),
+                ('event_days', models.ManyToManyField(to='team.eventday')),
+                ('manager', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='manager.manager', verbose_name='Manager')),
+                ('players', models.ManyToManyField(blank=True, to='player.player', verbose_name='Players')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='teams', to='school.school', verbose_name='School')),
+                ('semester', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='teams', to='school.semester', verbose_name='Semester')),
+            ],
+            options={
+                'verbose_name': 'Team',
+                'verbose_name_plural': 'Teams',
+            },
+        ),
+    ]